@@ -26,6 +26,11 @@ class LINE_THICKNESS_MODE(Enum):
     DRAW_CLOCKWISE = 2
 
 
+class ROAD_SURFACE(Enum):
+    SEGMENTS = 0
+    DISTANCE_FIELD = 1
+
+
 class ROTATION(Enum):
     CLOCKWISE = 0
     COUNTERCLOCKWISE = 1
@@ -1,13 +1,20 @@
 from time import sleep
-from gdpc import Editor, Block, geometry
+import logging
+from gdpc import Editor, geometry
 import numpy as np
 import math
-import matplotlib.pyplot as plt
+
+from placement.Palette import get_palette
+from placement.VoxelCanvas import VoxelCanvas
+from utils.instrumentation import stage
+
+logger = logging.getLogger(__name__)
 
 
 class House:
     def __init__(self, editor, coordinates_min, coordinates_max, direction, list_block):
         self.editor = editor
+        self.palette = get_palette()
         self.coordinates_min = coordinates_min
         self.coordinates_max = coordinates_max
         self.skeleton = []
@@ -16,6 +23,11 @@ class House:
 
         self.grid3d = np.zeros(size, dtype=[('bool', bool), ('int', int)])
 
+        # The stages draw into the canvas, which build() places at once: overwrites are resolved in memory. It is one
+        # block taller than grid3d, to hold the top layer cleared by delete.
+        self.canvas = VoxelCanvas([coordinates_min[i] - 1 for i in range(3)], [size[0], size[1] + 1, size[2]],
+                                  self.palette)
+
         self.nbEtage = (coordinates_max[1] - coordinates_min[1]) // 5
 
         self.direction = direction
@@ -26,18 +38,34 @@ class House:
 
         self.entranceCo = None
 
-        self.wall = Block(list_block["wall"])
-        self.roof = Block(list_block["roof"])
-        self.roof_slab = Block(list_block["roof_slab"])
-        self.door = Block(list_block["door"])
-        self.window = Block(list_block["window"])
-        self.entrance = Block(list_block["entrance"])
-        self.stairs = Block(list_block["stairs"])
-        self.celling = Block(list_block["celling"])
-        self.floor = Block(list_block["floor"])
-        self.celling_slab = Block(list_block["celling_slab"])
-        self.gardenOutline = Block(list_block["garden_outline"])
-        self.garden_floor = Block(list_block["garden_floor"])
+        self.wall = self.palette.intern(list_block["wall"])
+        self.roof = self.palette.intern(list_block["roof"])
+        self.roof_slab = self.palette.intern(list_block["roof_slab"])
+        self.door = self.palette.intern(list_block["door"])
+        self.window = self.palette.intern(list_block["window"])
+        self.entrance = self.palette.intern(list_block["entrance"])
+        self.stairs = self.palette.intern(list_block["stairs"])
+        self.celling = self.palette.intern(list_block["celling"])
+        self.floor = self.palette.intern(list_block["floor"])
+        self.celling_slab = self.palette.intern(list_block["celling_slab"])
+        self.gardenOutline = self.palette.intern(list_block["garden_outline"])
+        self.garden_floor = self.palette.intern(list_block["garden_floor"])
+        self.air = self.palette.intern("air")
+        self.oak_log = self.palette.intern("oak_log")
+        self.roof_slab_top = self.palette.intern(list_block["roof_slab"], {"type": "top"})
+        self.roof_slab_bottom = self.palette.intern(list_block["roof_slab"], {"type": "bottom"})
+        self.celling_slab_top = self.palette.intern(list_block["celling_slab"], {"type": "top"})
+        self.celling_slab_bottom = self.palette.intern(list_block["celling_slab"], {"type": "bottom"})
+        self.stairs_slab_top = self.palette.intern(list_block["stairs_slab"], {"type": "top"})
+        self.stairs_slab_bottom = self.palette.intern(list_block["stairs_slab"], {"type": "bottom"})
+        self.stairs_north = self.palette.intern(list_block["stairs"], {"facing": "north"})
+        self.stairs_north_top = self.palette.intern(list_block["stairs"], {"facing": "north", "half": "top"})
+        self.stairs_south = self.palette.intern(list_block["stairs"], {"facing": "south"})
+        self.stairs_south_top = self.palette.intern(list_block["stairs"], {"facing": "south", "half": "top"})
+        self.stairs_east = self.palette.intern(list_block["stairs"], {"facing": "east"})
+        self.stairs_east_top = self.palette.intern(list_block["stairs"], {"facing": "east", "half": "top"})
+        self.stairs_west = self.palette.intern(list_block["stairs"], {"facing": "west"})
+        self.stairs_west_top = self.palette.intern(list_block["stairs"], {"facing": "west", "half": "top"})
 
     def createHouseSkeleton(self):
         self.delete()
@@ -75,11 +103,11 @@ class House:
 
         for i in range(0, width - 1):
             for j in range(0, depth - 1):
-                self.editor.placeBlock((x + i, y_min, z + j), self.floor)
+                self.canvas.placeBlock((x + i, y_min, z + j), self.floor)
                 self.grid3d[x_plan3d + i, 0, z_plan3d + j] = True, 1
         self.skeleton.append((x, z, width - 1, depth - 1, height))
-        print("Coordinates of the corners: ", (x, z), (x, z + depth - 1), (x + width - 1, z),
-              (x + width - 1, z + depth - 1))
+        logger.debug("Coordinates of the corners: %s %s %s %s", (x, z), (x, z + depth - 1), (x + width - 1, z),
+                     (x + width - 1, z + depth - 1))
 
         x_min -= 1
         x_max -= 1
@@ -87,7 +115,7 @@ class House:
         z_max += 1
 
         for _ in range(3):
-            print("Rectangle n°", _ + 1, "en cours de création")
+            logger.debug("Rectangle n°%d en cours de création", _ + 1)
 
             for a in range(10000):
                 if depth > 7:
@@ -141,18 +169,17 @@ class House:
                             if i == 0 or i == new_width - 1 or j == 0 or j == new_depth - 1:
                                 continue
                             else:
-                                self.editor.placeBlock((new_x + i, y_min, new_z + j), self.floor)
+                                self.canvas.placeBlock((new_x + i, y_min, new_z + j), self.floor)
 
                     self.skeleton.append((new_x, new_z, new_width, new_depth, height))
                     break
             else:
-                print("Failed to place rectangle after 100000 attempts.")
+                logger.warning("Failed to place rectangle after 100000 attempts.")
 
     def delete(self):
-        for x in range(self.coordinates_min[0], self.coordinates_max[0]):
-            for y in range(self.coordinates_min[1], self.coordinates_max[1] + 10):
-                for z in range(self.coordinates_min[2], self.coordinates_max[2]):
-                    self.editor.placeBlock((x, y, z), Block("air"))
+        x_min, y_min, z_min = self.coordinates_min
+        x_max, y_max, z_max = self.coordinates_max
+        self.canvas.fill((x_min, y_min, z_min), (x_max, y_max + 10, z_max), self.air)
 
     def putWallOnSkeleton(self):
         for k in range(len(self.skeleton)):
@@ -173,7 +200,7 @@ class House:
                                     self.grid3d[x_plan3d + i, y, z_plan3d + j]['int'] == 1) or (
                                     self.grid3d[x_plan3d + i, y, z_plan3d + j]['bool'] and
                                     self.grid3d[x_plan3d + i, y, z_plan3d + j]['int'] == 2) or y == 0:
-                                self.editor.placeBlock((x + i, self.coordinates_min[1] + y, z + j), self.wall)
+                                self.canvas.placeBlock((x + i, self.coordinates_min[1] + y, z + j), self.wall)
                                 self.grid3d[x_plan3d + i, y, z_plan3d + j] = True
 
     def getAdjacentWalls(self):
@@ -216,24 +243,24 @@ class House:
                     if width % 2 != 0:
                         door_pos = width // 2
                         for y in range(self.coordinates_min[1] + 1 + i * 4, self.coordinates_min[1] + 3 + i * 4):
-                            self.editor.placeBlock((x_min, y, z_min + door_pos), Block("air"))
-                            self.editor.placeBlock((x_min, y, z_min + door_pos + 1), Block("air"))
+                            self.canvas.placeBlock((x_min, y, z_min + door_pos), self.air)
+                            self.canvas.placeBlock((x_min, y, z_min + door_pos + 1), self.air)
                     else:
                         door_pos = width // 2
                         for y in range(self.coordinates_min[1] + 1 + i * 4, self.coordinates_min[1] + 3 + i * 4):
-                            self.editor.placeBlock((x_min, y, z_min + door_pos), Block("air"))
+                            self.canvas.placeBlock((x_min, y, z_min + door_pos), self.air)
                 else:
                     width = x_max - x_min
                     if width % 2 != 0:
                         door_pos = width // 2
                         for y in range(self.coordinates_min[1] + 1 + i * 4, self.coordinates_min[1] + 3 + i * 4):
-                            self.editor.placeBlock((x_min + door_pos, y, z_min), Block("air"))
-                            self.editor.placeBlock((x_min + door_pos + 1, y, z_min), Block("air"))
+                            self.canvas.placeBlock((x_min + door_pos, y, z_min), self.air)
+                            self.canvas.placeBlock((x_min + door_pos + 1, y, z_min), self.air)
 
                     else:
                         door_pos = width // 2
                         for y in range(self.coordinates_min[1] + 1 + i * 4, self.coordinates_min[1] + 3 + i * 4):
-                            self.editor.placeBlock((x_min + door_pos, y, z_min), Block("air"))
+                            self.canvas.placeBlock((x_min + door_pos, y, z_min), self.air)
 
     def placeRoof(self):
         for k in range(len(self.skeleton) - 1, -1, -1):
@@ -268,7 +295,7 @@ class House:
             x_plan3d = x - self.coordinates_min[0]
             z_plan3d = z - self.coordinates_min[2]
 
-            print(width, depth, n)
+            logger.debug("Roof %d x %d, %d layers", width, depth, n)
             
             if width < depth:
 
@@ -276,86 +303,85 @@ class House:
                     for k in range(n):
                         for i in range(-1, depth + 1):
                             for y in range(-1, width // 2 + 1 - k):
-                                self.editor.placeBlock((x + y + k + 2, self.coordinates_max[1] + k , z + i), self.roof)
-                                self.editor.placeBlock((x + width - y - 1 - k -  2, self.coordinates_max[1] + k, z + i), self.roof)
+                                self.canvas.placeBlock((x + y + k + 2, self.coordinates_max[1] + k , z + i), self.roof)
+                                self.canvas.placeBlock((x + width - y - 1 - k -  2, self.coordinates_max[1] + k, z + i), self.roof)
                 else:           
                     if width % 2 == 0:
                         for i in range(-1, depth + 1):
                             for y in range(2):
-                                self.editor.placeBlock((x+ width//2 -1 + y, self.coordinates_max[1] + n -1, z + i), self.roof)
+                                self.canvas.placeBlock((x+ width//2 -1 + y, self.coordinates_max[1] + n -1, z + i), self.roof)
                     else:
                         for i in range(-1, depth + 1):
-                            self.editor.placeBlock((x + width // 2, self.coordinates_max[1] + n - 1, z + i), self.roof)
+                            self.canvas.placeBlock((x + width // 2, self.coordinates_max[1] + n - 1, z + i), self.roof)
             else:
                 if n > 1:
                     for k in range(n ):
                         for i in range(-1, width + 1):
                             for y in range(-1, depth // 2 + 1 - k):
-                                self.editor.placeBlock((x + i, self.coordinates_max[1] + k, z + y + k + 2 ), self.roof)
-                                self.editor.placeBlock((x + i, self.coordinates_max[1] + k, z + depth - y  -1- k - 2),self.roof)
+                                self.canvas.placeBlock((x + i, self.coordinates_max[1] + k, z + y + k + 2 ), self.roof)
+                                self.canvas.placeBlock((x + i, self.coordinates_max[1] + k, z + depth - y  -1- k - 2),self.roof)
                 else:
                     if depth % 2 == 0:
                         for i in range(-1, width + 1):
                             for y in range(2):
-                                self.editor.placeBlock((x + i, self.coordinates_max[1] + n - 1, z + depth // 2 -1 +y ), self.roof)
+                                self.canvas.placeBlock((x + i, self.coordinates_max[1] + n - 1, z + depth // 2 -1 +y ), self.roof)
                     else:
                         for i in range(-1, width + 1):
-                            self.editor.placeBlock((x + i, self.coordinates_max[1] + n - 1, z + depth // 2), self.roof)
+                            self.canvas.placeBlock((x + i, self.coordinates_max[1] + n - 1, z + depth // 2), self.roof)
             
-            print('-----------------------------------')
 
             for i in range(-1, width + 1):
                 for j in range(-1, depth + 1):
                     if width < depth:
                         if width % 2 != 0:
                             if (i == width // 2):
-                                self.editor.placeBlock((x + i, self.coordinates_max[1] + n, z + j),
-                                                       Block(self.blocks["roof_slab"], {"type": "bottom"}))
+                                self.canvas.placeBlock((x + i, self.coordinates_max[1] + n, z + j),
+                                                       self.roof_slab_bottom)
                                 self.grid3d[x_plan3d + i, height + n, z_plan3d + j] = True
                                 if j == -1:
                                     if not self.grid3d[x_plan3d + i, height + n, z_plan3d + j - 1]:
-                                        self.editor.placeBlock((x + i, self.coordinates_max[1] + n, z + j - 1),
-                                                               Block(self.blocks["celling_slab"], {"type": "bottom"}))
+                                        self.canvas.placeBlock((x + i, self.coordinates_max[1] + n, z + j - 1),
+                                                               self.celling_slab_bottom)
                                         self.grid3d[x_plan3d + i, height + n, z_plan3d + j - 1] = True
                                     if not self.grid3d[x_plan3d + i, height + n - 1, z_plan3d + j - 1]:
-                                        self.editor.placeBlock((x + i, self.coordinates_max[1] + n - 1, z + j - 1),
-                                                               Block(self.blocks["celling_slab"], {"type": "top"}))
+                                        self.canvas.placeBlock((x + i, self.coordinates_max[1] + n - 1, z + j - 1),
+                                                               self.celling_slab_top)
                                         self.grid3d[x_plan3d + i, height + n - 1, z_plan3d + j - 1] = True
 
                                 elif j == depth:
                                     if not self.grid3d[x_plan3d + i, height + n, z_plan3d + j + 1]:
-                                        self.editor.placeBlock((x + i, self.coordinates_max[1] + n, z + j + 1),
-                                                               Block(self.blocks["celling_slab"], {"type": "bottom"}))
+                                        self.canvas.placeBlock((x + i, self.coordinates_max[1] + n, z + j + 1),
+                                                               self.celling_slab_bottom)
                                         self.grid3d[x_plan3d + i, height + n, z_plan3d + j + 1] = True
                                     if not self.grid3d[x_plan3d + i, height + n - 1, z_plan3d + j + 1]:
-                                        self.editor.placeBlock((x + i, self.coordinates_max[1] + n - 1, z + j + 1),
-                                                               Block(self.blocks["celling_slab"], {"type": "top"}))
+                                        self.canvas.placeBlock((x + i, self.coordinates_max[1] + n - 1, z + j + 1),
+                                                               self.celling_slab_top)
                                         self.grid3d[x_plan3d + i, height + n - 1, z_plan3d + j + 1] = True
 
                     else:
                         if depth % 2 != 0:
                             if (j == depth // 2):
-                                self.editor.placeBlock((x + i, self.coordinates_max[1] + n, z + j),
-                                                       Block(self.blocks["roof_slab"], {"type": "bottom"}))
+                                self.canvas.placeBlock((x + i, self.coordinates_max[1] + n, z + j),
+                                                       self.roof_slab_bottom)
                                 self.grid3d[x_plan3d + i, height + n, z_plan3d + j] = True
                                 if i == -1:
                                     if not self.grid3d[x_plan3d + i - 1, height + n, z_plan3d + j]:
-                                        self.editor.placeBlock((x + i - 1, self.coordinates_max[1] + n, z + j),
-                                                               Block(self.blocks["celling_slab"], {"type": "bottom"}))
+                                        self.canvas.placeBlock((x + i - 1, self.coordinates_max[1] + n, z + j),
+                                                               self.celling_slab_bottom)
                                         self.grid3d[x_plan3d + i - 1, height + n, z_plan3d + j] = True
                                     if not self.grid3d[x_plan3d + i - 1, height + n - 1, z_plan3d + j]:
-                                        self.editor.placeBlock((x + i - 1, self.coordinates_max[1] + n - 1, z + j),
-                                                               Block(self.blocks["celling_slab"], {"type": "top"}))
+                                        self.canvas.placeBlock((x + i - 1, self.coordinates_max[1] + n - 1, z + j),
+                                                               self.celling_slab_top)
                                         self.grid3d[x_plan3d + i - 1, height + n - 1, z_plan3d + j] = True
 
                                 elif i == width:
                                     if not self.grid3d[x_plan3d + i + 1, height + n, z_plan3d + j]:
-                                        self.editor.placeBlock((x + i + 1, self.coordinates_max[1] + n, z + j),
-                                                               Block(self.blocks["celling_slab"], {"type": "bottom"}))
+                                        self.canvas.placeBlock((x + i + 1, self.coordinates_max[1] + n, z + j),
+                                                               self.celling_slab_bottom)
                                         self.grid3d[x_plan3d + i + 1, height + n, z_plan3d + j] = True
                                     if not self.grid3d[x_plan3d + i + 1, height + n - 1, z_plan3d + j]:
-                                        self.editor.placeBlock((x + i + 1, self.coordinates_max[1] + n - 1, z + j),
-                                                               Block(self.blocks["celling_slab"], {"type": "top"}))
+                                        self.canvas.placeBlock((x + i + 1, self.coordinates_max[1] + n - 1, z + j),
+                                                               self.celling_slab_top)
                                         self.grid3d[x_plan3d + i + 1, height + n - 1, z_plan3d + j] = True
 
             if width < depth:
@@ -365,35 +391,35 @@ class House:
                     for j in range(-1, depth + 1):
                         if i != -1:
                             if h % 1 == 0:
-                                self.editor.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j),
-                                                       Block(self.blocks["roof_slab"], {"type": "top"}))
-                                self.editor.placeBlock((x + width - 1 - i,math.ceil(self.coordinates_max[1] + h), z + j),
-                                                       Block(self.blocks["roof_slab"], {"type": "top"}))
+                                self.canvas.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j),
+                                                       self.roof_slab_top)
+                                self.canvas.placeBlock((x + width - 1 - i,math.ceil(self.coordinates_max[1] + h), z + j),
+                                                       self.roof_slab_top)
                                 self.grid3d[x_plan3d + i, round(height + h), z_plan3d + j] = True
                                 self.grid3d[x_plan3d + width - 1 - i, round(height + h), z_plan3d + j] = True
 
                                 if j == -1:
 
-                                    self.editor.placeBlock((x + i,math.ceil(self.coordinates_max[1] + h), z + j - 1),
+                                    self.canvas.placeBlock((x + i,math.ceil(self.coordinates_max[1] + h), z + j - 1),
                                                            self.celling)
-                                    self.editor.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j - 1),
+                                    self.canvas.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j - 1),
                                                            self.celling)
                                     self.grid3d[x_plan3d + i, round(height + h), z_plan3d + j - 1] = True
                                     self.grid3d[x_plan3d + width - 1 - i, round(height + h), z_plan3d + j - 1] = True
                                 elif j == depth:
-                                    self.editor.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j + 1),
+                                    self.canvas.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j + 1),
                                                            self.celling)
-                                    self.editor.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j + 1),
+                                    self.canvas.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j + 1),
                                                            self.celling)
                                     self.grid3d[x_plan3d + i, round(height + h), z_plan3d + j + 1] = True
                                     self.grid3d[x_plan3d + width - 1 - i, round(height + h), z_plan3d + j + 1] = True
                             else:
-                                self.editor.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j),
-                                                       Block(self.blocks["roof_slab"], {"type": "bottom"}))
-                                self.editor.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j),
-                                                       Block(self.blocks["roof_slab"], {"type": "bottom"}))
-                                self.editor.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h-0.5), z + j), self.roof)
-                                self.editor.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h-0.5), z + j),
+                                self.canvas.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j),
+                                                       self.roof_slab_bottom)
+                                self.canvas.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j),
+                                                       self.roof_slab_bottom)
+                                self.canvas.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h-0.5), z + j), self.roof)
+                                self.canvas.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h-0.5), z + j),
                                                        self.roof)
 
                                 self.grid3d[x_plan3d + i, round(height + h + 0.5), z_plan3d + j] = True
@@ -402,15 +428,15 @@ class House:
                                 self.grid3d[x_plan3d + width - 1 - i, round(height + h - 0.5), z_plan3d + j] = True
 
                                 if j == -1:
-                                    self.editor.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j - 1),
-                                                           Block(self.blocks["celling_slab"], {"type": "bottom"}))
-                                    self.editor.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j - 1),
-                                                           Block(self.blocks["celling_slab"], {"type": "bottom"}))
-                                    self.editor.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h-1), z + j - 1),
-                                                           Block(self.blocks["celling_slab"], {"type": "top"}))
-                                    self.editor.placeBlock(
+                                    self.canvas.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j - 1),
+                                                           self.celling_slab_bottom)
+                                    self.canvas.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j - 1),
+                                                           self.celling_slab_bottom)
+                                    self.canvas.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h-1), z + j - 1),
+                                                           self.celling_slab_top)
+                                    self.canvas.placeBlock(
                                         (x + width - 1 - i, math.ceil(self.coordinates_max[1] + h-1), z + j - 1),
-                                        Block(self.blocks["celling_slab"], {"type": "top"}))
+                                        self.celling_slab_top)
 
                                     self.grid3d[x_plan3d + i, round(height + h - 1), z_plan3d + j - 1] = True
                                     self.grid3d[
@@ -418,15 +444,15 @@ class House:
                                     self.grid3d[x_plan3d + i, round(height + h), z_plan3d + j - 1] = True
                                     self.grid3d[x_plan3d + width - 1 - i, round(height + h), z_plan3d + j - 1] = True
                                 elif j == depth:
-                                    self.editor.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j + 1),
-                                                           Block(self.blocks["celling_slab"], {"type": "bottom"}))
-                                    self.editor.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j + 1),
-                                                           Block(self.blocks["celling_slab"], {"type": "bottom"}))
-                                    self.editor.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h-1), z + j + 1),
-                                                           Block(self.blocks["celling_slab"], {"type": "top"}))
-                                    self.editor.placeBlock(
+                                    self.canvas.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j + 1),
+                                                           self.celling_slab_bottom)
+                                    self.canvas.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j + 1),
+                                                           self.celling_slab_bottom)
+                                    self.canvas.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h-1), z + j + 1),
+                                                           self.celling_slab_top)
+                                    self.canvas.placeBlock(
                                         (x + width - 1 - i, math.ceil(self.coordinates_max[1] + h-1), z + j + 1),
-                                        Block(self.blocks["celling_slab"], {"type": "top"}))
+                                        self.celling_slab_top)
 
                                     self.grid3d[x_plan3d + i, round(height + h - 1), z_plan3d + j + 1] = True
                                     self.grid3d[
@@ -434,44 +460,44 @@ class House:
                                     self.grid3d[x_plan3d + i, round(height + h), z_plan3d + j + 1] = True
                                     self.grid3d[x_plan3d + width - 1 - i, round(height + h), z_plan3d + j + 1] = True
                         else:
-                            self.editor.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j),
-                                                   Block(self.blocks["roof_slab"], {"type": "bottom"}))
-                            self.editor.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j),
-                                                   Block(self.blocks["roof_slab"], {"type": "bottom"}))
+                            self.canvas.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j),
+                                                   self.roof_slab_bottom)
+                            self.canvas.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j),
+                                                   self.roof_slab_bottom)
 
                             self.grid3d[x_plan3d + i, round(height + h), z_plan3d + j] = True
                             self.grid3d[x_plan3d + width - 1 - i, round(height + h), z_plan3d + j] = True
 
                             if j == -1:
-                                self.editor.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j - 1),
-                                                       Block(self.blocks["celling_slab"], {"type": "bottom"}))
-                                self.editor.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j - 1),
-                                                       Block(self.blocks["celling_slab"], {"type": "bottom"}))
+                                self.canvas.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j - 1),
+                                                       self.celling_slab_bottom)
+                                self.canvas.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j - 1),
+                                                       self.celling_slab_bottom)
                                 if not self.grid3d[x_plan3d + i, height + h - 1, z_plan3d + j - 1]:
-                                    self.editor.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h-1), z + j - 1),
-                                                           Block(self.blocks["celling_slab"], {"type": "top"}))
+                                    self.canvas.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h-1), z + j - 1),
+                                                           self.celling_slab_top)
                                     self.grid3d[x_plan3d + i, height + h - 1, z_plan3d + j - 1] = True
                                 if not self.grid3d[x_plan3d + width - 1 - i, height + h - 1, z_plan3d + j - 1]:
-                                    self.editor.placeBlock(
+                                    self.canvas.placeBlock(
                                         (x + width - 1 - i, math.ceil(self.coordinates_max[1] + h-1), z + j - 1),
-                                        Block(self.blocks["celling_slab"], {"type": "top"}))
+                                        self.celling_slab_top)
                                     self.grid3d[x_plan3d + width - 1 - i, height + h - 1, z_plan3d + j - 1] = True
 
                                 self.grid3d[x_plan3d + i, round(height + h - 1), z_plan3d + j - 1] = True
                                 self.grid3d[x_plan3d + width - 1 - i, round(height + h - 1), z_plan3d + j - 1] = True
                             elif j == depth:
-                                self.editor.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j + 1),
-                                                       Block(self.blocks["celling_slab"], {"type": "bottom"}))
-                                self.editor.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j + 1),
-                                                       Block(self.blocks["celling_slab"], {"type": "bottom"}))
+                                self.canvas.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h), z + j + 1),
+                                                       self.celling_slab_bottom)
+                                self.canvas.placeBlock((x + width - 1 - i, math.ceil(self.coordinates_max[1] + h), z + j + 1),
+                                                       self.celling_slab_bottom)
                                 if not self.grid3d[x_plan3d + i, height + h - 1, z_plan3d + j + 1]:
-                                    self.editor.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h-1), z + j + 1),
-                                                           Block(self.blocks["celling_slab"], {"type": "top"}))
+                                    self.canvas.placeBlock((x + i, math.ceil(self.coordinates_max[1] + h-1), z + j + 1),
+                                                           self.celling_slab_top)
                                     self.grid3d[x_plan3d + i, height + h - 1, z_plan3d + j + 1] = True
                                 if not self.grid3d[x_plan3d + width - 1 - i, height + h - 1, z_plan3d + j + 1]:
-                                    self.editor.placeBlock(
+                                    self.canvas.placeBlock(
                                         (x + width - 1 - i, math.ceil(self.coordinates_max[1] + h-1), z + j + 1),
-                                        Block(self.blocks["celling_slab"], {"type": "top"}))
+                                        self.celling_slab_top)
                                     self.grid3d[x_plan3d + width - 1 - i, height + h - 1, z_plan3d + j + 1] = True
 
                                 self.grid3d[x_plan3d + i, round(height + h - 1), z_plan3d + j + 1] = True
@@ -485,38 +511,38 @@ class House:
                     for j in range(-1, width + 1):
                         if i != -1:
                             if h % 1 == 0:
-                                self.editor.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h), z + i),
-                                                       Block(self.blocks["roof_slab"], {"type": "top"}))
-                                self.editor.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
-                                                       Block(self.blocks["roof_slab"], {"type": "top"}))
+                                self.canvas.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h), z + i),
+                                                       self.roof_slab_top)
+                                self.canvas.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
+                                                       self.roof_slab_top)
 
                                 self.grid3d[x_plan3d + j, round(height + h), z_plan3d + i] = True
                                 self.grid3d[x_plan3d + j, round(height + h), z_plan3d + depth - 1 - i] = True
 
                                 if j == -1:
-                                    self.editor.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h), z + i),
+                                    self.canvas.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h), z + i),
                                                            self.celling)
-                                    self.editor.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
+                                    self.canvas.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
                                                            self.celling)
 
                                     self.grid3d[x_plan3d + j - 1, round(height + h), z_plan3d + i] = True
                                     self.grid3d[x_plan3d + j - 1, round(height + h), z_plan3d + depth - 1 - i] = True
                                 elif j == width:
-                                    self.editor.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h), z + i),
+                                    self.canvas.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h), z + i),
                                                            self.celling)
-                                    self.editor.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
+                                    self.canvas.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
                                                            self.celling)
 
                                     self.grid3d[x_plan3d + j + 1, round(height + h), z_plan3d + i] = True
                                     self.grid3d[x_plan3d + j + 1, round(height + h), z_plan3d + depth - 1 - i] = True
 
                             else:
-                                self.editor.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h), z + i),
-                                                       Block(self.blocks["roof_slab"], {"type": "bottom"}))
-                                self.editor.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
-                                                       Block(self.blocks["roof_slab"], {"type": "bottom"}))
-                                self.editor.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h - 0.5), z + i), self.roof)
-                                self.editor.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h - 0.5), z + depth - 1 - i),
+                                self.canvas.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h), z + i),
+                                                       self.roof_slab_bottom)
+                                self.canvas.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
+                                                       self.roof_slab_bottom)
+                                self.canvas.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h - 0.5), z + i), self.roof)
+                                self.canvas.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h - 0.5), z + depth - 1 - i),
                                                        self.roof)
 
                                 self.grid3d[x_plan3d+j, round(height + h + 0.5),z_plan3d+ i] = True
@@ -525,74 +551,74 @@ class House:
                                 self.grid3d[x_plan3d+j, round(height + h - 0.5), z_plan3d+depth - 1 - i] = True
 
                                 if j == -1:
-                                    self.editor.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h), z + i),
-                                                           Block(self.blocks["celling_slab"], {"type": "bottom"}))
-                                    self.editor.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
-                                                           Block(self.blocks["celling_slab"], {"type": "bottom"}))
-                                    self.editor.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h - 1), z + i),
-                                                           Block(self.blocks["celling_slab"], {"type": "top"}))
-                                    self.editor.placeBlock(
+                                    self.canvas.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h), z + i),
+                                                           self.celling_slab_bottom)
+                                    self.canvas.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
+                                                           self.celling_slab_bottom)
+                                    self.canvas.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h - 1), z + i),
+                                                           self.celling_slab_top)
+                                    self.canvas.placeBlock(
                                         (x + j - 1, math.ceil(self.coordinates_max[1] + h-1), z + depth - 1 - i),
-                                        Block(self.blocks["celling_slab"], {"type": "top"}))
+                                        self.celling_slab_top)
 
                                     self.grid3d[x_plan3d+j-1, round(height + h),z_plan3d+ i] = True
                                     self.grid3d[x_plan3d+j-1, round(height + h), z_plan3d+depth - 1 - i] = True
                                     self.grid3d[x_plan3d+j-1, round(height + h - 1),z_plan3d+ i] = True
                                     self.grid3d[x_plan3d+j-1, round(height + h - 1), z_plan3d+depth - 1 - i] = True
                                 elif j == width:
-                                    self.editor.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h), z + i),
-                                                           Block(self.blocks["celling_slab"], {"type": "bottom"}))
-                                    self.editor.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
-                                                           Block(self.blocks["celling_slab"], {"type": "bottom"}))
-                                    self.editor.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h-1), z + i),
-                                                           Block(self.blocks["celling_slab"], {"type": "top"}))
-                                    self.editor.placeBlock(
+                                    self.canvas.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h), z + i),
+                                                           self.celling_slab_bottom)
+                                    self.canvas.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
+                                                           self.celling_slab_bottom)
+                                    self.canvas.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h-1), z + i),
+                                                           self.celling_slab_top)
+                                    self.canvas.placeBlock(
                                         (x + j + 1, math.ceil(self.coordinates_max[1] + h-1), z + depth - 1 - i),
-                                        Block(self.blocks["celling_slab"], {"type": "top"}))
+                                        self.celling_slab_top)
 
                                     self.grid3d[x_plan3d+j+1, round(height + h),z_plan3d+ i] = True
                                     self.grid3d[x_plan3d+j+1, round(height + h),z_plan3d+ depth - 1 - i] = True
                                     self.grid3d[x_plan3d+j+1, round(height + h - 1), z_plan3d+i] = True
                                     self.grid3d[x_plan3d+j+1, round(height + h - 1),z_plan3d+ depth - 1 - i] = True
                         else:
-                            self.editor.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h), z + i),
-                                                   Block(self.blocks["roof_slab"], {"type": "bottom"}))
-                            self.editor.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
-                                                   Block(self.blocks["roof_slab"], {"type": "bottom"}))
+                            self.canvas.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h), z + i),
+                                                   self.roof_slab_bottom)
+                            self.canvas.placeBlock((x + j, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
+                                                   self.roof_slab_bottom)
 
                             self.grid3d[x_plan3d+j, round(height + h), z_plan3d+i] = True
                             self.grid3d[x_plan3d+j, round(height + h), z_plan3d+depth - 1 - i] = True
 
                             if j == -1:
-                                self.editor.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h), z + i),
-                                                       Block(self.blocks["celling_slab"], {"type": "bottom"}))
-                                self.editor.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
-                                                       Block(self.blocks["celling_slab"], {"type": "bottom"}))
+                                self.canvas.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h), z + i),
+                                                       self.celling_slab_bottom)
+                                self.canvas.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
+                                                       self.celling_slab_bottom)
                                 if not self.grid3d[x_plan3d+j-1, height + h - 1, z_plan3d+i]:
-                                    self.editor.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h-1) , z + i),
-                                                           Block(self.blocks["celling_slab"], {"type": "top"}))
+                                    self.canvas.placeBlock((x + j - 1, math.ceil(self.coordinates_max[1] + h-1) , z + i),
+                                                           self.celling_slab_top)
                                     self.grid3d[x_plan3d+j-1, height + h - 1, z_plan3d+i] = True
                                 if not self.grid3d[x_plan3d+j-1, height + h - 1, z_plan3d+depth - 1 - i]:
-                                    self.editor.placeBlock(
+                                    self.canvas.placeBlock(
                                         (x + j - 1, math.ceil(self.coordinates_max[1] + h-1) , z + depth - 1 - i),
-                                        Block(self.blocks["celling_slab"], {"type": "top"}))
+                                        self.celling_slab_top)
                                     self.grid3d[x_plan3d+j-1, height + h - 1, z_plan3d+depth - 1 - i] = True
 
                                 self.grid3d[x_plan3d+j-1, round(height + h), z_plan3d+i] = True
                                 self.grid3d[x_plan3d+j-1, round(height + h),z_plan3d+ depth - 1 - i] = True
                             elif j == width:
-                                self.editor.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h), z + i),
-                                                       Block(self.blocks["celling_slab"], {"type": "bottom"}))
-                                self.editor.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
-                                                       Block(self.blocks["celling_slab"], {"type": "bottom"}))
+                                self.canvas.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h), z + i),
+                                                       self.celling_slab_bottom)
+                                self.canvas.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h), z + depth - 1 - i),
+                                                       self.celling_slab_bottom)
                                 if not self.grid3d[x_plan3d+j+1, height + h - 1,z_plan3d+ i]:
-                                    self.editor.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h-1), z + i),
-                                                           Block(self.blocks["celling_slab"], {"type": "top"}))
+                                    self.canvas.placeBlock((x + j + 1, math.ceil(self.coordinates_max[1] + h-1), z + i),
+                                                           self.celling_slab_top)
                                     self.grid3d[x_plan3d+j+1, height + h - 1, z_plan3d+i] = True
                                 if not self.grid3d[x_plan3d+j+1, height + h - 1,z_plan3d+ depth - 1 - i]:
-                                    self.editor.placeBlock(
+                                    self.canvas.placeBlock(
                                         (x + j + 1, math.ceil(self.coordinates_max[1] + h-1), z + depth - 1 - i),
-                                        Block(self.blocks["celling_slab"], {"type": "top"}))
+                                        self.celling_slab_top)
                                     self.grid3d[x_plan3d+j+1, height + h - 1,z_plan3d+ depth - 1 - i] = True
 
                                 self.grid3d[x_plan3d+j+1, round(height + h), z_plan3d+i] = True
@@ -604,19 +630,17 @@ class House:
                     if i != -1:
                         h += 0.5
             
-            QUARTZ_SLAB = Block(self.blocks["celling_slab"], {"type": "top"})
-
             for i in range(-2, width + 2):
                 for j in range(-2, depth + 2):
                     if i == -2 or i == width + 1 or j == -2 or j == depth + 1:
                         if not self.grid3d[x_plan3d + i, height - 1, z_plan3d + j]['bool']:
                             if width < depth:
                                 if i == -2 or i == width + 1:
-                                    self.editor.placeBlock((x + i, self.coordinates_max[1] - 1, z + j), QUARTZ_SLAB)
+                                    self.canvas.placeBlock((x + i, self.coordinates_max[1] - 1, z + j), self.celling_slab_top)
 
                             else:
                                 if j == -2 or j == depth + 1:
-                                    self.editor.placeBlock((x + i, self.coordinates_max[1] - 1, z + j), QUARTZ_SLAB)
+                                    self.canvas.placeBlock((x + i, self.coordinates_max[1] - 1, z + j), self.celling_slab_top)
                         
     def putCelling(self):
         for k in range(0, len(self.skeleton)):
@@ -632,7 +656,7 @@ class House:
             for y in range(1, self.nbEtage + 1):
                 for i in range(0, width):
                     for j in range(0, depth):
-                        self.editor.placeBlock((x + i, self.coordinates_min[1] + 4 * y, z + j), self.celling)
+                        self.canvas.placeBlock((x + i, self.coordinates_min[1] + 4 * y, z + j), self.celling)
                         self.grid3d[x_plan3d + i, 4 * y, z_plan3d + j] = True
 
     def getAllExterneWalls(self):
@@ -676,40 +700,40 @@ class House:
             if axis % 2 == 0:
                 if axis == 4:
                     if is_x:
-                        self.editor.placeBlock((wall[0] + 2, self.coordinates_min[1] + 2 + l * 4, wall[1]), self.window)
-                        self.editor.placeBlock((wall[0] + 3, self.coordinates_min[1] + 2 + l * 4, wall[1]), self.window)
+                        self.canvas.placeBlock((wall[0] + 2, self.coordinates_min[1] + 2 + l * 4, wall[1]), self.window)
+                        self.canvas.placeBlock((wall[0] + 3, self.coordinates_min[1] + 2 + l * 4, wall[1]), self.window)
                     else:
-                        self.editor.placeBlock((wall[0], self.coordinates_min[1] + 2 + l * 4, wall[1] + 3), self.window)
-                        self.editor.placeBlock((wall[0], self.coordinates_min[1] + 2 + l * 4, wall[1] + 2), self.window)
+                        self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 2 + l * 4, wall[1] + 3), self.window)
+                        self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 2 + l * 4, wall[1] + 2), self.window)
                 else:
                     for i in range(0, math.ceil(axis / 4)):
                         if is_x:
-                            self.editor.placeBlock((wall[0] + 1 + i * 4, self.coordinates_min[1] + 2 + l * 4, wall[1]),
+                            self.canvas.placeBlock((wall[0] + 1 + i * 4, self.coordinates_min[1] + 2 + l * 4, wall[1]),
                                                    self.window)
-                            self.editor.placeBlock((wall[0] + 2 + i * 4, self.coordinates_min[1] + 2 + l * 4, wall[1]),
+                            self.canvas.placeBlock((wall[0] + 2 + i * 4, self.coordinates_min[1] + 2 + l * 4, wall[1]),
                                                    self.window)
                         else:
-                            self.editor.placeBlock((wall[0], self.coordinates_min[1] + 2 + l * 4, wall[1] + 1 + i * 4),
+                            self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 2 + l * 4, wall[1] + 1 + i * 4),
                                                    self.window)
-                            self.editor.placeBlock((wall[0], self.coordinates_min[1] + 2 + l * 4, wall[1] + 2 + i * 4),
+                            self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 2 + l * 4, wall[1] + 2 + i * 4),
                                                    self.window)
             else:
                 if axis <= 5:
                     for i in range(0, axis):
                         if is_x:
-                            self.editor.placeBlock((wall[0] + 1 + i, self.coordinates_min[1] + 2 + l * 4, wall[1]),
+                            self.canvas.placeBlock((wall[0] + 1 + i, self.coordinates_min[1] + 2 + l * 4, wall[1]),
                                                    self.window)
                         else:
-                            self.editor.placeBlock((wall[0], self.coordinates_min[1] + 2 + l * 4, wall[1] + 1 + i),
+                            self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 2 + l * 4, wall[1] + 1 + i),
                                                    self.window)
                 else:
                     for i in range(0, math.ceil(axis / 2)):
                         if is_x:
-                            self.editor.placeBlock((wall[0] + i * 2 + 1, self.coordinates_min[1] + 2 + l * 4, wall[1]),
+                            self.canvas.placeBlock((wall[0] + i * 2 + 1, self.coordinates_min[1] + 2 + l * 4, wall[1]),
                                                    self.window)
 
                         else:
-                            self.editor.placeBlock((wall[0], self.coordinates_min[1] + 2 + l * 4, wall[1] + i * 2 + 1),
+                            self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 2 + l * 4, wall[1] + i * 2 + 1),
                                                    self.window)
 
     def placeWindow(self):
@@ -727,26 +751,26 @@ class House:
         x, z, width, depth, height = self.skeleton[0]
         x_moy = x + width // 2
         z_moy = z + depth // 2
-        slab_up = Block(self.blocks["stairs_slab"], {"type": "top"})
-        slab_down = Block(self.blocks["stairs_slab"], {"type": "bottom"})
+        slab_up = self.stairs_slab_top
+        slab_down = self.stairs_slab_bottom
         for i in range(0, self.nbEtage - 1):
             for k in range(3):
                 for l in range(3):
-                    self.editor.placeBlock((x_moy - 1 + k, self.coordinates_min[1] + 4 * (i + 1), z_moy - 1 + l),
-                                           Block("air"))
+                    self.canvas.placeBlock((x_moy - 1 + k, self.coordinates_min[1] + 4 * (i + 1), z_moy - 1 + l),
+                                           self.air)
 
             for j in range(1, 5):
-                self.editor.placeBlock((x_moy, self.coordinates_min[1] + 4 * i + j, z_moy), self.floor)
+                self.canvas.placeBlock((x_moy, self.coordinates_min[1] + 4 * i + j, z_moy), self.floor)
 
-            self.editor.placeBlock((x_moy - 1, self.coordinates_min[1] + 1 + 4 * i, z_moy - 1), slab_down)
-            self.editor.placeBlock((x_moy, self.coordinates_min[1] + 1 + 4 * i, z_moy - 1), slab_up)
-            self.editor.placeBlock((x_moy + 1, self.coordinates_min[1] + 2 + 4 * i, z_moy - 1), slab_down)
-            self.editor.placeBlock((x_moy + 1, self.coordinates_min[1] + 2 + 4 * i, z_moy), slab_up)
-            self.editor.placeBlock((x_moy + 1, self.coordinates_min[1] + 3 + 4 * i, z_moy + 1), slab_down)
+            self.canvas.placeBlock((x_moy - 1, self.coordinates_min[1] + 1 + 4 * i, z_moy - 1), slab_down)
+            self.canvas.placeBlock((x_moy, self.coordinates_min[1] + 1 + 4 * i, z_moy - 1), slab_up)
+            self.canvas.placeBlock((x_moy + 1, self.coordinates_min[1] + 2 + 4 * i, z_moy - 1), slab_down)
+            self.canvas.placeBlock((x_moy + 1, self.coordinates_min[1] + 2 + 4 * i, z_moy), slab_up)
+            self.canvas.placeBlock((x_moy + 1, self.coordinates_min[1] + 3 + 4 * i, z_moy + 1), slab_down)
 
-            self.editor.placeBlock((x_moy, self.coordinates_min[1] + 3 + 4 * i, z_moy + 1), slab_up)
-            self.editor.placeBlock((x_moy - 1, self.coordinates_min[1] + 4 + 4 * i, z_moy + 1), slab_down)
-            self.editor.placeBlock((x_moy - 1, self.coordinates_min[1] + 4 + 4 * i, z_moy), slab_up)
+            self.canvas.placeBlock((x_moy, self.coordinates_min[1] + 3 + 4 * i, z_moy + 1), slab_up)
+            self.canvas.placeBlock((x_moy - 1, self.coordinates_min[1] + 4 + 4 * i, z_moy + 1), slab_down)
+            self.canvas.placeBlock((x_moy - 1, self.coordinates_min[1] + 4 + 4 * i, z_moy), slab_up)
 
     def WallFacingDirection(self):
 
@@ -797,56 +821,56 @@ class House:
         match self.direction:
             case "W":
                 if (wall[3] - wall[1]) % 2 != 0:
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1] + 1, (wall[1] + wall[3]) // 2 + 1),
-                                           Block("air"))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1] + 2, (wall[1] + wall[3]) // 2 + 1),
-                                           Block("air"))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1] + 1, (wall[1] + wall[3]) // 2),
-                                           Block("air"))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1] + 2, (wall[1] + wall[3]) // 2),
-                                           Block("air"))
-
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2),
-                                           Block(self.blocks["stairs"], {"facing": "east"}))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2 + 1),
-                                           Block(self.blocks["stairs"], {"facing": "east"}))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2 - 1),
-                                           Block(self.blocks["stairs"], {"facing": "south"}))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2 + 2),
-                                           Block(self.blocks["stairs"], {"facing": "north"}))
-
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2),
-                                           Block(self.blocks["stairs"], {"facing": "east", "half": "top"}))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 + 1),
-                                           Block(self.blocks["stairs"], {"facing": "east", "half": "top"}))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 - 1),
-                                           Block(self.blocks["stairs"], {"facing": "south", "half": "top"}))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 + 2),
-                                           Block(self.blocks["stairs"], {"facing": "north", "half": "top"}))
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1] + 1, (wall[1] + wall[3]) // 2 + 1),
+                                           self.air)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1] + 2, (wall[1] + wall[3]) // 2 + 1),
+                                           self.air)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1] + 1, (wall[1] + wall[3]) // 2),
+                                           self.air)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1] + 2, (wall[1] + wall[3]) // 2),
+                                           self.air)
+
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2),
+                                           self.stairs_east)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2 + 1),
+                                           self.stairs_east)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2 - 1),
+                                           self.stairs_south)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2 + 2),
+                                           self.stairs_north)
+
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2),
+                                           self.stairs_east_top)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 + 1),
+                                           self.stairs_east_top)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 - 1),
+                                           self.stairs_south_top)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 + 2),
+                                           self.stairs_north_top)
 
                     self.entranceCo = (
                     (wall[1] + wall[3]) // 2, (wall[1] + wall[3]) // 2 + 2, (wall[1] + wall[3]) // 2 + 1,
                     (wall[1] + wall[3]) // 2 - 1)
 
                 else:
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1] + 1, (wall[1] + wall[3]) // 2),
-                                           Block("air"))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1] + 2, (wall[1] + wall[3]) // 2),
-                                           Block("air"))
-
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2),
-                                           Block(self.blocks["stairs"], {"facing": "east"}))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2 + 1),
-                                           Block(self.blocks["stairs"], {"facing": "north"}))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2 - 1),
-                                           Block(self.blocks["stairs"], {"facing": "south"}))
-
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2),
-                                           Block(self.blocks["stairs"], {"facing": "east", "half": "top"}))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 + 1),
-                                           Block(self.blocks["stairs"], {"facing": "north", "half": "top"}))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 - 1),
-                                           Block(self.blocks["stairs"], {"facing": "south", "half": "top"}))
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1] + 1, (wall[1] + wall[3]) // 2),
+                                           self.air)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1] + 2, (wall[1] + wall[3]) // 2),
+                                           self.air)
+
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2),
+                                           self.stairs_east)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2 + 1),
+                                           self.stairs_north)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1], (wall[1] + wall[3]) // 2 - 1),
+                                           self.stairs_south)
+
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2),
+                                           self.stairs_east_top)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 + 1),
+                                           self.stairs_north_top)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 - 1),
+                                           self.stairs_south_top)
 
                     self.entranceCo = (
                     (wall[1] + wall[3]) // 2, (wall[1] + wall[3]) // 2 + 1, (wall[1] + wall[3]) // 2 + 1,
@@ -854,185 +878,185 @@ class House:
 
             case "N":
                 if (wall[2] - wall[0]) % 2 != 0:
-                    self.editor.placeBlock(
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1] + 1, wall[1] + 1),
-                        Block("air"))
-                    self.editor.placeBlock(
+                        self.air)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1] + 2, wall[1] + 1),
-                        Block("air"))
-                    self.editor.placeBlock(
-                        (wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 1, wall[1] + 1), Block("air"))
-                    self.editor.placeBlock(
-                        (wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 2, wall[1] + 1), Block("air"))
-
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1], wall[1]),
-                                           Block(self.blocks["stairs"], {"facing": "south"}))
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1], wall[1]),
-                                           Block(self.blocks["stairs"], {"facing": "south"}))
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2 - 1, self.coordinates_min[1], wall[1]),
-                                           Block(self.blocks["stairs"], {"facing": "east"}))
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2 + 2, self.coordinates_min[1], wall[1]),
-                                           Block(self.blocks["stairs"], {"facing": "west"}))
-
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 3, wall[1]),
-                                           Block(self.blocks["stairs"], {"facing": "south", "half": "top"}))
-                    self.editor.placeBlock(
+                        self.air)
+                    self.canvas.placeBlock(
+                        (wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 1, wall[1] + 1), self.air)
+                    self.canvas.placeBlock(
+                        (wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 2, wall[1] + 1), self.air)
+
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1], wall[1]),
+                                           self.stairs_south)
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1], wall[1]),
+                                           self.stairs_south)
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2 - 1, self.coordinates_min[1], wall[1]),
+                                           self.stairs_east)
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2 + 2, self.coordinates_min[1], wall[1]),
+                                           self.stairs_west)
+
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 3, wall[1]),
+                                           self.stairs_south_top)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1] + 3, wall[1]),
-                        Block(self.blocks["stairs"], {"facing": "south", "half": "top"}))
-                    self.editor.placeBlock(
+                        self.stairs_south_top)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 - 1, self.coordinates_min[1] + 3, wall[1]),
-                        Block(self.blocks["stairs"], {"facing": "east", "half": "top"}))
-                    self.editor.placeBlock(
+                        self.stairs_east_top)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 + 2, self.coordinates_min[1] + 3, wall[1]),
-                        Block(self.blocks["stairs"], {"facing": "west", "half": "top"}))
+                        self.stairs_west_top)
 
                     self.entranceCo = (wall[0] + (wall[2] - wall[0]) // 2, wall[0] + (wall[2] - wall[0]) // 2 + 2,
                                        wall[0] + (wall[2] - wall[0]) // 2 + 1, wall[0] + (wall[2] - wall[0]) // 2 - 1)
 
                 else:
-                    self.editor.placeBlock(
-                        (wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 1, wall[1] + 1), Block("air"))
-                    self.editor.placeBlock(
-                        (wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 2, wall[1] + 1), Block("air"))
-
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1], wall[1]),
-                                           Block(self.blocks["stairs"], {"facing": "south"}))
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1], wall[1]),
-                                           Block(self.blocks["stairs"], {"facing": "west"}))
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2 - 1, self.coordinates_min[1], wall[1]),
-                                           Block(self.blocks["stairs"], {"facing": "east"}))
-
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 3, wall[1]),
-                                           Block(self.blocks["stairs"], {"facing": "south", "half": "top"}))
-                    self.editor.placeBlock(
+                    self.canvas.placeBlock(
+                        (wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 1, wall[1] + 1), self.air)
+                    self.canvas.placeBlock(
+                        (wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 2, wall[1] + 1), self.air)
+
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1], wall[1]),
+                                           self.stairs_south)
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1], wall[1]),
+                                           self.stairs_west)
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2 - 1, self.coordinates_min[1], wall[1]),
+                                           self.stairs_east)
+
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 3, wall[1]),
+                                           self.stairs_south_top)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1] + 3, wall[1]),
-                        Block(self.blocks["stairs"], {"facing": "west", "half": "top"}))
-                    self.editor.placeBlock(
+                        self.stairs_west_top)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 - 1, self.coordinates_min[1] + 3, wall[1]),
-                        Block(self.blocks["stairs"], {"facing": "east", "half": "top"}))
+                        self.stairs_east_top)
 
                     self.entranceCo = (wall[0] + (wall[2] - wall[0]) // 2, wall[0] + (wall[2] - wall[0]) // 2 + 1,
                                        wall[0] + (wall[2] - wall[0]) // 2 + 1, wall[0] + (wall[2] - wall[0]) // 2 - 1)
 
             case "E":
                 if (wall[3] - wall[1]) % 2 != 0:
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1] + 1, (wall[1] + wall[3]) // 2 + 1),
-                                           Block("air"))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1] + 2, (wall[1] + wall[3]) // 2 + 1),
-                                           Block("air"))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1] + 1, (wall[1] + wall[3]) // 2),
-                                           Block("air"))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1] + 2, (wall[1] + wall[3]) // 2),
-                                           Block("air"))
-
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2),
-                                           Block(self.blocks["stairs"], {"facing": "west"}))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2 + 1),
-                                           Block(self.blocks["stairs"], {"facing": "west"}))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2 - 1),
-                                           Block(self.blocks["stairs"], {"facing": "south"}))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2 + 2),
-                                           Block(self.blocks["stairs"], {"facing": "north"}))
-
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2),
-                                           Block(self.blocks["stairs"], {"facing": "west", "half": "top"}))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 + 1),
-                                           Block(self.blocks["stairs"], {"facing": "west", "half": "top"}))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 - 1),
-                                           Block(self.blocks["stairs"], {"facing": "south", "half": "top"}))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 + 2),
-                                           Block(self.blocks["stairs"], {"facing": "north", "half": "top"}))
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 1, (wall[1] + wall[3]) // 2 + 1),
+                                           self.air)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 2, (wall[1] + wall[3]) // 2 + 1),
+                                           self.air)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 1, (wall[1] + wall[3]) // 2),
+                                           self.air)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 2, (wall[1] + wall[3]) // 2),
+                                           self.air)
+
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2),
+                                           self.stairs_west)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2 + 1),
+                                           self.stairs_west)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2 - 1),
+                                           self.stairs_south)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2 + 2),
+                                           self.stairs_north)
+
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2),
+                                           self.stairs_west_top)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 + 1),
+                                           self.stairs_west_top)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 - 1),
+                                           self.stairs_south_top)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 + 2),
+                                           self.stairs_north_top)
 
                     self.entranceCo = (
                     (wall[1] + wall[3]) // 2, (wall[1] + wall[3]) // 2 + 2, (wall[1] + wall[3]) // 2 + 1,
                     (wall[1] + wall[3]) // 2 - 1)
                 else:
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1] + 1, (wall[1] + wall[3]) // 2),
-                                           Block("air"))
-                    self.editor.placeBlock((wall[0], self.coordinates_min[1] + 2, (wall[1] + wall[3]) // 2),
-                                           Block("air"))
-
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2),
-                                           Block(self.blocks["stairs"], {"facing": "west"}))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2 + 1),
-                                           Block(self.blocks["stairs"], {"facing": "north"}))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2 - 1),
-                                           Block(self.blocks["stairs"], {"facing": "south"}))
-
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2),
-                                           Block(self.blocks["stairs"], {"facing": "west", "half": "top"}))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 + 1),
-                                           Block(self.blocks["stairs"], {"facing": "north", "half": "top"}))
-                    self.editor.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 - 1),
-                                           Block(self.blocks["stairs"], {"facing": "south", "half": "top"}))
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 1, (wall[1] + wall[3]) // 2),
+                                           self.air)
+                    self.canvas.placeBlock((wall[0], self.coordinates_min[1] + 2, (wall[1] + wall[3]) // 2),
+                                           self.air)
+
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2),
+                                           self.stairs_west)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2 + 1),
+                                           self.stairs_north)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1], (wall[1] + wall[3]) // 2 - 1),
+                                           self.stairs_south)
+
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2),
+                                           self.stairs_west_top)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 + 1),
+                                           self.stairs_north_top)
+                    self.canvas.placeBlock((wall[0] + 1, self.coordinates_min[1] + 3, (wall[1] + wall[3]) // 2 - 1),
+                                           self.stairs_south_top)
 
                     self.entranceCo = (
                     (wall[1] + wall[3]) // 2, (wall[1] + wall[3]) // 2 + 1, (wall[1] + wall[3]) // 2 + 1,
                     (wall[1] + wall[3]) // 2 - 1)
 
             case "S":
-                print(wall)
+                logger.debug("Entrance wall %s", wall)
                 if (wall[2] - wall[0]) % 2 != 0:
-                    self.editor.placeBlock(
-                        (wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1] + 1, wall[1]), Block("air"))
-                    self.editor.placeBlock(
-                        (wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1] + 2, wall[1]), Block("air"))
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 1, wall[1]),
-                                           Block("air"))
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 2, wall[1]),
-                                           Block("air"))
-
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1], wall[1] + 1),
-                                           Block(self.blocks["stairs"], {"facing": "north"}))
-                    self.editor.placeBlock(
+                    self.canvas.placeBlock(
+                        (wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1] + 1, wall[1]), self.air)
+                    self.canvas.placeBlock(
+                        (wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1] + 2, wall[1]), self.air)
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 1, wall[1]),
+                                           self.air)
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 2, wall[1]),
+                                           self.air)
+
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1], wall[1] + 1),
+                                           self.stairs_north)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1], wall[1] + 1),
-                        Block(self.blocks["stairs"], {"facing": "north"}))
-                    self.editor.placeBlock(
+                        self.stairs_north)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 - 1, self.coordinates_min[1], wall[1] + 1),
-                        Block(self.blocks["stairs"], {"facing": "east"}))
-                    self.editor.placeBlock(
+                        self.stairs_east)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 + 2, self.coordinates_min[1], wall[1] + 1),
-                        Block(self.blocks["stairs"], {"facing": "west"}))
+                        self.stairs_west)
 
-                    self.editor.placeBlock(
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 3, wall[1] + 1),
-                        Block(self.blocks["stairs"], {"facing": "north", "half": "top"}))
-                    self.editor.placeBlock(
+                        self.stairs_north_top)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1] + 3, wall[1] + 1),
-                        Block(self.blocks["stairs"], {"facing": "north", "half": "top"}))
-                    self.editor.placeBlock(
+                        self.stairs_north_top)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 - 1, self.coordinates_min[1] + 3, wall[1] + 1),
-                        Block(self.blocks["stairs"], {"facing": "east", "half": "top"}))
-                    self.editor.placeBlock(
+                        self.stairs_east_top)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 + 2, self.coordinates_min[1] + 3, wall[1] + 1),
-                        Block(self.blocks["stairs"], {"facing": "west", "half": "top"}))
+                        self.stairs_west_top)
 
                     self.entranceCo = (wall[0] + (wall[2] - wall[0]) // 2, wall[0] + (wall[2] - wall[0]) // 2 + 2,
                                        wall[0] + (wall[2] - wall[0]) // 2 + 1, wall[0] + (wall[2] - wall[0]) // 2 - 1)
                 else:
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 1, wall[1]),
-                                           Block("air"))
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 2, wall[1]),
-                                           Block("air"))
-
-                    self.editor.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1], wall[1] + 1),
-                                           Block(self.blocks["stairs"], {"facing": "north"}))
-                    self.editor.placeBlock(
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 1, wall[1]),
+                                           self.air)
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 2, wall[1]),
+                                           self.air)
+
+                    self.canvas.placeBlock((wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1], wall[1] + 1),
+                                           self.stairs_north)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1], wall[1] + 1),
-                        Block(self.blocks["stairs"], {"facing": "west"}))
-                    self.editor.placeBlock(
+                        self.stairs_west)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 - 1, self.coordinates_min[1], wall[1] + 1),
-                        Block(self.blocks["stairs"], {"facing": "east"}))
+                        self.stairs_east)
 
-                    self.editor.placeBlock(
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2, self.coordinates_min[1] + 3, wall[1] + 1),
-                        Block(self.blocks["stairs"], {"facing": "north", "half": "top"}))
-                    self.editor.placeBlock(
+                        self.stairs_north_top)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 + 1, self.coordinates_min[1] + 3, wall[1] + 1),
-                        Block(self.blocks["stairs"], {"facing": "west", "half": "top"}))
-                    self.editor.placeBlock(
+                        self.stairs_west_top)
+                    self.canvas.placeBlock(
                         (wall[0] + (wall[2] - wall[0]) // 2 - 1, self.coordinates_min[1] + 3, wall[1] + 1),
-                        Block(self.blocks["stairs"], {"facing": "east", "half": "top"}))
+                        self.stairs_east_top)
 
                     self.entranceCo = (wall[0] + (wall[2] - wall[0]) // 2, wall[0] + (wall[2] - wall[0]) // 2 + 1,
                                        wall[0] + (wall[2] - wall[0]) // 2 + 1, wall[0] + (wall[2] - wall[0]) // 2 - 1)
@@ -1048,48 +1072,50 @@ class House:
                     match self.direction:
                         case "N":
                             if not (i in self.entranceCo and y == z_min):
-                                self.editor.placeBlock((i, y_min - 1, y), Block("oak_log"))
-                                self.editor.placeBlock((i, y_min, y), self.gardenOutline)
-                                self.editor.placeBlock((i, y_min + 1, y), self.gardenOutline)
-                                self.editor.placeBlock((i, y_min + 2, y), self.gardenOutline)
+                                self.canvas.placeBlock((i, y_min - 1, y), self.oak_log)
+                                self.canvas.placeBlock((i, y_min, y), self.gardenOutline)
+                                self.canvas.placeBlock((i, y_min + 1, y), self.gardenOutline)
+                                self.canvas.placeBlock((i, y_min + 2, y), self.gardenOutline)
                         case "S":
                             if not (i in self.entranceCo and y == z_max - 1):
-                                self.editor.placeBlock((i, y_min - 1, y), Block("oak_log"))
-                                self.editor.placeBlock((i, y_min, y), self.gardenOutline)
-                                self.editor.placeBlock((i, y_min + 1, y), self.gardenOutline)
-                                self.editor.placeBlock((i, y_min + 2, y), self.gardenOutline)
+                                self.canvas.placeBlock((i, y_min - 1, y), self.oak_log)
+                                self.canvas.placeBlock((i, y_min, y), self.gardenOutline)
+                                self.canvas.placeBlock((i, y_min + 1, y), self.gardenOutline)
+                                self.canvas.placeBlock((i, y_min + 2, y), self.gardenOutline)
                         case "E":
                             if not (i == x_max - 1 and y in self.entranceCo):
-                                self.editor.placeBlock((i, y_min - 1, y), Block("oak_log"))
-                                self.editor.placeBlock((i, y_min, y), self.gardenOutline)
-                                self.editor.placeBlock((i, y_min + 1, y), self.gardenOutline)
-                                self.editor.placeBlock((i, y_min + 2, y), self.gardenOutline)
+                                self.canvas.placeBlock((i, y_min - 1, y), self.oak_log)
+                                self.canvas.placeBlock((i, y_min, y), self.gardenOutline)
+                                self.canvas.placeBlock((i, y_min + 1, y), self.gardenOutline)
+                                self.canvas.placeBlock((i, y_min + 2, y), self.gardenOutline)
 
                         case "W":
                             if not (i == x_min and y in self.entranceCo):
-                                self.editor.placeBlock((i, y_min - 1, y), Block("oak_log"))
-                                self.editor.placeBlock((i, y_min, y), self.gardenOutline)
-                                self.editor.placeBlock((i, y_min + 1, y), self.gardenOutline)
-                                self.editor.placeBlock((i, y_min + 2, y), self.gardenOutline)
+                                self.canvas.placeBlock((i, y_min - 1, y), self.oak_log)
+                                self.canvas.placeBlock((i, y_min, y), self.gardenOutline)
+                                self.canvas.placeBlock((i, y_min + 1, y), self.gardenOutline)
+                                self.canvas.placeBlock((i, y_min + 2, y), self.gardenOutline)
                             
                         case _:
-                            self.editor.placeBlock((i, y_min - 1, y), self.garden_floor)
+                            self.canvas.placeBlock((i, y_min - 1, y), self.garden_floor)
 
 
                 else:
-                    self.editor.placeBlock((i, y_min - 1, y), self.garden_floor)
+                    self.canvas.placeBlock((i, y_min - 1, y), self.garden_floor)
 
     def build(self):
-        self.createHouseSkeleton()
-        self.putWallOnSkeleton()
-        self.placeDoor()
-        self.placeRoof()
-        self.putCelling()
-        self.placeWindow()
-        self.placeEntrance()
-        self.placeGardenOutline()
-        if self.nbEtage > 1:
-            self.placeStairs()
+        with stage("House.build"):
+            self.createHouseSkeleton()
+            self.putWallOnSkeleton()
+            self.placeDoor()
+            self.placeRoof()
+            self.putCelling()
+            self.placeWindow()
+            self.placeEntrance()
+            self.placeGardenOutline()
+            if self.nbEtage > 1:
+                self.placeStairs()
+            self.canvas.emit(self.editor)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,278 @@
+import json
+
+import numpy as np
+from gdpc import Block
+from scipy import ndimage
+
+from placement.VoxelStore import VoxelStore
+
+Y_BEGIN = -64
+Y_SIZE = 384
+
+
+def fractal_heightmap(size: int, seed: int = 0, octaves: int = 6, persistence: float = 0.5) -> np.ndarray:
+    """
+    Generate a fractal heightmap by summing octaves of smoothed random noise.
+
+    Args:
+        size (int): Width and depth of the heightmap.
+        seed (int, optional): Seed of the noise. Defaults to 0.
+        octaves (int, optional): Number of octaves. Defaults to 6.
+        persistence (float, optional): Amplitude factor between two octaves. Defaults to 0.5.
+
+    Returns:
+        np.ndarray: Heightmap (size, size) normalized between 0 and 1.
+    """
+    rng = np.random.default_rng(seed)
+    heightmap = np.zeros((size, size))
+    amplitude = 1.0
+    for octave in range(octaves):
+        cells = min(size, 2 ** (octave + 2))
+        noise = rng.random((cells + 1, cells + 1))
+        heightmap += amplitude * ndimage.zoom(noise, size / cells, order=3, mode="nearest")[:size, :size]
+        amplitude *= persistence
+    heightmap -= heightmap.min()
+    return heightmap / max(heightmap.max(), 1e-9)
+
+
+class SyntheticWorld:
+    """
+    Procedural world made of terrain columns, water below the sea level and trees, with an overlay of placed blocks.
+
+    The world covers a chunk aligned area. Columns are indexed [x, z] relative to the origin of that area.
+
+    Attributes:
+        origin (tuple[int, int]): World coordinates (x, z) of the first column.
+        ground (np.ndarray): y of the top ground block of each column.
+        sea_level (int): y of the water surface.
+        store (VoxelStore): Trees and every block placed through the server, over the terrain.
+    """
+
+    def __init__(self, origin: tuple[int, int], ground: np.ndarray, sea_level: int = 62):
+        self.origin = (origin[0] - origin[0] % 16, origin[1] - origin[1] % 16)
+        self.ground = ground.astype(np.int32)
+        self.sea_level = sea_level
+        self.store = VoxelStore()
+
+        self.air = self.store.get_index(Block("minecraft:air"))
+        self.void_air = self.store.get_index(Block("minecraft:void_air"))
+        self.bedrock = self.store.get_index(Block("minecraft:bedrock"))
+        self.stone = self.store.get_index(Block("minecraft:stone"))
+        self.dirt = self.store.get_index(Block("minecraft:dirt"))
+        self.grass = self.store.get_index(Block("minecraft:grass_block", {"snowy": "false"}))
+        self.sand = self.store.get_index(Block("minecraft:sand"))
+        self.water = self.store.get_index(Block("minecraft:water", {"level": "0"}))
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.ground.shape
+
+    @staticmethod
+    def generate(origin: tuple[int, int], size: int, seed: int = 0, relief: int = 40, sea_level: int = 62,
+                 tree_density: float = 0.01, rivers: int = 1) -> "SyntheticWorld":
+        """
+        Generate a world with a fractal terrain, water bodies, rivers and tree cover.
+
+        Args:
+            origin (tuple[int, int]): World coordinates (x, z) of the area, rounded down to a chunk.
+            size (int): Width and depth of the area, rounded up to a chunk.
+            seed (int, optional): Seed of the generation. Defaults to 0.
+            relief (int, optional): Height difference between the lowest and highest ground. Defaults to 40.
+            sea_level (int, optional): y of the water surface. Defaults to 62.
+            tree_density (float, optional): Probability of a tree on a land column. Defaults to 0.01.
+            rivers (int, optional): Number of rivers crossing the area. Defaults to 1.
+
+        Returns:
+            SyntheticWorld: The generated world.
+        """
+        size = -(-size // 16) * 16
+        ground = sea_level - relief // 4 + np.rint(fractal_heightmap(size, seed) * relief)
+        world = SyntheticWorld(origin, ground, sea_level)
+        rng = np.random.default_rng(seed + 1)
+        world.carve_rivers(rng, rivers)
+        world.plant_trees(rng, tree_density)
+        return world
+
+    def carve_rivers(self, rng: np.random.Generator, count: int, width: int = 6, depth: int = 3):
+        """
+        Carve meandering rivers from one side of the area to the other, with their bed under the sea level.
+
+        Args:
+            rng (np.random.Generator): Random generator.
+            count (int): Number of rivers.
+            width (int, optional): Width of the rivers. Defaults to 6.
+            depth (int, optional): Depth of the river bed under the sea level. Defaults to 3.
+        """
+        size_x, size_z = self.size
+        path = np.zeros(self.size, dtype=bool)
+        for _ in range(count):
+            xs = np.arange(size_x)
+            amplitude = rng.uniform(0.05, 0.2) * size_z
+            period = rng.uniform(0.5, 1.5) * size_x
+            drift = np.cumsum(rng.normal(0, 0.5, size_x))
+            zs = rng.uniform(0.25, 0.75) * size_z + amplitude * np.sin(2 * np.pi * xs / period) + drift
+            zs = np.clip(np.rint(zs), 0, size_z - 1).astype(int)
+            # Join consecutive columns so that the river has no gaps.
+            for x in xs.tolist():
+                low, high = sorted((zs[x], zs[max(x - 1, 0)]))
+                path[x, low:high + 1] = True
+        if not path.any():
+            return
+        distance = ndimage.distance_transform_edt(~path)
+        bed = self.sea_level - depth + np.rint(distance).astype(np.int32)
+        river = distance <= width / 2
+        self.ground[river] = np.minimum(self.ground[river], bed[river])
+
+    def plant_trees(self, rng: np.random.Generator, density: float):
+        """
+        Plant oak trees on random land columns.
+
+        Args:
+            rng (np.random.Generator): Random generator.
+            density (float): Probability of a tree on a land column.
+        """
+        land = (self.ground > self.sea_level + 1)
+        land[:2, :] = land[-2:, :] = land[:, :2] = land[:, -2:] = False
+        xs, zs = np.nonzero(land & (rng.random(self.ground.shape) < density))
+        if len(xs) == 0:
+            return
+        ys = self.ground[xs, zs] + 1
+        heights = rng.integers(4, 7, len(xs))
+        xs, zs = xs + self.origin[0], zs + self.origin[1]
+
+        leaves = []
+        for dy, radius in ((-2, 2), (-1, 2), (0, 1), (1, 1)):
+            for dx in range(-radius, radius + 1):
+                for dz in range(-radius, radius + 1):
+                    leaves.append(np.stack((xs + dx, ys + heights + dy, zs + dz), axis=1))
+        logs = [np.stack((xs, ys + i, zs), axis=1)[heights > i] for i in range(int(heights.max()))]
+        self.store.set_many(np.concatenate(leaves), self.store.get_index(
+            Block("minecraft:oak_leaves", {"distance": "1", "persistent": "false", "waterlogged": "false"})))
+        self.store.set_many(np.concatenate(logs), self.store.get_index(Block("minecraft:oak_log", {"axis": "y"})))
+
+    def contains_column(self, x: np.ndarray, z: np.ndarray) -> np.ndarray:
+        lx, lz = x - self.origin[0], z - self.origin[1]
+        return (0 <= lx) & (lx < self.size[0]) & (0 <= lz) & (lz < self.size[1])
+
+    def terrain(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """
+        Get the terrain block of positions, without the overlay.
+
+        Args:
+            x (np.ndarray): x coordinates.
+            y (np.ndarray): y coordinates.
+            z (np.ndarray): z coordinates.
+
+        Returns:
+            np.ndarray: Palette index of each position.
+        """
+        x, y, z = np.broadcast_arrays(x, y, z)
+        inside = self.contains_column(x, z)
+        lx = np.clip(x - self.origin[0], 0, self.size[0] - 1)
+        lz = np.clip(z - self.origin[1], 0, self.size[1] - 1)
+        ground = self.ground[lx, lz]
+        top = np.where(ground <= self.sea_level + 1, self.sand, self.grass)
+        values = np.select(
+            [y == Y_BEGIN, y < ground - 3, y < ground, y == ground, y <= self.sea_level],
+            [self.bedrock, self.stone, self.dirt, top, self.water], self.air)
+        outside = ~inside | (y < Y_BEGIN) | (y >= Y_BEGIN + Y_SIZE)
+        return np.where(outside, self.void_air, values).astype(np.uint16)
+
+    def get_values(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Get the block of positions, placed blocks first.
+
+        Args:
+            positions (np.ndarray): Positions (N, 3).
+
+        Returns:
+            np.ndarray: Palette index of each position.
+        """
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 3)
+        overlay = self.store.get_many(positions)
+        terrain = self.terrain(positions[:, 0], positions[:, 1], positions[:, 2])
+        return np.where(overlay > 0, overlay, terrain)
+
+    def get_section(self, chunk_x: int, section_y: int, chunk_z: int) -> np.ndarray:
+        """
+        Get the blocks of a chunk section.
+
+        Args:
+            chunk_x (int): x of the chunk.
+            section_y (int): y of the section.
+            chunk_z (int): z of the chunk.
+
+        Returns:
+            np.ndarray: Palette indices (16, 16, 16), indexed [y, z, x].
+        """
+        r = np.arange(16)
+        values = self.terrain(chunk_x * 16 + r[None, None, :], section_y * 16 + r[:, None, None],
+                              chunk_z * 16 + r[None, :, None])
+        overlay = self.store.sections.get((chunk_x, section_y, chunk_z))
+        if overlay is not None:
+            values = np.where(overlay > 0, overlay, values)
+        return values
+
+    def place(self, positions: np.ndarray, blocks: list[Block]) -> np.ndarray:
+        """
+        Place blocks in the overlay.
+
+        Args:
+            positions (np.ndarray): Positions (N, 3).
+            blocks (list[Block]): Block of each position.
+
+        Returns:
+            np.ndarray: Whether each placement changed the world.
+        """
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 3)
+        values = np.array([self.store.get_index(block) for block in blocks], dtype=np.uint16)
+        changed = self.get_values(positions) != values
+        self.store.set_many(positions, values)
+        return changed
+
+    def biome(self, x: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """
+        Get the biome of columns: river where the ground is under water, plains elsewhere.
+
+        Args:
+            x (np.ndarray): x coordinates.
+            z (np.ndarray): z coordinates.
+
+        Returns:
+            np.ndarray: Biome id of each column.
+        """
+        x, z = np.broadcast_arrays(x, z)
+        lx = np.clip(x - self.origin[0], 0, self.size[0] - 1)
+        lz = np.clip(z - self.origin[1], 0, self.size[1] - 1)
+        return np.where(self.ground[lx, lz] < self.sea_level, "minecraft:river", "minecraft:plains")
+
+    def save(self, path: str):
+        """
+        Save a snapshot of the world to a .npz file.
+
+        Args:
+            path (str): Path of the file.
+        """
+        positions, values = self.store.voxels()
+        palette = np.array([""] + [json.dumps([block.id, block.states, block.data])
+                                   for block in self.store.palette[1:]], dtype=str)
+        np.savez_compressed(path, origin=np.array(self.origin), ground=self.ground, sea_level=self.sea_level,
+                            positions=positions, values=values, palette=palette)
+
+    @staticmethod
+    def load(path: str) -> "SyntheticWorld":
+        """
+        Load a snapshot saved with SyntheticWorld.save.
+
+        Args:
+            path (str): Path of the file.
+
+        Returns:
+            SyntheticWorld: The loaded world.
+        """
+        with np.load(path) as data:
+            world = SyntheticWorld(tuple(data["origin"].tolist()), data["ground"], int(data["sea_level"]))
+            palette = [None] + [Block(*json.loads(block)) for block in data["palette"].tolist()[1:]]
+            remap = np.array([0] + [world.store.get_index(block) for block in palette[1:]], dtype=np.uint16)
+            world.store.set_many(data["positions"], remap[data["values"]])
+        return world
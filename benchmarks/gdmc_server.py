@@ -0,0 +1,406 @@
+"""
+Local stand-in for the GDMC HTTP interface, serving a synthetic or snapshot world.
+
+It implements the endpoints used by the generator (build area, blocks GET/PUT, chunks, biomes, command, version), with
+an optional artificial latency and bandwidth, and logs every request with its size and timing.
+
+Usage, from the root of the repository:
+    python -m benchmarks.gdmc_server --size 256 --latency 0.005 --bandwidth 50e6 --log server_log.jsonl
+then run main.py, which connects to http://localhost:9000 like it does with Minecraft.
+"""
+import argparse
+import json
+import re
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from math import ceil, log2
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+from gdpc import Block
+
+from benchmarks.SyntheticWorld import SyntheticWorld, Y_BEGIN, Y_SIZE
+
+MINECRAFT_VERSION = "1.20.4"
+HEIGHTMAP_TYPES = ("MOTION_BLOCKING", "MOTION_BLOCKING_NO_LEAVES", "OCEAN_FLOOR", "WORLD_SURFACE")
+
+TAG_BYTE, TAG_INT, TAG_STRING, TAG_LIST, TAG_COMPOUND, TAG_LONG_ARRAY = 1, 3, 8, 9, 10, 12
+
+
+def _nbt_name(name: str) -> bytes:
+    encoded = name.encode("utf-8")
+    return struct.pack(">H", len(encoded)) + encoded
+
+
+def _nbt_named(tag_id: int, name: str, payload: bytes) -> bytes:
+    return bytes((tag_id,)) + _nbt_name(name) + payload
+
+
+def _nbt_compound(tags: list[bytes]) -> bytes:
+    return b"".join(tags) + b"\x00"
+
+
+def _nbt_list(tag_id: int, payloads: list[bytes]) -> bytes:
+    return struct.pack(">bi", tag_id if payloads else 0, len(payloads)) + b"".join(payloads)
+
+
+def _nbt_long_array(values: np.ndarray) -> bytes:
+    return struct.pack(">i", len(values)) + values.astype(">i8").tobytes()
+
+
+def pack_bits(values: np.ndarray, bits: int) -> np.ndarray:
+    """
+    Pack values in longs like Minecraft does since 1.16: entries never span two longs.
+
+    Args:
+        values (np.ndarray): Unsigned values, each one lower than 2**bits.
+        bits (int): Bits per entry.
+
+    Returns:
+        np.ndarray: Packed longs, as int64.
+    """
+    per_long = 64 // bits
+    padded = np.zeros(-(-len(values) // per_long) * per_long, dtype=np.uint64)
+    padded[:len(values)] = values
+    shifts = (np.arange(per_long, dtype=np.uint64) * np.uint64(bits))
+    longs = np.bitwise_or.reduce(padded.reshape(-1, per_long) << shifts, axis=1)
+    return longs.view(np.int64)
+
+
+def block_state_tag(block: Block) -> bytes:
+    tags = [_nbt_named(TAG_STRING, "Name", _nbt_name(block.id if ":" in block.id else "minecraft:" + block.id))]
+    if block.states:
+        tags.append(_nbt_named(TAG_COMPOUND, "Properties", _nbt_compound(
+            [_nbt_named(TAG_STRING, key, _nbt_name(str(value))) for key, value in block.states.items()])))
+    return _nbt_compound(tags)
+
+
+def parse_block(text: str) -> Block:
+    """
+    Parse a block argument of a command, like minecraft:oak_log[axis=x].
+
+    Args:
+        text (str): Block argument.
+
+    Returns:
+        Block: Parsed block. Block entity data is ignored.
+    """
+    match = re.fullmatch(r"([a-z0-9_:.\-/]+)(?:\[(.*)])?(?:\{.*})?", text)
+    if match is None:
+        raise ValueError(f"Invalid block: {text}")
+    states = {}
+    if match.group(2):
+        for state in match.group(2).split(","):
+            key, value = state.split("=")
+            states[key.strip()] = value.strip()
+    return Block(match.group(1), states)
+
+
+class GDMCServer(ThreadingHTTPServer):
+    """
+    HTTP server answering like the GDMC HTTP interface.
+
+    Attributes:
+        world (SyntheticWorld): Served world.
+        build_area (tuple[int, int, int, int, int, int]): Build area, as xFrom, yFrom, zFrom, xTo, yTo, zTo.
+        latency (float): Seconds added to every request.
+        bandwidth (float): Bytes per second of the simulated link, 0 for no limit.
+        log (list[dict]): One entry per request: method, path, request and response bytes, and duration.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], world: SyntheticWorld, build_area=None, latency: float = 0,
+                 bandwidth: float = 0, log_path: str = None):
+        super().__init__(address, GDMCRequestHandler)
+        self.world = world
+        if build_area is None:
+            build_area = (world.origin[0], 0, world.origin[1],
+                          world.origin[0] + world.size[0] - 1, 255, world.origin[1] + world.size[1] - 1)
+        self.build_area = build_area
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.log = []
+        self.log_path = log_path
+        self.lock = threading.Lock()
+
+    def record(self, entry: dict):
+        with self.lock:
+            self.log.append(entry)
+            if self.log_path is not None:
+                with open(self.log_path, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+
+    def summary(self) -> dict:
+        """
+        Summarize the request log by endpoint.
+
+        Returns:
+            dict: Number of requests, bytes received, bytes sent and total duration for each method and path.
+        """
+        summary = {}
+        for entry in self.log:
+            key = f"{entry['method']} {entry['path']}"
+            item = summary.setdefault(key, {"requests": 0, "request_bytes": 0, "response_bytes": 0, "seconds": 0.0})
+            item["requests"] += 1
+            item["request_bytes"] += entry["request_bytes"]
+            item["response_bytes"] += entry["response_bytes"]
+            item["seconds"] += entry["seconds"]
+        return summary
+
+    def encode_chunks(self, chunk_x: int, chunk_z: int, size_x: int, size_z: int) -> bytes:
+        """
+        Encode chunks as the GDMC HTTP interface does, as an uncompressed NBT compound with a "Chunks" list.
+
+        Args:
+            chunk_x (int): x of the first chunk.
+            chunk_z (int): z of the first chunk.
+            size_x (int): Number of chunks along x.
+            size_z (int): Number of chunks along z.
+
+        Returns:
+            bytes: NBT data.
+        """
+        world = self.world
+        palette = world.store.palette
+        state_tags = {}
+        is_air = np.array([block is None or block.id.endswith("air") for block in palette])
+        is_leaves = np.array([block is not None and block.id.endswith("_leaves") for block in palette])
+        is_water = np.array([block is not None and block.id.endswith("water") for block in palette])
+        masks = {"MOTION_BLOCKING": ~is_air, "MOTION_BLOCKING_NO_LEAVES": ~is_air & ~is_leaves,
+                 "OCEAN_FLOOR": ~is_air & ~is_water, "WORLD_SURFACE": ~is_air}
+        heightmap_bits = max(1, ceil(log2(Y_SIZE)))
+
+        chunks = []
+        for z in range(chunk_z, chunk_z + size_z):
+            for x in range(chunk_x, chunk_x + size_x):
+                columns = np.concatenate([world.get_section(x, y, z)
+                                          for y in range(Y_BEGIN // 16, (Y_BEGIN + Y_SIZE) // 16)])
+
+                sections = []
+                for i, y in enumerate(range(Y_BEGIN // 16, (Y_BEGIN + Y_SIZE) // 16)):
+                    values = columns[i * 16:(i + 1) * 16].reshape(-1)
+                    used, indices = np.unique(values, return_inverse=True)
+                    for value in used.tolist():
+                        if value not in state_tags:
+                            state_tags[value] = block_state_tag(palette[value])
+                    block_states = [_nbt_named(TAG_LIST, "palette", _nbt_list(
+                        TAG_COMPOUND, [state_tags[value] for value in used.tolist()]))]
+                    if len(used) > 1:
+                        bits = max(4, ceil(log2(len(used))))
+                        block_states.append(_nbt_named(TAG_LONG_ARRAY, "data", _nbt_long_array(
+                            pack_bits(indices.reshape(-1), bits))))
+
+                    r = np.arange(4) * 4 + 2
+                    biomes = world.biome(x * 16 + r[None, :], z * 16 + r[:, None]).reshape(-1)
+                    biome_palette, biome_indices = np.unique(biomes, return_inverse=True)
+                    biome_tags = [_nbt_named(TAG_LIST, "palette", _nbt_list(
+                        TAG_STRING, [_nbt_name(str(biome)) for biome in biome_palette]))]
+                    if len(biome_palette) > 1:
+                        biome_tags.append(_nbt_named(TAG_LONG_ARRAY, "data", _nbt_long_array(pack_bits(
+                            np.tile(biome_indices.reshape(-1), 4), max(1, ceil(log2(len(biome_palette))))))))
+
+                    sections.append(_nbt_compound([
+                        _nbt_named(TAG_BYTE, "Y", struct.pack(">b", y)),
+                        _nbt_named(TAG_COMPOUND, "block_states", _nbt_compound(block_states)),
+                        _nbt_named(TAG_COMPOUND, "biomes", _nbt_compound(biome_tags)),
+                    ]))
+
+                heightmaps = []
+                for name in HEIGHTMAP_TYPES:
+                    solid = masks[name][columns]
+                    top = Y_SIZE - np.argmax(solid[::-1], axis=0)
+                    top[~solid.any(axis=0)] = 0
+                    heightmaps.append(_nbt_named(TAG_LONG_ARRAY, name, _nbt_long_array(
+                        pack_bits(top.reshape(-1), heightmap_bits))))
+
+                chunks.append(_nbt_compound([
+                    _nbt_named(TAG_INT, "xPos", struct.pack(">i", x)),
+                    _nbt_named(TAG_INT, "zPos", struct.pack(">i", z)),
+                    _nbt_named(TAG_INT, "yPos", struct.pack(">i", Y_BEGIN // 16)),
+                    _nbt_named(TAG_LIST, "sections", _nbt_list(TAG_COMPOUND, sections)),
+                    _nbt_named(TAG_COMPOUND, "Heightmaps", _nbt_compound(heightmaps)),
+                    _nbt_named(TAG_LIST, "block_entities", _nbt_list(TAG_COMPOUND, [])),
+                ]))
+
+        return _nbt_named(TAG_COMPOUND, "", _nbt_compound([
+            _nbt_named(TAG_LIST, "Chunks", _nbt_list(TAG_COMPOUND, chunks)),
+            _nbt_named(TAG_INT, "ChunkX", struct.pack(">i", chunk_x)),
+            _nbt_named(TAG_INT, "ChunkZ", struct.pack(">i", chunk_z)),
+            _nbt_named(TAG_INT, "ChunkDX", struct.pack(">i", size_x)),
+            _nbt_named(TAG_INT, "ChunkDZ", struct.pack(">i", size_z)),
+        ]))
+
+    def run_command(self, command: str) -> dict:
+        """
+        Run a command on the world. Only fill, setblock and setbuildarea with absolute coordinates change it.
+
+        Args:
+            command (str): Command, without the leading slash.
+
+        Returns:
+            dict: Status entry as returned by the GDMC HTTP interface.
+        """
+        words = command.split()
+        try:
+            if words and words[0] == "fill" and len(words) >= 8:
+                first = np.array(words[1:4], dtype=int)
+                last = np.array(words[4:7], dtype=int)
+                low, high = np.minimum(first, last), np.maximum(first, last)
+                grid = np.mgrid[low[0]:high[0] + 1, low[1]:high[1] + 1, low[2]:high[2] + 1].reshape(3, -1).T
+                block = parse_block(words[7])
+                with self.lock:
+                    changed = self.world.place(grid, [block] * len(grid))
+                return {"status": int(changed.sum())}
+            if words and words[0] == "setblock" and len(words) >= 5:
+                with self.lock:
+                    self.world.place(np.array([words[1:4]], dtype=int), [parse_block(words[4])])
+                return {"status": 1}
+            if words and words[0] == "setbuildarea" and len(words) == 7:
+                self.build_area = tuple(int(word) for word in words[1:7])
+                return {"status": 1}
+        except ValueError as e:
+            return {"status": 0, "message": str(e)}
+        return {"status": 1, "message": f"Ignored by the local server: {command}"}
+
+
+class GDMCRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: GDMCServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _parameters(self) -> dict:
+        return {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+
+    @staticmethod
+    def _range(parameters: dict, axis: str) -> range:
+        start = int(parameters.get(axis, 0))
+        size = int(parameters.get("d" + axis, 1))
+        return range(start, start + size) if size >= 0 else range(start + size + 1, start + 1)
+
+    def _respond(self, started: float, request_bytes: int, body: bytes, content_type: str = "application/json",
+                 status: int = 200):
+        transfer = (request_bytes + len(body)) / self.server.bandwidth if self.server.bandwidth > 0 else 0
+        delay = self.server.latency + transfer - (time.perf_counter() - started)
+        if delay > 0:
+            time.sleep(delay)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.record({"time": time.time(), "method": self.command, "path": urlparse(self.path).path,
+                            "request_bytes": request_bytes, "response_bytes": len(body),
+                            "seconds": time.perf_counter() - started})
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_GET(self):
+        started = time.perf_counter()
+        path = urlparse(self.path).path
+        parameters = self._parameters()
+        world = self.server.world
+
+        if path == "/buildarea":
+            keys = ("xFrom", "yFrom", "zFrom", "xTo", "yTo", "zTo")
+            body = json.dumps(dict(zip(keys, self.server.build_area))).encode()
+        elif path == "/version":
+            return self._respond(started, 0, MINECRAFT_VERSION.encode(), "text/plain")
+        elif path == "/blocks":
+            grid = np.array([(x, y, z) for x in self._range(parameters, "x") for y in self._range(parameters, "y")
+                             for z in self._range(parameters, "z")], dtype=np.int64).reshape(-1, 3)
+            with self.server.lock:
+                values = world.get_values(grid)
+            include_state = parameters.get("includeState", "false").lower() == "true"
+            entries = []
+            for (x, y, z), value in zip(grid.tolist(), values.tolist()):
+                block = world.store.palette[value]
+                entry = {"x": x, "y": y, "z": z, "id": block.id}
+                if include_state:
+                    entry["state"] = block.states
+                entries.append(entry)
+            body = json.dumps(entries).encode()
+        elif path == "/biomes":
+            grid = np.array([(x, y, z) for x in self._range(parameters, "x") for y in self._range(parameters, "y")
+                             for z in self._range(parameters, "z")], dtype=np.int64).reshape(-1, 3)
+            biomes = world.biome(grid[:, 0], grid[:, 2]) if len(grid) else []
+            body = json.dumps([{"x": x, "y": y, "z": z, "id": str(biome)}
+                               for (x, y, z), biome in zip(grid.tolist(), biomes)]).encode()
+        elif path == "/chunks":
+            size_x, size_z = int(parameters.get("dx", 1)), int(parameters.get("dz", 1))
+            with self.server.lock:
+                data = self.server.encode_chunks(int(parameters.get("x", 0)), int(parameters.get("z", 0)),
+                                                 size_x, size_z)
+            if "application/octet-stream" in self.headers.get("Accept", ""):
+                return self._respond(started, 0, data, "application/octet-stream")
+            return self._respond(started, 0, f"{len(data)} bytes of chunk data".encode(), "text/plain")
+        else:
+            return self._respond(started, 0, json.dumps({"message": f"Unknown endpoint {path}"}).encode(),
+                                 status=404)
+        self._respond(started, 0, body)
+
+    def do_PUT(self):
+        started = time.perf_counter()
+        path = urlparse(self.path).path
+        request = self._read_body()
+        if path != "/blocks":
+            return self._respond(started, len(request), json.dumps({"message": f"Unknown endpoint {path}"}).encode(),
+                                 status=404)
+        entries = json.loads(request)
+        positions = np.array([(entry["x"], entry["y"], entry["z"]) for entry in entries], dtype=np.int64)
+        blocks = [Block(entry["id"], entry.get("state", {})) for entry in entries]
+        with self.server.lock:
+            changed = self.server.world.place(positions, blocks)
+        self._respond(started, len(request), json.dumps([{"status": int(value)} for value in changed.tolist()]).encode())
+
+    def do_POST(self):
+        started = time.perf_counter()
+        path = urlparse(self.path).path
+        request = self._read_body()
+        if path != "/command":
+            return self._respond(started, len(request), json.dumps({"message": f"Unknown endpoint {path}"}).encode(),
+                                 status=404)
+        commands = [line for line in request.decode("utf-8").split("\n") if line.strip()]
+        self._respond(started, len(request), json.dumps([self.server.run_command(command)
+                                                         for command in commands]).encode())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the GDMC HTTP interface.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--size", type=int, default=256, help="Width and depth of the synthetic build area.")
+    parser.add_argument("--origin", type=int, nargs=2, default=(0, 0), help="x and z of the build area.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--snapshot", help="Serve a world saved with SyntheticWorld.save instead.")
+    parser.add_argument("--save", help="Save the world to this .npz file on exit.")
+    parser.add_argument("--latency", type=float, default=0, help="Seconds added to every request.")
+    parser.add_argument("--bandwidth", type=float, default=0, help="Bytes per second, 0 for no limit.")
+    parser.add_argument("--log", help="Append one JSON line per request to this file.")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        world = SyntheticWorld.load(args.snapshot)
+    else:
+        world = SyntheticWorld.generate(tuple(args.origin), args.size, args.seed)
+    server = GDMCServer((args.host, args.port), world, latency=args.latency, bandwidth=args.bandwidth,
+                        log_path=args.log)
+    print(f"[GDMC server] Serving {world.size[0]}x{world.size[1]} blocks at http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.summary(), indent=2))
+        if args.save:
+            world.save(args.save)
+
+
+if __name__ == '__main__':
+    main()
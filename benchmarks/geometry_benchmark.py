@@ -0,0 +1,410 @@
+"""
+Microbenchmarks of the networks.geometry primitives used by the roads.
+
+Every benchmark is run on a sweep of parameters (segment length, thickness, radius, number of points). For each
+case, the number of operations per second (best of several repeats) and the memory allocated by one operation
+(peak and retained, measured with tracemalloc) are reported.
+
+The parity checks compare the output of each fast path to its reference implementation on a set of inputs, so that
+an optimization can only land if it draws exactly the same blocks. The run fails if a parity check fails.
+
+Usage, from the root of the repository:
+    python -m benchmarks.geometry_benchmark
+    python -m benchmarks.geometry_benchmark --filter Segment2D --min-time 0.5 --output geometry.json
+    python -m benchmarks.geometry_benchmark --parity-only
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+import numpy as np
+
+from Enums import LINE_OVERLAP, LINE_THICKNESS_MODE
+from networks.geometry.CenterlineIndex import CenterlineIndex
+from networks.geometry.Circle import Circle
+from networks.geometry.Point2D import Point2D
+from networks.geometry.Point3D import Point3D
+from networks.geometry.Polyline import Polyline
+from networks.geometry.Segment2D import Segment2D
+from networks.geometry.Segment3D import Segment3D
+import networks.geometry.curve_tools as curve_tools
+from networks.geometry.Strip import Strip
+import benchmarks.geometry_reference as reference
+from benchmarks.geometry_reference import ReferenceCircle, ReferenceSegment2D, ReferenceSegment3D, greedy_path
+
+SEED = 0
+
+
+def random_points(count: int, extent: int = 1000, seed: int = SEED) -> list[Point2D]:
+    rng = np.random.default_rng(seed)
+    return [Point2D(int(x), int(y)) for x, y in rng.integers(-extent, extent, (count, 2))]
+
+
+def winding_path(count: int, step: int = 60, seed: int = SEED) -> list[tuple[int, int, int]]:
+    """
+    Get the control points of a road that keeps turning, without collinear or too close points.
+
+    Args:
+        count (int): Number of points.
+        step (int, optional): Distance between two points. Defaults to 60.
+        seed (int, optional): Seed of the turns. Defaults to SEED.
+
+    Returns:
+        list[tuple[int, int, int]]: Points (x, y, z), y being the height.
+    """
+    rng = np.random.default_rng(seed)
+    angles = np.cumsum(rng.choice((-1, 1), count) * rng.uniform(0.3, 0.8, count))
+    xs = np.rint(np.cumsum(step * np.cos(angles))).astype(int)
+    zs = np.rint(np.cumsum(step * np.sin(angles))).astype(int)
+    ys = 64 + np.rint(5 * np.sin(np.arange(count))).astype(int)
+    return list(zip(xs.tolist(), ys.tolist(), zs.tolist()))
+
+
+def _segment_2d(length: int) -> Callable:
+    start, end = Point2D(0, 0), Point2D(length, length // 3)
+    return lambda: Segment2D(start, end).segment()
+
+
+def _segment_2d_thick(length: int, thickness: int) -> Callable:
+    start, end = Point2D(0, 0), Point2D(length, length // 3)
+    return lambda: Segment2D(start, end).segment_thick(thickness, LINE_THICKNESS_MODE.MIDDLE)
+
+
+def _segment_2d_array(length: int) -> Callable:
+    start, end = Point2D(0, 0), Point2D(length, length // 3)
+    return lambda: Segment2D(start, end).segment_array()
+
+
+def _segment_2d_thick_array(length: int, thickness: int) -> Callable:
+    start, end = Point2D(0, 0), Point2D(length, length // 3)
+    return lambda: Segment2D(start, end).segment_thick_array(thickness, LINE_THICKNESS_MODE.MIDDLE)
+
+
+def _segment_3d(length: int) -> Callable:
+    start, end = Point3D(0, 0, 0), Point3D(length, length // 5, length // 3)
+    return lambda: Segment3D(start, end).segment()
+
+
+def _segment_3d_array(length: int) -> Callable:
+    start, end = Point3D(0, 0, 0), Point3D(length, length // 5, length // 3)
+    return lambda: Segment3D(start, end).segment_array()
+
+
+def _circle(radius: int) -> Callable:
+    return lambda: Circle(Point2D(0, 0)).circle(radius)
+
+
+def _circle_thick(radius: int, thickness: int) -> Callable:
+    return lambda: Circle(Point2D(0, 0)).circle_thick(radius, radius + thickness - 1)
+
+
+def _circle_thick_array(radius: int, thickness: int) -> Callable:
+    return lambda: Circle(Point2D(0, 0)).circle_thick_array(radius, radius + thickness - 1)
+
+
+def _arc_thick_array(radius: int, thickness: int) -> Callable:
+    start, end = Point2D(radius, 0), Point2D(0, radius)
+    return lambda: Circle(Point2D(0, 0)).arc_thick_array(radius, radius + thickness - 1, start, end)
+
+
+def _polyline(points: int) -> Callable:
+    path = [Point2D(x, z) for x, _, z in winding_path(points)]
+    return lambda: Polyline(path)
+
+
+def _nearest(points: int) -> Callable:
+    candidates = random_points(points)
+    return lambda: Point2D(0, 0).nearest(candidates, True)
+
+
+def _centerline_nearest(queries: int) -> Callable:
+    centerline = Segment2D(Point2D(0, 0), Point2D(1000, 300)).segment()
+    candidates = random_points(queries)
+    return lambda: CenterlineIndex(centerline).nearest(candidates)
+
+
+def _optimized_path(points: int) -> Callable:
+    candidates = random_points(points)
+    return lambda: Point2D(0, 0).optimized_path(list(candidates))
+
+
+def _curve(points: int, resolution: int) -> Callable:
+    path = winding_path(points)
+    return lambda: curve_tools.curve(path, resolution)
+
+
+def _offset(points: int) -> Callable:
+    curve = np.array(curve_tools.curve(winding_path(max(4, points // 10)), points))
+    normals = [(0, 1, 0)] * len(curve)
+    return lambda: curve_tools.offset(curve, 4, normals)
+
+
+def _curvature(points: int) -> Callable:
+    curve = curve_tools.curve(winding_path(max(4, points // 10)), points)
+    return lambda: curve_tools.curvature(curve)
+
+
+def _surface_perpendicular(width: int) -> Callable:
+    strip = Strip(winding_path(8))
+    normals = [(0, 1, 0)] * len(strip.curve)
+    return lambda: strip.compute_surface_perpendicular(width, normals)
+
+
+# Name: (sweep of each parameter, function building the operation to time from the parameters)
+BENCHMARKS: dict[str, tuple[dict[str, list[int]], Callable[..., Callable]]] = {
+    "Segment2D.segment": ({"length": [10, 100, 1000]}, _segment_2d),
+    "Segment2D.segment_thick": ({"length": [10, 100, 1000], "thickness": [1, 5, 25]}, _segment_2d_thick),
+    "Segment2D.segment_array": ({"length": [10, 100, 1000]}, _segment_2d_array),
+    "Segment2D.segment_thick_array": ({"length": [10, 100, 1000], "thickness": [1, 5, 25]}, _segment_2d_thick_array),
+    "Segment3D.segment": ({"length": [10, 100, 1000]}, _segment_3d),
+    "Segment3D.segment_array": ({"length": [10, 100, 1000]}, _segment_3d_array),
+    "Circle.circle": ({"radius": [5, 50, 500]}, _circle),
+    "Circle.circle_thick": ({"radius": [5, 50, 200], "thickness": [1, 5, 25]}, _circle_thick),
+    "Circle.circle_thick_array": ({"radius": [5, 50, 200], "thickness": [1, 5, 25]}, _circle_thick_array),
+    "Circle.arc_thick_array": ({"radius": [5, 50, 200], "thickness": [1, 5, 25]}, _arc_thick_array),
+    "Polyline": ({"points": [4, 8, 16, 32]}, _polyline),
+    "Point2D.nearest": ({"points": [10, 100, 1000, 10000]}, _nearest),
+    "CenterlineIndex.nearest": ({"queries": [10, 100, 1000, 10000]}, _centerline_nearest),
+    "Point2D.optimized_path": ({"points": [10, 100, 1000]}, _optimized_path),
+    "curve_tools.curve": ({"points": [4, 16, 64], "resolution": [40, 400, 4000]}, _curve),
+    "curve_tools.curvature": ({"points": [10, 100, 1000]}, _curvature),
+    "curve_tools.offset": ({"points": [10, 100, 1000]}, _offset),
+    "Strip.compute_surface_perpendicular": ({"width": [5, 10, 20]}, _surface_perpendicular),
+}
+
+def _nearest_cases() -> list[tuple]:
+    # Small grids give many points at the same distance of several centerline points.
+    cases = []
+    for seed in range(20):
+        centerline = random_points(50, 10, seed)
+        cases.append((centerline, random_points(200, 12, seed + 100)))
+    centerline = Segment2D(Point2D(0, 0), Point2D(300, 100)).segment_thick(3, LINE_THICKNESS_MODE.MIDDLE)
+    cases.append((centerline, random_points(2000, 320, 1)))
+    return cases
+
+
+def _optimized_path_cases(dimension: int) -> list[tuple]:
+    # Small extents give duplicates and many points at the same distance, the start being in the points or not.
+    cases = []
+    for seed in range(30):
+        rng = np.random.default_rng(seed)
+        extent = (3, 10, 1000)[seed % 3]
+        point = Point2D if dimension == 2 else Point3D
+        points = [point(*xyz) for xyz in rng.integers(-extent, extent, (int(rng.integers(1, 300)), dimension)).tolist()]
+        start = points[int(rng.integers(len(points)))] if seed % 2 else point(*rng.integers(-extent, extent, dimension).tolist())
+        cases.append((start, points))
+    path = [Point2D(x, z) for x, _, z in winding_path(16)]
+    cases.append((path[0], Polyline(path).total_line_output))
+    return cases
+
+
+def _segment_cases(dimension: int) -> list[tuple]:
+    # Diagonals and short segments check the ties of the error, in every direction.
+    rng = np.random.default_rng(SEED)
+    point = Point2D if dimension == 2 else Point3D
+    cases = []
+    for i in range(300):
+        start = rng.integers(-50, 50, dimension)
+        delta = rng.integers(-(2 + i), 2 + i, dimension)
+        if i % 4 == 0:
+            delta[1] = delta[0] * rng.choice((-1, 1))
+        cases.append((point(*start.tolist()), point(*(start + delta).tolist())))
+    return cases
+
+
+def _segment_thick_cases() -> list[tuple]:
+    cases = []
+    for i, (start, end) in enumerate(_segment_cases(2)):
+        cases.append((start, end, i % 13, list(LINE_THICKNESS_MODE)[i % 3]))
+    return cases
+
+
+def _circle_cases() -> list[tuple]:
+    # Negative inner radii happen on the corners of wide roads with a small radius.
+    rng = np.random.default_rng(SEED)
+    return [(Point2D(*rng.integers(-50, 50, 2).tolist()), int(rng.integers(-20, 40)), int(rng.integers(-2, 60)))
+            for _ in range(300)]
+
+
+def _triangle_cases() -> list[tuple]:
+    rng = np.random.default_rng(SEED)
+    cases = []
+    for _ in range(100):
+        corners = [Point2D(*xy) for xy in rng.integers(-20, 20, (3, 2)).tolist()]
+        cases.append((rng.integers(-25, 25, (200, 2)), *corners))
+    return cases
+
+
+# Name: (reference, fast path, list of positional arguments given to both). Outputs are compared with ==.
+PARITY_CHECKS: dict[str, tuple[Callable, Callable, list[tuple]]] = {
+    "CenterlineIndex.nearest": (lambda centerline, points: [point.nearest(centerline, True)[0] for point in points],
+                                lambda centerline, points: CenterlineIndex(centerline).nearest(points).tolist(),
+                                _nearest_cases()),
+    "Segment2D.segment": (lambda start, end, overlap: ReferenceSegment2D(start, end).segment(overlap=overlap),
+                          lambda start, end, overlap: Segment2D(start, end).segment(overlap=overlap),
+                          [case + (overlap,) for case in _segment_cases(2) for overlap in LINE_OVERLAP]),
+    "Segment2D.segment_thick": (lambda start, end, *thickness: ReferenceSegment2D(start, end).segment_thick(*thickness),
+                                lambda start, end, *thickness: Segment2D(start, end).segment_thick(*thickness),
+                                _segment_thick_cases()),
+    "Segment3D.segment": (lambda start, end, overlap: ReferenceSegment3D(start, end).segment(overlap),
+                          lambda start, end, overlap: Segment3D(start, end).segment(overlap),
+                          [case + (overlap,) for case in _segment_cases(3) for overlap in (False, True)]),
+    "Circle.circle": (lambda center, radius, _: ReferenceCircle(center).circle(radius),
+                      lambda center, radius, _: Circle(center).circle(radius),
+                      _circle_cases()),
+    "Circle.circle_thick": (lambda center, inner, outer: sorted({point.coordinates for point in ReferenceCircle(center).circle_thick(inner, outer)}),
+                            lambda center, inner, outer: [tuple(point) for point in Circle(center).circle_thick_array(inner, outer).tolist()],
+                            _circle_cases()),
+    "Point2D.is_in_triangle_array": (lambda points, *corners: [Point2D(x, y).is_in_triangle(*corners) for x, y in points.tolist()],
+                                     lambda points, *corners: Point2D.is_in_triangle_array(points, *corners).tolist(),
+                                     _triangle_cases()),
+    "curve_tools.curvature": (lambda curve: reference.curvature(curve).tolist(),
+                              lambda curve: curve_tools.curvature(curve).tolist(),
+                              [(curve_tools.curve(winding_path(4 + seed % 12, seed=seed), 30 + 7 * seed),) for seed in range(30)]),
+    "Point2D.optimized_path": (greedy_path, lambda start, points: start.optimized_path(points),
+                               _optimized_path_cases(2)),
+    "Point3D.optimized_path": (greedy_path, lambda start, points: start.optimized_path(points),
+                               _optimized_path_cases(3)),
+}
+
+
+def measure_speed(operation: Callable, min_time: float = 0.2, repeat: int = 3) -> dict:
+    """
+    Time an operation, running it in loops of at least min_time seconds.
+
+    Args:
+        operation (Callable): Operation without arguments.
+        min_time (float, optional): Minimum duration of a loop. Defaults to 0.2.
+        repeat (int, optional): Number of loops, the fastest one is kept. Defaults to 3.
+
+    Returns:
+        dict: Operations per second and seconds per operation.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        best = min(best, (time.perf_counter() - start) / number)
+    return {"ops_per_second": 1 / best, "seconds_per_op": best}
+
+
+def measure_allocations(operation: Callable) -> dict:
+    """
+    Measure the memory allocated by one run of an operation.
+
+    Args:
+        operation (Callable): Operation without arguments.
+
+    Returns:
+        dict: Peak bytes allocated during the operation, and bytes still allocated by its result.
+    """
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = operation()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"peak_bytes": peak - before, "retained_bytes": current - before}
+
+
+def run_benchmarks(name_filter: str = "", min_time: float = 0.2) -> list[dict]:
+    """
+    Run every case of the benchmarks whose name contains name_filter.
+
+    Args:
+        name_filter (str, optional): Substring of the benchmark names to run. Defaults to "".
+        min_time (float, optional): Minimum duration of a timing loop. Defaults to 0.2.
+
+    Returns:
+        list[dict]: One result per case: name, parameters, speed and allocations, or the error of the case.
+    """
+    results = []
+    for name, (sweep, build) in BENCHMARKS.items():
+        if name_filter not in name:
+            continue
+        for values in itertools.product(*sweep.values()):
+            parameters = dict(zip(sweep.keys(), values))
+            result = {"name": name, "parameters": parameters}
+            try:
+                operation = build(**parameters)
+                result.update(measure_allocations(operation))
+                result.update(measure_speed(operation, min_time))
+            except Exception as error:
+                result["error"] = f"{type(error).__name__}: {error}"
+            results.append(result)
+            print_result(result)
+    return results
+
+
+def check_parity(name_filter: str = "") -> list[str]:
+    """
+    Compare the output of every fast path to its reference.
+
+    Args:
+        name_filter (str, optional): Substring of the check names to run. Defaults to "".
+
+    Returns:
+        list[str]: Description of each input on which the outputs differ.
+    """
+    failures = []
+    for name, (reference, fast, cases) in PARITY_CHECKS.items():
+        if name_filter not in name:
+            continue
+        mismatches = 0
+        for arguments in cases:
+            if reference(*arguments) != fast(*arguments):
+                mismatches += 1
+                if mismatches <= 3:
+                    failures.append(f"{name}{arguments}")
+        print(f"[Parity] {name}: {len(cases) - mismatches}/{len(cases)} identical")
+    return failures
+
+
+def print_result(result: dict):
+    parameters = ", ".join(f"{key}={value}" for key, value in result["parameters"].items())
+    label = f"{result['name']}({parameters})"
+    if "error" in result:
+        print(f"{label:<60} {result['error']}")
+        return
+    print(f"{label:<60} {result['ops_per_second']:>12.1f} ops/s {result['peak_bytes'] / 1024:>10.1f} KiB peak "
+          f"{result['retained_bytes'] / 1024:>10.1f} KiB retained")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks of the networks.geometry primitives.")
+    parser.add_argument("--filter", default="", help="Only run the benchmarks and checks whose name contains this.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum duration of a timing loop in seconds.")
+    parser.add_argument("--parity-only", action="store_true", help="Only run the parity checks.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    results = [] if args.parity_only else run_benchmarks(args.filter, args.min_time)
+    failures = check_parity(args.filter)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmarks": results, "parity_failures": failures}, f, indent=2)
+    for failure in failures:
+        print(f"[Parity] Mismatch: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,408 @@
+"""
+Frozen copies of the pure Python geometry code replaced by faster implementations.
+
+They are only used by the parity checks of benchmarks.geometry_benchmark, to prove that a fast path still draws
+exactly the same blocks. Do not optimize them.
+"""
+from typing import List, Union
+
+import numpy as np
+
+from Enums import LINE_OVERLAP, LINE_THICKNESS_MODE
+from networks.geometry.Circle import Circle
+from networks.geometry.Point2D import Point2D
+from networks.geometry.Segment2D import Segment2D
+from networks.geometry.Segment3D import Segment3D
+
+
+def greedy_path(start, points: list) -> list:
+    """Point2D.optimized_path and Point3D.optimized_path before the KD-tree, scanning the remaining points at each step."""
+    pass_by = list(points)
+    if start not in pass_by:
+        pass_by.append(start)
+    path = [start]
+    pass_by.remove(start)
+    while pass_by:
+        nearest = min(pass_by, key=lambda point: point.distance(path[-1]))
+        path.append(nearest)
+        pass_by.remove(nearest)
+    return path
+
+
+def curvature(curve):
+    """curve_tools.curvature before it was batched, with per-element list comprehensions."""
+    curve_points = np.array(curve)
+    dx_dt = np.gradient(curve_points[:, 0])
+    dy_dt = np.gradient(curve_points[:, 1])
+    dz_dt = np.gradient(curve_points[:, 2])
+    velocity = np.array([[dx_dt[i], dy_dt[i], dz_dt[i]]
+                        for i in range(dx_dt.size)])
+
+    ds_dt = np.sqrt(dx_dt * dx_dt + dy_dt * dy_dt + dz_dt * dz_dt)
+
+    tangent = np.array([1/ds_dt]).transpose() * velocity
+    tangent_x = tangent[:, 0]
+    tangent_y = tangent[:, 1]
+    tangent_z = tangent[:, 2]
+
+    deriv_tangent_x = np.gradient(tangent_x)
+    deriv_tangent_y = np.gradient(tangent_y)
+    deriv_tangent_z = np.gradient(tangent_z)
+
+    dT_dt = np.array([[deriv_tangent_x[i], deriv_tangent_y[i], deriv_tangent_z[i]]
+                     for i in range(deriv_tangent_x.size)])
+    length_dT_dt = np.sqrt(
+        deriv_tangent_x * deriv_tangent_x + deriv_tangent_y * deriv_tangent_y + deriv_tangent_z * deriv_tangent_z + 0.0001)
+
+    normal = np.array([1/length_dT_dt]).transpose() * dT_dt
+    return normal
+
+
+class ReferenceSegment2D(Segment2D):
+    """Segment2D drawn one pixel at a time, before the numpy rasterizer."""
+
+    def segment(self, start: Point2D = None, end: Point2D = None, overlap: LINE_OVERLAP = LINE_OVERLAP.NONE, _is_computing_thickness: bool = False) -> Union[List[Point2D], None]:
+        if start is None or end is None:
+            start = self.start.copy()
+            end = self.end.copy()
+        else:
+            start = start.copy()
+            end = end.copy()
+
+        # Direction
+        delta_x = end.x - start.x
+        delta_y = end.y - start.y
+
+        if (delta_x < 0):
+            delta_x = -delta_x
+            step_x = -1
+        else:
+            step_x = +1
+
+        if (delta_y < 0):
+            delta_y = -delta_y
+            step_y = -1
+        else:
+            step_y = +1
+
+        delta_2x = 2*delta_x
+        delta_2y = 2*delta_y
+
+        self._add_points(start, _is_computing_thickness)
+
+        if (delta_x > delta_y):
+            error = delta_2y - delta_x
+            while (start.x != end.x):
+                start.x += step_x
+                if (error >= 0):
+                    if (overlap == LINE_OVERLAP.MAJOR):
+                        self._add_points(start, _is_computing_thickness)
+
+                    start.y += step_y
+                    if (overlap == LINE_OVERLAP.MINOR):
+                        self._add_points(
+                            Point2D(start.copy().x - step_x, start.copy().y), _is_computing_thickness)
+                    error -= delta_2x
+                error += delta_2y
+                self._add_points(start, _is_computing_thickness)
+        else:
+            error = delta_2x - delta_y
+            while (start.y != end.y):
+                start.y += step_y
+                if (error >= 0):
+                    if (overlap == LINE_OVERLAP.MAJOR):
+                        self._add_points(start, _is_computing_thickness)
+
+                    start.x += step_x
+                    if (overlap == LINE_OVERLAP.MINOR):
+                        self._add_points(
+                            Point2D(start.copy().x, start.copy().y - step_y), _is_computing_thickness)
+                    error -= delta_2y
+                error += delta_2x
+                self._add_points(start, _is_computing_thickness)
+
+        if not _is_computing_thickness:
+            return self.points
+        return None
+
+    def segment_thick(self, thickness: int, thickness_mode: LINE_THICKNESS_MODE) -> List[Point2D]:
+        start = self.start.copy()
+        end = self.end.copy()
+
+        delta_y = end.x - start.x
+        delta_x = end.y - start.y
+
+        swap = True
+        if (delta_x < 0):
+            delta_x = -delta_x
+            step_x = -1
+            swap = not swap
+        else:
+            step_x = +1
+
+        if (delta_y < 0):
+            delta_y = -delta_y
+            step_y = -1
+            swap = not swap
+        else:
+            step_y = +1
+
+        delta_2x = 2 * delta_x
+        delta_2y = 2 * delta_y
+
+        draw_start_adjust_count = int(thickness / 2)
+        if (thickness_mode == LINE_THICKNESS_MODE.DRAW_COUNTERCLOCKWISE):
+            draw_start_adjust_count = thickness - 1
+        elif (thickness_mode == LINE_THICKNESS_MODE.DRAW_CLOCKWISE):
+            draw_start_adjust_count = 0
+
+        if (delta_x >= delta_y):
+            if swap:
+                draw_start_adjust_count = (
+                    thickness - 1) - draw_start_adjust_count
+                step_y = -step_y
+            else:
+                step_x = -step_x
+
+            error = delta_2y - delta_x
+            for i in range(draw_start_adjust_count, 0, -1):
+
+                start.x -= step_x
+                end.x -= step_x
+                if error >= 0:
+                    start.y -= step_y
+                    end.y -= step_y
+                    error -= delta_2x
+                error += delta_2x
+
+            self.segment(
+                start, end, overlap=LINE_OVERLAP.NONE, _is_computing_thickness=True)
+
+            error = delta_2x - delta_x
+            for i in range(thickness, 1, -1):
+                start.x += step_x
+                end.x += step_x
+                overlap = LINE_OVERLAP.NONE
+                if (error >= 0):
+                    start.y += step_y
+                    end.y += step_y
+                    error -= delta_2x
+                    overlap = LINE_OVERLAP.MAJOR
+                error += delta_2y
+
+                self.segment(
+                    start, end, overlap=overlap, _is_computing_thickness=True)
+
+        else:
+            if swap:
+                step_x = -step_x
+            else:
+                draw_start_adjust_count = (
+                    thickness - 1) - draw_start_adjust_count
+                step_y = -step_y
+
+            error = delta_2x - delta_y
+            for i in range(draw_start_adjust_count, 0, -1):
+                start.y -= step_y
+                end.y -= step_y
+                if (error >= 0):
+                    start.x -= step_x
+                    end.x -= step_x
+                    error -= delta_2y
+                error += delta_2x
+
+            self.segment(
+                start, end, overlap=LINE_OVERLAP.NONE, _is_computing_thickness=True)
+
+            error = delta_2x - delta_y
+            for i in range(thickness, 1, -1):
+                start.y += step_y
+                end.y += step_y
+                overlap = LINE_OVERLAP.NONE
+                if (error >= 0):
+                    start.x += step_x
+                    end.x += step_x
+                    error -= delta_2y
+                    overlap = LINE_OVERLAP.MAJOR
+                error += delta_2x
+
+                self.segment(
+                    start, end, overlap=overlap, _is_computing_thickness=True)
+
+        return self.points_thick
+
+    def _add_points(self, points, is_computing_thickness):
+        if is_computing_thickness:
+            self.points_thick.append(points.copy())
+        else:
+            self.points.append(points.copy())
+
+
+class ReferenceSegment3D(Segment3D):
+    """Segment3D drawn one voxel at a time, before the numpy rasterizer."""
+
+    def segment(self, overlap: bool = False):
+        start = self.start.copy()
+        end = self.end.copy()
+        self.output_points.append(start.copy())
+        dx = abs(self.end.x - self.start.x)
+        dy = abs(self.end.y - self.start.y)
+        dz = abs(self.end.z - self.start.z)
+        if end.x > start.x:
+            xs = 1
+        else:
+            xs = -1
+        if end.y > start.y:
+            ys = 1
+        else:
+            ys = -1
+        if end.z > start.z:
+            zs = 1
+        else:
+            zs = -1
+
+        # Driving axis is X-axis
+        if dx >= dy and dx >= dz:
+            p1 = 2 * dy - dx
+            p2 = 2 * dz - dx
+            while start.x != end.x:
+                start.x += xs
+                self.output_points.append(start.copy())
+                if p1 >= 0:
+                    start.y += ys
+                    if not overlap:
+                        if self.output_points[-1].y != start.y:
+                            self.output_points.append(start.copy())
+                    p1 -= 2 * dx
+                if p2 >= 0:
+                    start.z += zs
+                    if not overlap:
+                        if self.output_points[-1].z != start.z:
+                            self.output_points.append(start.copy())
+                    p2 -= 2 * dx
+                p1 += 2 * dy
+                p2 += 2 * dz
+
+        # Driving axis is Y-axis
+        elif dy >= dx and dy >= dz:
+            p1 = 2 * dx - dy
+            p2 = 2 * dz - dy
+            while start.y != end.y:
+                start.y += ys
+                self.output_points.append(start.copy())
+                if p1 >= 0:
+                    start.x += xs
+                    if not overlap:
+                        if self.output_points[-1].x != start.x:
+                            self.output_points.append(start.copy())
+                    p1 -= 2 * dy
+                if p2 >= 0:
+                    start.z += zs
+                    if not overlap:
+                        if self.output_points[-1].z != start.z:
+                            self.output_points.append(start.copy())
+                    p2 -= 2 * dy
+                p1 += 2 * dx
+                p2 += 2 * dz
+
+        # Driving axis is Z-axis
+        else:
+            p1 = 2 * dy - dz
+            p2 = 2 * dx - dz
+            while start.z != end.z:
+                start.z += zs
+                self.output_points.append(start.copy())
+                if p1 >= 0:
+                    start.y += ys
+                    if not overlap:
+                        if self.output_points[-1].y != start.y:
+                            self.output_points.append(start.copy())
+                    p1 -= 2 * dz
+                if p2 >= 0:
+                    start.x += xs
+                    if not overlap:
+                        if self.output_points[-1].x != start.x:
+                            self.output_points.append(start.copy())
+                    p2 -= 2 * dz
+                p1 += 2 * dy
+                p2 += 2 * dx
+        return self.output_points
+
+
+class ReferenceCircle(Circle):
+    """Circle drawn one pixel at a time, before the numpy rasterizer."""
+
+    def circle(self, radius: int) -> List[Point2D]:
+        self.radius = radius
+        center = self.center.copy()
+
+        x = -radius
+        y = 0
+        error = 2-2*radius
+        while (True):
+            self.points.append(Point2D(center.x-x, center.y+y))
+            self.points.append(Point2D(center.x-y, center.y-x))
+            self.points.append(Point2D(center.x+x, center.y-y))
+            self.points.append(Point2D(center.x+y, center.y+x))
+            r = error
+            if (r <= y):
+                y += 1
+                error += y*2+1
+            if (r > x or error > y):
+                x += 1
+                error += x*2+1
+            if (x < 0):
+                continue
+            else:
+                break
+        return self.points
+
+    def circle_thick(self, inner: int, outer: int) -> List[Point2D]:
+        self.inner = inner
+        self.outer = outer
+        center = self.center.copy()
+
+        xo = outer
+        xi = inner
+
+        y = 0
+        erro = 1 - xo
+        erri = 1 - xi
+
+        while xo >= y:
+            self._x_line(center.x + xi, center.x + xo, center.y + y)
+            self._y_line(center.x + y,  center.y + xi, center.y + xo)
+            self._x_line(center.x - xo, center.x - xi, center.y + y)
+            self._y_line(center.x - y,  center.y + xi, center.y + xo)
+            self._x_line(center.x - xo, center.x - xi, center.y - y)
+            self._y_line(center.x - y,  center.y - xo, center.y - xi)
+            self._x_line(center.x + xi, center.x + xo, center.y - y)
+            self._y_line(center.x + y,  center.y - xo, center.y - xi)
+
+            y += 1
+
+            if erro < 0:
+                erro += 2 * y + 1
+            else:
+                xo -= 1
+                erro += 2 * (y - xo + 1)
+
+            if y > inner:
+                xi = y
+            else:
+                if erri < 0:
+                    erri += 2 * y + 1
+                else:
+                    xi -= 1
+                    erri += 2 * (y - xi + 1)
+        return self.points_thick
+
+    def _x_line(self, x1, x2, y):
+        while x1 <= x2:
+            self.points_thick.append(Point2D(x1, y))
+            x1 += 1
+
+    def _y_line(self, x, y1, y2):
+        while y1 <= y2:
+            self.points_thick.append(Point2D(x, y1))
+            y1 += 1
@@ -0,0 +1,121 @@
+"""
+Import-time benchmark of the entry points.
+
+Each module is imported in a fresh interpreter run with -X importtime. The cumulative import time of the module is
+reported with the heaviest top-level packages it pulls in, and compared to a budget. The connections opened while
+importing are counted too: importing an entry point must not talk to the GDMC interface.
+
+The run fails when a module takes longer than the budget to import, or opens a connection.
+
+Usage, from the root of the repository:
+    python -m benchmarks.import_benchmark
+    python -m benchmarks.import_benchmark --modules main metro.metro_line_map --budget 1.5 --repeat 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = ("main",)
+DEFAULT_BUDGET = 2.0
+DEFAULT_REPEAT = 3
+
+# Count the connections opened by the import, without importing anything heavy before it.
+CHILD_CODE = """
+import socket
+connections = []
+connect = socket.socket.connect
+def counted_connect(self, address):
+    connections.append(address)
+    return connect(self, address)
+socket.socket.connect = counted_connect
+import {module}
+print("connections", len(connections))
+"""
+
+
+def parse_importtime(output: str) -> list[tuple[str, int, int, int]]:
+    """
+    Parse the report written by -X importtime on stderr.
+
+    Args:
+        output (str): Standard error of the interpreter.
+
+    Returns:
+        list[tuple[str, int, int, int]]: Module, self time and cumulative time in µs, and nesting depth, in the
+            order of the report: a module comes after the modules it imported.
+
+    >>> parse_importtime("import time: self [us] | cumulative | imported package\\nimport time:       5 |        12 |   numpy")
+    [('numpy', 5, 12, 1)]
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return imports
+
+
+def measure_import(module: str) -> dict:
+    """
+    Import a module in a fresh interpreter.
+
+    Args:
+        module (str): Module to import.
+
+    Returns:
+        dict: Cumulative import time of the module in seconds, self time by top-level package in seconds and number
+            of connections opened.
+    """
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (REPOSITORY, os.environ.get("PYTHONPATH")))))
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD_CODE.format(module=module)],
+                             cwd=REPOSITORY, env=environment, capture_output=True, text=True)
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()
+        raise RuntimeError(f"Importing {module} failed: {error[-1] if error else process.returncode}")
+
+    imports = parse_importtime(process.stderr)
+    total = next(cumulative for name, _, cumulative, depth in reversed(imports) if name == module and depth == 0)
+    packages: dict[str, float] = {}
+    for name, self_time, _, _ in imports:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_time / 1e6
+    connections = int(process.stdout.split("connections")[-1])
+    return {"time": total / 1e6, "packages": packages, "connections": connections}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark of the entry points.")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="Seconds allowed to import a module.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Imports of each module, the fastest is kept.")
+    parser.add_argument("--top", type=int, default=10, help="Number of heaviest packages reported.")
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules:
+        result = min((measure_import(module) for _ in range(args.repeat)), key=lambda result: result["time"])
+        print(f"[Benchmark] {module}: {result['time']:.3f} s (budget {args.budget:.3f} s), "
+              f"{result['connections']} connection(s)")
+        for package, time in sorted(result["packages"].items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {package:<32}{time:>9.3f} s")
+        if result["time"] > args.budget:
+            failures.append(f"{module} takes {result['time']:.3f} s to import > {args.budget:.3f} s")
+        if result["connections"]:
+            failures.append(f"{module} opens {result['connections']} connection(s) when imported")
+
+    for failure in failures:
+        print(f"[Benchmark] Over budget: {failure}")
+    if failures:
+        sys.exit(1)
+    print("[Benchmark] Within budget.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""
+End-to-end benchmark of the generator on synthetic worlds.
+
+For each size, a synthetic world (fractal terrain, sea, rivers and trees) is served by the local GDMC stand-in server
+and main.main() runs against it: world_maker maps, skeletons, districts and packing, then terraforming and
+building placement. Every size runs in its own process, in a temporary directory, so the peak RSS of a size does not
+leak into the next one and the tracked world_maker/data images are left untouched.
+
+The wall time and peak RSS of each stage recorded by utils.instrumentation are reported for every size, with their
+scaling exponent against the area of the world, and compared to a stored baseline. The run fails when a stage is
+slower or bigger than its baseline by more than the threshold plus an absolute margin. Stages shorter than a second
+in the baseline are not compared: their times vary by more than the threshold from one run to the next.
+
+Usage, from the root of the repository:
+    python -m benchmarks.world_maker_benchmark --sizes 128 256 512
+    python -m benchmarks.world_maker_benchmark --sizes 128 256 --update-baseline
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+from math import log
+from urllib.parse import urlparse
+
+import numpy as np
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = (128, 256, 512, 1024, 2048)
+DEFAULT_BASELINE = os.path.join(REPOSITORY, "benchmarks", "baselines", "world_maker.json")
+DEFAULT_THRESHOLD = 0.25
+# Stages faster than this in the baseline are too noisy to be compared.
+MIN_COMPARED_TIME = 1.0
+MIN_COMPARED_RSS = 16 * 2 ** 20
+# Absolute increase allowed on top of the relative threshold, so that scheduling noise is not a regression.
+TIME_MARGIN = 0.25
+RSS_MARGIN = 16 * 2 ** 20
+
+
+def run_size(size: int, seed: int) -> dict:
+    """
+    Run the generator on a synthetic world, in the current process and working directory.
+
+    Args:
+        size (int): Width and depth of the world.
+        seed (int): Seed of the world and of the generator.
+
+    Returns:
+        dict: Report of utils.instrumentation, with the server request summary.
+    """
+    from gdpc import interface
+
+    from benchmarks.SyntheticWorld import SyntheticWorld
+    from benchmarks.gdmc_server import GDMCServer
+    from utils import instrumentation
+
+    world = SyntheticWorld.generate((0, 0), size, seed)
+    # The generator opens Editors on the default host of gdpc.
+    host = urlparse(interface.DEFAULT_HOST)
+    server = GDMCServer((host.hostname, host.port), world)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.makedirs("world_maker/data", exist_ok=True)
+
+    random.seed(seed)
+    np.random.seed(seed)
+    instrumentation.reset()
+    try:
+        import main
+        main.main()
+    finally:
+        server.shutdown()
+        server.server_close()
+    report = instrumentation.get_report()
+    report["server"] = server.summary()
+    return report
+
+
+def run_sizes(sizes: list[int], seed: int, timeout: float) -> dict:
+    """
+    Run every size in a child process.
+
+    Args:
+        sizes (list[int]): Widths and depths of the worlds.
+        seed (int): Seed of the worlds and of the generator.
+        timeout (float): Seconds after which a size is stopped.
+
+    Returns:
+        dict: Report of each size by size, with a "status" that is "ok", "timeout" or the error of the child.
+    """
+    results = {}
+    for size in sizes:
+        print(f"[Benchmark] Size {size}...", flush=True)
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "report.json")
+            environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (REPOSITORY, os.environ.get("PYTHONPATH")))))
+            command = [sys.executable, "-m", "benchmarks.world_maker_benchmark", "--child", str(size),
+                       "--seed", str(seed), "--output", output]
+            try:
+                process = subprocess.run(command, cwd=directory, env=environment, timeout=timeout,
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            except subprocess.TimeoutExpired:
+                results[str(size)] = {"status": "timeout"}
+                print(f"[Benchmark] Size {size} timed out after {timeout} s.")
+                continue
+            if process.returncode != 0 or not os.path.exists(output):
+                error = process.stderr.strip().splitlines()
+                results[str(size)] = {"status": error[-1] if error else f"exit code {process.returncode}"}
+                print(f"[Benchmark] Size {size} failed: {results[str(size)]['status']}")
+                continue
+            with open(output) as f:
+                results[str(size)] = {"status": "ok", **json.load(f)}
+            print(f"[Benchmark] Size {size} done in {results[str(size)]['wall_time']:.1f} s.")
+    return results
+
+
+def scaling_exponents(results: dict, key: str) -> dict[str, float]:
+    """
+    Fit the exponent k of value = c * area^k for each stage, on the sizes that succeeded.
+
+    Args:
+        results (dict): Results of run_sizes.
+        key (str): "wall_time" or "peak_rss".
+
+    Returns:
+        dict[str, float]: Exponent by stage, for the stages measured on at least two sizes.
+    """
+    points: dict[str, list[tuple[float, float]]] = {}
+    for size, result in results.items():
+        if result["status"] != "ok":
+            continue
+        for name, stage in {"total": result, **result["stages"]}.items():
+            if stage.get(key):
+                points.setdefault(name, []).append((log(int(size) ** 2), log(stage[key])))
+    exponents = {}
+    for name, values in points.items():
+        if len(values) >= 2:
+            x, y = np.array(values).T
+            exponents[name] = float(np.polyfit(x, y, 1)[0])
+    return exponents
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compare the stages of each size to the baseline.
+
+    Args:
+        results (dict): Results of run_sizes.
+        baseline (dict): Stored results.
+        threshold (float): Relative increase of time or peak RSS over which a stage regressed, on top of
+            TIME_MARGIN or RSS_MARGIN.
+
+    Returns:
+        list[str]: Description of each regression.
+    """
+    regressions = []
+    for size, result in results.items():
+        reference = baseline.get(size)
+        if reference is None or reference["status"] != "ok":
+            continue
+        if result["status"] != "ok":
+            regressions.append(f"{size}: {result['status']}")
+            continue
+        stages = {"total": result, **result["stages"]}
+        for name, expected in {"total": reference, **reference["stages"]}.items():
+            stage = stages.get(name)
+            if stage is None:
+                continue
+            for key, minimum, margin, unit, scale in (("wall_time", MIN_COMPARED_TIME, TIME_MARGIN, "s", 1),
+                                                      ("peak_rss", MIN_COMPARED_RSS, RSS_MARGIN, "MiB", 2 ** 20)):
+                if expected.get(key) and stage.get(key) and expected[key] >= minimum and \
+                        stage[key] > expected[key] * (1 + threshold) + margin:
+                    regressions.append(f"{size} {name} {key}: {stage[key] / scale:.2f} {unit} "
+                                       f"> {expected[key] / scale:.2f} {unit} + {threshold:.0%} "
+                                       f"+ {margin / scale:.2f} {unit}")
+    return regressions
+
+
+def print_table(results: dict):
+    """Print the time and peak RSS of each stage by size, with their scaling exponents."""
+    sizes = list(results.keys())
+    names = ["total"]
+    for result in results.values():
+        for name in result.get("stages", {}):
+            if name not in names:
+                names.append(name)
+    time_exponents = scaling_exponents(results, "wall_time")
+    rss_exponents = scaling_exponents(results, "peak_rss")
+
+    print(f"{'stage':<32}" + "".join(f"{size + '²':>20}" for size in sizes) + f"{'time ~ area^k':>16}{'RSS ~ area^k':>16}")
+    for name in names:
+        cells = []
+        for size in sizes:
+            result = results[size]
+            stage = result if name == "total" else result.get("stages", {}).get(name)
+            if result["status"] != "ok" or stage is None:
+                cells.append(f"{'-' if result['status'] == 'ok' else result['status'][:18]:>20}")
+                continue
+            rss = f"{stage['peak_rss'] / 2 ** 20:.0f} MiB" if stage.get("peak_rss") else "?"
+            cells.append(f"{stage['wall_time']:>9.2f} s {rss:>8}")
+        exponents = [f"{exponents[name]:>16.2f}" if name in exponents else f"{'-':>16}"
+                     for exponents in (time_exponents, rss_exponents)]
+        print(f"{name:<32}" + "".join(cells) + "".join(exponents))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark of the generator on synthetic worlds.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=3600, help="Seconds after which a size is stopped.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative increase of time or peak RSS reported as a regression.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        report = run_size(args.child, args.seed)
+        with open(args.output, "w") as f:
+            json.dump(report, f)
+        return
+
+    results = run_sizes(args.sizes, args.seed, args.timeout)
+    print_table(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"[Benchmark] Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"[Benchmark] No baseline at {args.baseline}, run with --update-baseline to create it.")
+        return
+    with open(args.baseline) as f:
+        regressions = find_regressions(results, json.load(f), args.threshold)
+    for regression in regressions:
+        print(f"[Benchmark] Regression: {regression}")
+    if regressions:
+        sys.exit(1)
+    print("[Benchmark] No regression.")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 from gdpc import Editor, Block, geometry
+from placement.Palette import get_palette
 from buildings.geometry.Point import Point
 
 class Rectangle:
@@ -17,7 +18,7 @@ class Rectangle:
         if self.point2.z - self.point1.z < 2*zpadding: zpadding = 0
         if y is None: y = self.point2.y
         
-        geometry.placeCuboid(editor, (self.point1.x+xpadding, 0, self.point1.z+zpadding), (self.point2.x-xpadding, y, self.point2.z-zpadding), Block(material))
+        geometry.placeCuboid(editor, (self.point1.x+xpadding, 0, self.point1.z+zpadding), (self.point2.x-xpadding, y, self.point2.z-zpadding), get_palette().intern(material))
 
     def __repr__(self):
         return f"{type(self).__name__}\n1 : {str(self.point1)},\n2 : {str(self.point2)}"
\ No newline at end of file
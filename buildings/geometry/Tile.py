@@ -1,4 +1,5 @@
 from gdpc import Editor, Block, geometry
+from placement.Palette import get_palette
 from utils.Enums import DIRECTION
 from buildings.geometry.Point import Point
 from buildings.geometry.Vertice import Vertice
@@ -28,7 +29,7 @@ class Tile:
         self.south_vertice = None
         
     def fill(self, editor : Editor, material : str, y : int = 0) -> list[Point]:
-        geometry.placeCuboid(editor, (self.pos.x, 0, self.pos.z), (self.pos.x+self.size-1, y, self.pos.z+self.size-1), Block(material))
+        geometry.placeCuboid(editor, (self.pos.x, 0, self.pos.z), (self.pos.x+self.size-1, y, self.pos.z+self.size-1), get_palette().intern(material))
         
     def get_neighbors_coords(self):
         return [Point(x = self.pos.x, z = self.pos.z - self.size), # north
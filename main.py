@@ -1,32 +1,41 @@
+import logging
 import random
 from math import exp, sqrt
 
 import gdpc.exceptions
+import numpy as np
 
 from world_maker.world_maker import *
-from world_maker.data_analysis import transpose_form_heightmap
+from world_maker.data_analysis import transpose_form_heightmap, handle_import_image
 from world_maker.Skeleton import Skeleton, simplify_coordinates
 from world_maker.terraforming import remove_trees, smooth_terrain
 from networks.geometry.Point3D import Point3D
 from networks.roads_2.Road import Road
-from networks.legacy_roads import roads
-from world_maker.District import Road as Road_grid
+from world_maker.District import Road as Road_grid, get_road_edges
 from House import *
+from placement.PlacementSink import get_placement_sink
+from utils.instrumentation import stage, write_report
+
+logger = logging.getLogger(__name__)
 
 
 def main():
     rectangle_house_mountain, rectangle_building, skeleton_highway, skeleton_mountain, road_grid = world_maker()
 
-    editor = Editor(buffering=True)
+    editor = get_placement_sink(fillCommands=True)
     buildArea = editor.getBuildArea()
     origin = ((buildArea.begin).x, (buildArea.begin).z)
     center = (abs(buildArea.begin.x - buildArea.end.x) / 2, abs(buildArea.begin.z - buildArea.end.z) / 2)
     length_world = sqrt((center[0]*2) ** 2 + (center[1]*2) ** 2)
 
-    remove_trees('./world_maker/data/heightmap.png', './world_maker/data/treemap.png',
-                './world_maker/data/smooth_sobel_watermap.png')
-    smooth_terrain('./world_maker/data/heightmap.png',
-                   './world_maker/data/heightmap_smooth.png', './world_maker/data/smooth_sobel_watermap.png')
+    with stage("remove_trees"):
+        remove_trees('./world_maker/data/heightmap.png', './world_maker/data/treemap.png',
+                     './world_maker/data/smooth_sobel_watermap.png', editor)
+    with stage("smooth_terrain"):
+        smooth_terrain('./world_maker/data/heightmap.png',
+                       './world_maker/data/heightmap_smooth.png', './world_maker/data/smooth_sobel_watermap.png', editor)
+
+    editor.loadWorldSlice(buildArea.toRect(), cache=True)
 
     # set_roads(skeleton_mountain, origin)
     # set_roads(skeleton_highway, origin)
@@ -67,28 +76,50 @@ def main():
                       entranceDirection[random.randint(0, 3)], blocks)
         house.build()
 
+    with stage("flush"):
+        editor.close()
+    write_report('./run_report.json')
+
 
 def get_height_building_from_center(center, position, length_world):
     length = abs(sqrt(((center[0] - position[0]) ** 2 + (center[1] - position[1]) ** 2)))
-    print(length, length_world)
+    logger.debug("Building at %.1f blocks from the center of a %.1f blocks world", length, length_world)
     return int(exp(-(length / (length_world / 4)) ** 2) * 75 + 30)
 
 
-def set_roads_grids(road_grid: Road_grid, origin):
-    for i in range(len(road_grid)):
-        if road_grid[i].border:
-            for j in range(len(road_grid)):
-                # Same line
-                if (road_grid[i].position.x == road_grid[j].position.x and road_grid[i].position.y != road_grid[
-                    j].position.y) or (
-                        road_grid[i].position.x != road_grid[j].position.x and road_grid[i].position.y == road_grid[
-                    j].position.y):
-                    point_1 = transpose_form_heightmap(
-                        './world_maker/data/heightmap.png', (road_grid[i].position.x, road_grid[i].position.y), origin)
-                    point_2 = transpose_form_heightmap(
-                        './world_maker/data/heightmap.png', (road_grid[j].position.x, road_grid[j].position.y), origin)
-                    Road(
-                        [Point3D(point_1[0], point_1[1], point_1[2]), Point3D(point_2[0], point_2[1], point_2[2])], 9)
+def get_road_grid_segments(road_grid: list[Road_grid], heightmap, origin) -> list[tuple[Point3D, Point3D]]:
+    """
+    Convert the district road grid into unique 3D segments.
+
+    Every grid edge is taken once from the links of the roads, and both ends are lifted on the heightmap in a single
+    array lookup.
+
+    Args:
+        road_grid (list[Road_grid]): Roads of the grid, linked by north/south/east/west.
+        heightmap (str | Image.Image): Heightmap of the build area.
+        origin (tuple[int, int]): World coordinates (x, z) of the build area origin.
+
+    Returns:
+        list[tuple[Point3D, Point3D]]: Segments ready to be rasterized, in world coordinates.
+    """
+    edges = get_road_edges(road_grid)
+    if not edges:
+        return []
+
+    heights = np.array(handle_import_image(heightmap).convert('L'))
+    ends = np.array([(road.position.x, road.position.y) for edge in edges for road in edge], dtype=int)
+    ys = heights[ends[:, 1], ends[:, 0]]
+    xs = ends[:, 0] + origin[0]
+    zs = ends[:, 1] + origin[1]
+
+    points = [Point3D(int(x), int(y), int(z)) for x, y, z in zip(xs, ys, zs)]
+    return list(zip(points[0::2], points[1::2]))
+
+
+def set_roads_grids(road_grid: list[Road_grid], origin):
+    for start, end in get_road_grid_segments(road_grid, './world_maker/data/heightmap.png', origin):
+        with stage("roads"):
+            Road([start, end], 9)
 
 
 def set_roads(skeleton: Skeleton, origin):
@@ -111,13 +142,15 @@ def set_roads(skeleton: Skeleton, origin):
     for i in range(len(skeleton.lines)):
         print(f"[Roads] Generating roads {i + 1}/{len(skeleton.lines)}.")
         if len(skeleton.lines[i]) >= 4:
-            Road(Point3D.from_arrays(skeleton.lines[i]), 25)
+            with stage("roads"):
+                Road(Point3D.from_arrays(skeleton.lines[i]), 25)
         else:
             print(
                 f"[Roads] Ignore roads {i + 1} with {len(skeleton.lines[i])} coordinates between {skeleton.lines[i][1]} and {skeleton.lines[i][-1]}.")
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main()
 
 """
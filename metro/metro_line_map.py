@@ -1,9 +1,14 @@
-from Metro_Line import *
-from math import pi, cos, sin, sqrt, atan2, inf
-from pygame import Surface
-import pygame
+from math import pi, cos, sin, sqrt, atan2, ceil
+from typing import Optional, TYPE_CHECKING
+import numpy as np
+from gdpc import Block
 
-from metro.Metro_Line import Position
+from metro.Metro_Line import *
+from placement.EditPlan import EditPlan
+from placement.cuboids import group_columns
+
+if TYPE_CHECKING:
+    from scipy.spatial import cKDTree
 
 
 def cubic_bezier(time: float, join1: Position, control_point1: Position, control_point2: Position,
@@ -63,6 +68,78 @@ def cubic_bezier_second_derivative(time: float, join1: Position, control_point1:
             + (join2 - control_point2 * 2 + control_point1) * 6 * time)
 
 
+def bezier_curve_arrays(control_points, times) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Evaluate a cubic Bézier curve and its first and second derivatives at many times at once, in float64
+
+    Same formulas as cubic_bezier, cubic_bezier_derivative and cubic_bezier_second_derivative, without truncating
+    the intermediate results to int.
+
+    :param control_points: The four control points of the curve, as Position or (x, y)
+    :param times: The times at which to evaluate the curve, between 0 and 1
+    :return: A tuple containing the points, the derivative and the second derivative of the curve, each of shape (T, 2)
+    """
+    join1, control_point1, control_point2, join2 = (
+        np.array([point.x, point.y] if isinstance(point, Position) else point, dtype=np.float64)
+        for point in control_points)
+    t = np.asarray(times, dtype=np.float64).reshape(-1, 1)
+    s = 1 - t
+
+    points = (join1 * s ** 3 + control_point1 * 3 * s ** 2 * t
+              + control_point2 * 3 * s * t ** 2 + join2 * t ** 3)
+    derivative = ((control_point1 - join1) * 3 * s ** 2
+                  + (control_point2 - control_point1) * 6 * s * t
+                  + (join2 - control_point2) * 3 * t ** 2)
+    second_derivative = ((control_point2 - control_point1 * 2 + join1) * 6 * s
+                         + (join2 - control_point2 * 2 + control_point1) * 6 * t)
+    return points, derivative, second_derivative
+
+
+def arc_length_times(control_points, num_points: int, oversampling: int = 16) -> np.ndarray:
+    """
+    Calculate the times at which a cubic Bézier curve is cut in num_points pieces of the same length
+
+    The length along the curve is measured on a polyline of num_points * oversampling segments, then inverted by
+    linear interpolation.
+
+    :param control_points: The four control points of the curve
+    :param num_points: The number of pieces of the curve
+    :param oversampling: How many segments of the polyline measure each piece
+    :return: The num_points + 1 times, from 0 to 1
+    """
+    if num_points <= 0:
+        return np.zeros(1)
+    fine_times = np.linspace(0, 1, num_points * oversampling + 1)
+    fine_points = bezier_curve_arrays(control_points, fine_times)[0]
+    steps = np.diff(fine_points, axis=0)
+    lengths = np.concatenate(([0], np.cumsum(np.hypot(steps[:, 0], steps[:, 1]))))
+    if lengths[-1] == 0:
+        return np.linspace(0, 1, num_points + 1)
+    return np.interp(np.linspace(0, lengths[-1], num_points + 1), lengths, fine_times)
+
+
+def osculating_circle_arrays(points: np.ndarray, derivative: np.ndarray, second_derivative: np.ndarray) \
+        -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the curvature and the center of the osculating circle at each point of a curve at once
+
+    :param points: The points of the curve, of shape (T, 2)
+    :param derivative: The derivative of the curve, of shape (T, 2)
+    :param second_derivative: The second derivative of the curve, of shape (T, 2)
+    :return: A tuple containing the curvature (T,) and the center of the osculating circles (T, 2),
+             the centers being undefined where the curvature is 0
+    """
+    cross_product = derivative[:, 0] * second_derivative[:, 1] - derivative[:, 1] * second_derivative[:, 0]
+    normal = np.hypot(derivative[:, 0], derivative[:, 1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        curvature = np.abs(cross_product) / normal ** 3
+        radius = 1 / curvature
+        # The center is on the left of the derivative when the curve turns left, on its right otherwise.
+        side = np.where(cross_product > 0, 1, -1) * radius / normal
+        centers = points + np.stack((-derivative[:, 1], derivative[:, 0]), axis=1) * side[:, None]
+    return curvature, centers
+
+
 def bezier_curve(control_points, num_points) -> tuple[list[Position], list[Position], list[Position]]:
     """
     Generate a Bézier curve from a list of control points
@@ -72,14 +149,8 @@ def bezier_curve(control_points, num_points) -> tuple[list[Position], list[Posit
     :return: A tuple containing the points of the curve, the derivative of the curve,
              and the second derivative of the curve
     """
-    points = []
-    derivative = []
-    second_derivative = []
-    for t in range(num_points + 1):
-        points.append(cubic_bezier(t / num_points, *control_points))
-        derivative.append(cubic_bezier_derivative(t / num_points, *control_points))
-        second_derivative.append(cubic_bezier_second_derivative(t / num_points, *control_points))
-    return points, derivative, second_derivative
+    arrays = bezier_curve_arrays(control_points, np.arange(num_points + 1) / num_points)
+    return tuple([Position(int(x), int(y)) for x, y in array.tolist()] for array in arrays)
 
 
 def osculating_circle(points: list[Position], derivative: list[Position], second_derivative: list[Position]) \
@@ -95,20 +166,22 @@ def osculating_circle(points: list[Position], derivative: list[Position], second
     :param second_derivative: The second derivative of the curve
     :return: A list of tuples, each containing the radius and center of each osculating circle
     """
-    circle = []
-    for i in range(len(points)):
-        curvature = (abs(derivative[i].x * second_derivative[i].y - derivative[i].y * second_derivative[i].x)
-                     / ((derivative[i].x ** 2 + derivative[i].y ** 2) ** 1.5))
-        if curvature != 0:
-            radius = 1 / curvature
-            normal = derivative[i].norm()
-            cross_product = derivative[i].x * second_derivative[i].y - derivative[i].y * second_derivative[i].x
-            if cross_product > 0:
-                center = points[i] + Position(-derivative[i].y * radius / normal, derivative[i].x * radius / normal)
-            else:
-                center = points[i] + Position(derivative[i].y * radius / normal, -derivative[i].x * radius / normal)
-            circle.append((int(radius), center))
-    return circle
+    arrays = (np.array([(position.x, position.y) for position in positions], dtype=np.float64).reshape(-1, 2)
+              for positions in (points, derivative, second_derivative))
+    curvature, centers = osculating_circle_arrays(*arrays)
+    return circles_from_arrays(curvature, centers)
+
+
+def circles_from_arrays(curvature: np.ndarray, centers: np.ndarray) -> list[tuple[int, Position]]:
+    """
+    Convert the result of osculating_circle_arrays to the osculating circles, skipping the points without curvature
+
+    :param curvature: The curvature at each point
+    :param centers: The center of the osculating circle at each point
+    :return: A list of tuples, each containing the radius and center of each osculating circle
+    """
+    curved = curvature != 0
+    return [(int(1 / k), Position(x, y)) for k, (x, y) in zip(curvature[curved].tolist(), centers[curved].tolist())]
 
 
 def merge_similar_circles(circles: list[tuple[int, Position]], radius_threshold: float, center_threshold: float) \
@@ -116,31 +189,45 @@ def merge_similar_circles(circles: list[tuple[int, Position]], radius_threshold:
     """
     Merge similar osculating circles
 
+    Each circle is compared to the next one along the curve. Similar neighbours are merged in pairs, from the start
+    of the curve, into one circle of the mean radius and center, and the merge is repeated until no neighbours are
+    similar. A merged circle is compared again to its new neighbours with both thresholds, so a chain of circles that
+    drift slowly is not merged into one. Each pass compares all the neighbours at once on arrays.
+
     :param circles: The osculating circles to merge
     :param radius_threshold: The maximum difference in radius for two circles to be considered similar
     :param center_threshold: The maximum distance between the centers of two circles to be considered similar
-    :return: The merged osculating circles
-    """
-    merged_circles = []
-    i = 0
-    while i < len(circles) - 1:
-        radius1, center1 = circles[i]
-        radius2, center2 = circles[i + 1]
-        if abs(radius1 - radius2) <= radius_threshold and center1.distance_to(center2) <= center_threshold:
-            merged_radius = (radius1 + radius2) // 2
-            merged_center = Position((center1.x + center2.x) // 2, (center1.y + center2.y) // 2)
-            merged_circles.append((merged_radius, merged_center))
-            i += 2
-        else:
-            merged_circles.append(circles[i])
-            i += 1
-    if i < len(circles):
-        merged_circles.append(circles[i])
-
-    if len(merged_circles) == len(circles):
-        return merged_circles
-    else:
-        return merge_similar_circles(merged_circles, radius_threshold, center_threshold)
+    :return: The merged osculating circles, in the order of the curve
+    """
+    if len(circles) < 2:
+        return list(circles)
+    radii = np.array([radius for radius, _ in circles], dtype=np.int64)
+    centers = np.array([(center.x, center.y) for _, center in circles], dtype=np.float64)
+    # Index in circles of each circle, or -1 for a merged circle.
+    sources = np.arange(len(circles))
+
+    while len(radii) > 1:
+        offsets = np.diff(centers, axis=0)
+        similar = ((np.abs(np.diff(radii)) <= radius_threshold) &
+                   (np.sqrt(offsets[:, 0] ** 2 + offsets[:, 1] ** 2) <= center_threshold))
+        if not similar.any():
+            break
+
+        # In a run of similar neighbours, the pairs start at every other circle from the start of the run.
+        indices = np.arange(len(similar))
+        run_starts = similar & ~np.concatenate(([False], similar[:-1]))
+        run_start = np.maximum.accumulate(np.where(run_starts, indices, 0))
+        firsts = np.flatnonzero(similar & ((indices - run_start) % 2 == 0))
+
+        radii[firsts] = (radii[firsts] + radii[firsts + 1]) // 2
+        centers[firsts] = (centers[firsts] + centers[firsts + 1]) // 2
+        sources[firsts] = -1
+        kept = np.ones(len(radii), dtype=bool)
+        kept[firsts + 1] = False
+        radii, centers, sources = radii[kept], centers[kept], sources[kept]
+
+    return [circles[source] if source >= 0 else (radius, Position(int(x), int(y)))
+            for radius, (x, y), source in zip(radii.tolist(), centers.tolist(), sources.tolist())]
 
 
 def circle_intersection(circle1: tuple[int, Position], circle2: tuple[int, Position]) -> list[Position]:
@@ -160,20 +247,41 @@ def circle_intersection(circle1: tuple[int, Position], circle2: tuple[int, Posit
                      int(p.y + distance_line_intersec_point * (circle2[1].x - circle1[1].x) / distance))]
 
 
-def closest_to_curve(points: list[Position], curve_points: list[Position]) -> Position:
-    closest_point = Position()
-    distance = inf
-    for point in points:
-        for curve_point in curve_points:
-            distance_point_curve = point.distance_to(curve_point)
-            if distance_point_curve < distance:
-                distance = distance_point_curve
-                closest_point = point
-    return closest_point
+def curve_tree(curve_points: list[Position]) -> "cKDTree":
+    """
+    Build the KD-tree of the points of a curve, to pass to closest_to_curve when querying the same curve many times
+
+    :param curve_points: The points of the curve
+    :return: The KD-tree of the points
+    """
+    from scipy.spatial import cKDTree
+
+    return cKDTree(np.array([(point.x, point.y) for point in curve_points], dtype=np.float64).reshape(-1, 2))
+
 
+def closest_to_curve(points: list[Position], curve_points: list[Position], tree: "cKDTree" = None) -> Position:
+    """
+    Find the point closest to a curve
 
-def midpoint_circle_segment(circle: tuple[int, Position], start_point: Position, end_point: Position, curve_points: list[Position]) -> list[
-    Position]:
+    :param points: The points to compare
+    :param curve_points: The points of the curve
+    :param tree: The KD-tree of curve_points given by curve_tree, built here if not given
+    :return: The first of the points closest to the curve, or Position() if there is no point or curve
+    """
+    if len(points) == 0 or len(curve_points) == 0:
+        return Position()
+    if tree is None:
+        tree = curve_tree(curve_points)
+    coordinates = np.array([(point.x, point.y) for point in points], dtype=np.float64)
+    _, nearest = tree.query(coordinates)
+    # Distances computed like Position.distance_to, so that the first of equal points is kept.
+    delta = tree.data[nearest] - coordinates
+    distances = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+    return points[int(np.argmin(distances))]
+
+
+def midpoint_circle_segment(circle: tuple[int, Position], start_point: Position, end_point: Position, curve_points: list[Position],
+                            tree: "cKDTree" = None) -> list[Position]:
     points = []
 
     start_angle = circle[1].angle_to(start_point)
@@ -188,7 +296,7 @@ def midpoint_circle_segment(circle: tuple[int, Position], start_point: Position,
 
     middle_angle = (start_angle+end_angle)/2
     middle_point = circle[1] + Position(int(circle[0]*cos(middle_angle)), -int(circle[0]*sin(middle_angle)))
-    is_outside_point = closest_to_curve([middle_point, circle[1]], curve_points) == middle_point
+    is_outside_point = closest_to_curve([middle_point, circle[1]], curve_points, tree) == middle_point
 
     x0, y0 = circle[1].x, circle[1].y
     x = circle[0]
@@ -261,144 +369,129 @@ def metro_line_osculating_circles(metro: Metro_Line, curve_factor: float = 0.5,
         control_point_pos, control_point_next_pos = calculate_control_points(station, station.next_station,
                                                                              curve_factor)
 
-        points, derivatives, second_derivatives = bezier_curve(
-            [station.pos, control_point_pos, control_point_next_pos, station.next_station.pos],
-            int(distance * num_points_factor))
+        control_points = [station.pos, control_point_pos, control_point_next_pos, station.next_station.pos]
+        times = arc_length_times(control_points, int(distance * num_points_factor))
+        points, derivatives, second_derivatives = bezier_curve_arrays(control_points, times)
 
-        osculating_circles = osculating_circle(points, derivatives, second_derivatives)
+        osculating_circles = circles_from_arrays(*osculating_circle_arrays(points, derivatives, second_derivatives))
         merged_circles = merge_similar_circles(osculating_circles, 50, 50)
         print(
             f"[METRO LINE] {len(osculating_circles) - len(merged_circles)} out of {len(osculating_circles)} circles deleted !")
         circles.extend(merged_circles)
-        points_list.extend(points)
+        points_list.extend(Position(int(x), int(y)) for x, y in np.round(points).tolist())
     print(f"[METRO LINE] Osculating circles done")
     return circles, points_list
 
 
-# --- DRAW PART ---
+# --- HEADLESS PART ---
 
-def draw_osculating_circle(circle: list[tuple[int, Position]], surface: Surface):
-    """
-    :param circle: The osculating circles to draw
-    :param surface: The surface on which to draw the circles
+def metro_line_centerline(metro: Metro_Line, curve_factor: float = 0.5) -> np.ndarray:
     """
-    for radius, center in circle:
-        pygame.draw.circle(surface, (255, 0, 0), (center.x, center.y), int(radius), 1)
-        pygame.draw.circle(surface, (0, 0, 255), (center.x, center.y), 10)
-
+    Rasterize the track of a metro line, without a display
 
-def draw_station(station: Station, surface: Surface):
-    """
-    :param station: The station to draw
-    :param surface: The surface on which to draw the station
-    """
-    pygame.draw.circle(surface, (255, 255, 255), (station.pos.x, station.pos.y), 10)
-
-
-def draw_points(points: list[Position], surface):
-    """
-    :param points: The points to draw
-    :param surface: The surface on which to draw the points
-    """
-    for point in points:
-        pygame.draw.circle(surface, (40, 255, 40), (point.x, point.y), 5)
+    Each curve between two stations is sampled by arc length at least twice per block, so that consecutive cells
+    of the track touch.
 
-
-def draw_point(point: Position, surface):
-    pygame.draw.circle(surface, (40, 255, 40), (point.x, point.y), 5)
-
-
-def draw_pixels(points: list[Position], surface):
-    for point in points:
-        surface.set_at((point.x, point.y), (0, 255, 255))
-
-
-def draw_metro_line(metro: Metro_Line, surface: Surface, show_points: bool = True):
-    """
-    :param metro: The metro line to draw
-    :param surface: The surface on which to draw the metro line
-    :param show_points: Whether to show the points of the curve
+    :param metro: The metro line to rasterize
+    :param curve_factor: How much the control points should be offset from the stations
+    :return: The cells (x, y) of the track, in order along the line, of shape (N, 2)
     """
+    cells = [np.zeros((0, 2), dtype=np.int32)]
     for i in range(len(metro.stations) - 1):
         station = metro.stations[i]
-        draw_station(station, surface)
-        draw_station(station.next_station, surface)
-
-    circles, points = metro_line_osculating_circles(metro)
-    draw_osculating_circle(circles, surface)
-    for i in range(1, len(circles) - 1):
-        intersect_point_circle_before = closest_to_curve(circle_intersection(circles[i - 1], circles[i]), points)
-        intersect_point_circle_after = closest_to_curve(circle_intersection(circles[i], circles[i + 1]), points)
-        if intersect_point_circle_before == Position():
-            continue
-            intersect_point_circle_before = circles[i - 1][1]
-        else:
-            draw_point(intersect_point_circle_before, surface)
-
-        if intersect_point_circle_after == Position():
-            continue
-            intersect_point_circle_after = circles[i + 1][1]
-        else:
-            draw_point(intersect_point_circle_after, surface)
-
-        points_midpoint = midpoint_circle_segment(circles[i], intersect_point_circle_before,
-                                                  intersect_point_circle_after, points)
-        draw_pixels(points_midpoint, surface)
-
-    if len(points) != 0:
-        intersect_point_circle_before = points[0]
-        intersect_point_circle_after = closest_to_curve(circle_intersection(circles[0], circles[1]), points)
-        points_midpoint = midpoint_circle_segment(circles[0], intersect_point_circle_before,
-                                                  intersect_point_circle_after, points)
-        draw_pixels(points_midpoint, surface)
+        control_point_pos, control_point_next_pos = calculate_control_points(station, station.next_station,
+                                                                             curve_factor)
+        control_points = [station.pos, control_point_pos, control_point_next_pos, station.next_station.pos]
+        # The control polygon is never shorter than the curve.
+        length = sum(control_points[j].distance_to(control_points[j + 1]) for j in range(3))
+        points = bezier_curve_arrays(control_points, arc_length_times(control_points, ceil(2 * length)))[0]
+        cells.append(np.round(points).astype(np.int32))
 
-        intersect_point_circle_before = points[-1]
-        intersect_point_circle_after = closest_to_curve(circle_intersection(circles[-1], circles[-2]), points)
-        points_midpoint = midpoint_circle_segment(circles[-1], intersect_point_circle_before,
-                                                  intersect_point_circle_after, points)
-        draw_pixels(points_midpoint, surface)
+    cells = np.concatenate(cells)
+    if len(cells) == 0:
+        return cells
+    new_cell = np.ones(len(cells), dtype=bool)
+    new_cell[1:] = np.any(cells[1:] != cells[:-1], axis=1)
+    return cells[new_cell]
 
 
-def interface():
+def station_footprints(metro: Metro_Line, length: int = 16, width: int = 5) -> np.ndarray:
     """
-    Interface for creating a metro line
-
-    Control :
-
-    - Up arrow ↑ Create a station facing north
-
-    - Down arrow ↓ Create a station facing south
-
-    - Left arrow ← Create a station facing west
+    Rasterize the platforms of the stations of a metro line, without a display
 
-    - Right arrow → Create a station facing east
+    :param metro: The metro line whose stations are rasterized
+    :param length: The length of a platform, along the orientation of its station
+    :param width: The width of a platform, across the orientation of its station
+    :return: The cells (x, y) covered by at least one platform, sorted, of shape (N, 2)
     """
-    metro = Metro_Line('A')
-    surface = pygame.display.set_mode((1000, 1000))
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
-
-            if event.type == pygame.KEYDOWN:
-                angle = 0
-                if event.key == pygame.K_UP:
-                    angle = pi / 2
-                elif event.key == pygame.K_DOWN:
-                    angle = -pi / 2
-                elif event.key == pygame.K_LEFT:
-                    angle = pi
-                x, y = pygame.mouse.get_pos()
-                metro.add_station(Station(Position(x, y), angle, str(len(metro.stations))))
-                draw_metro_line(metro, surface)
-
-        pygame.display.flip()
-
+    if len(metro.stations) == 0:
+        return np.zeros((0, 2), dtype=np.int32)
+    # Half-block samples of a platform centered on (0, 0) and facing x.
+    along, across = np.meshgrid(np.linspace(-(length - 1) / 2, (length - 1) / 2, 2 * length - 1),
+                                np.linspace(-(width - 1) / 2, (width - 1) / 2, 2 * width - 1))
+    along, across = along.ravel(), across.ravel()
+
+    cells = []
+    for station in metro.stations:
+        direction_x, direction_y = cos(station.orientation), -sin(station.orientation)
+        xs = station.pos.x + along * direction_x - across * direction_y
+        ys = station.pos.y + along * direction_y + across * direction_x
+        cells.append(np.stack((xs, ys), axis=1))
+    return np.unique(np.round(np.concatenate(cells)).astype(np.int32), axis=0)
+
+
+def metro_tunnel_mask(metro: Metro_Line, width: int = 3, station_length: int = 16, station_width: int = 5) \
+        -> np.ndarray:
+    """
+    Get the columns swept by the tunnel of a metro line: the cells within width / 2 of the track, and the platforms
 
-def main():
-    interface()
+    :param metro: The metro line to dig
+    :param width: The width of the tunnel around the track
+    :param station_length: The length of a platform
+    :param station_width: The width of a platform
+    :return: The cells (x, y) of the tunnel, sorted, of shape (N, 2)
+    """
+    from scipy import ndimage
+
+    centerline = metro_line_centerline(metro)
+    footprints = station_footprints(metro, station_length, station_width)
+    cells = np.concatenate((centerline, footprints))
+    if len(cells) == 0:
+        return cells
+
+    margin = width // 2 + 1
+    origin = cells.min(axis=0) - margin
+    shape = tuple(cells.max(axis=0) - origin + margin + 1)
+    background = np.ones(shape, dtype=bool)
+    if len(centerline):
+        background[tuple((centerline - origin).T)] = False
+        mask = ndimage.distance_transform_edt(background) <= width / 2
+    else:
+        mask = np.zeros(shape, dtype=bool)
+    mask[tuple((footprints - origin).T)] = True
+    return (np.argwhere(mask) + origin).astype(np.int32)
 
 
-if __name__ == "__main__":
-    main()
+def plan_metro_tunnel(metro: Metro_Line, y: int, width: int = 3, clearance: int = 4, station_length: int = 16,
+                      station_width: int = 5, block: Optional[Block] = None) -> EditPlan:
+    """
+    Plan the tunnel of a metro line, its swept volume being grouped into cuboids to be placed in bulk
+
+    The positions of the metro line are the x and z world coordinates.
+
+    :param metro: The metro line to dig
+    :param y: The height of the floor of the tunnel
+    :param width: The width of the tunnel around the track
+    :param clearance: The height of the tunnel, floor included
+    :param station_length: The length of a platform
+    :param station_width: The width of a platform
+    :param block: The block filling the tunnel, air by default
+    :return: The cuboids of the tunnel, in world coordinates
+    """
+    if block is None:
+        block = Block("air")
+    cells = metro_tunnel_mask(metro, width, station_length, station_width)
+    plan = EditPlan([block])
+    plan.add_cuboids(group_columns(cells[:, 0], cells[:, 1], np.full(len(cells), y), np.full(len(cells), y + clearance - 1),
+                                   np.zeros(len(cells), dtype=np.int32)))
+    return plan
@@ -0,0 +1,136 @@
+from math import pi
+
+import pygame
+from pygame import Surface
+
+from metro.Metro_Line import *
+from metro.metro_line_map import (circle_intersection, closest_to_curve, curve_tree, metro_line_osculating_circles,
+                                  midpoint_circle_segment)
+
+
+def draw_osculating_circle(circle: list[tuple[int, Position]], surface: Surface):
+    """
+    :param circle: The osculating circles to draw
+    :param surface: The surface on which to draw the circles
+    """
+    for radius, center in circle:
+        pygame.draw.circle(surface, (255, 0, 0), (center.x, center.y), int(radius), 1)
+        pygame.draw.circle(surface, (0, 0, 255), (center.x, center.y), 10)
+
+
+def draw_station(station: Station, surface: Surface):
+    """
+    :param station: The station to draw
+    :param surface: The surface on which to draw the station
+    """
+    pygame.draw.circle(surface, (255, 255, 255), (station.pos.x, station.pos.y), 10)
+
+
+def draw_points(points: list[Position], surface):
+    """
+    :param points: The points to draw
+    :param surface: The surface on which to draw the points
+    """
+    for point in points:
+        pygame.draw.circle(surface, (40, 255, 40), (point.x, point.y), 5)
+
+
+def draw_point(point: Position, surface):
+    pygame.draw.circle(surface, (40, 255, 40), (point.x, point.y), 5)
+
+
+def draw_pixels(points: list[Position], surface):
+    for point in points:
+        surface.set_at((point.x, point.y), (0, 255, 255))
+
+
+def draw_metro_line(metro: Metro_Line, surface: Surface, show_points: bool = True):
+    """
+    :param metro: The metro line to draw
+    :param surface: The surface on which to draw the metro line
+    :param show_points: Whether to show the points of the curve
+    """
+    for i in range(len(metro.stations) - 1):
+        station = metro.stations[i]
+        draw_station(station, surface)
+        draw_station(station.next_station, surface)
+
+    circles, points = metro_line_osculating_circles(metro)
+    tree = curve_tree(points)
+    draw_osculating_circle(circles, surface)
+    for i in range(1, len(circles) - 1):
+        intersect_point_circle_before = closest_to_curve(circle_intersection(circles[i - 1], circles[i]), points, tree)
+        intersect_point_circle_after = closest_to_curve(circle_intersection(circles[i], circles[i + 1]), points, tree)
+        if intersect_point_circle_before == Position():
+            continue
+            intersect_point_circle_before = circles[i - 1][1]
+        else:
+            draw_point(intersect_point_circle_before, surface)
+
+        if intersect_point_circle_after == Position():
+            continue
+            intersect_point_circle_after = circles[i + 1][1]
+        else:
+            draw_point(intersect_point_circle_after, surface)
+
+        points_midpoint = midpoint_circle_segment(circles[i], intersect_point_circle_before,
+                                                  intersect_point_circle_after, points, tree)
+        draw_pixels(points_midpoint, surface)
+
+    if len(points) != 0:
+        intersect_point_circle_before = points[0]
+        intersect_point_circle_after = closest_to_curve(circle_intersection(circles[0], circles[1]), points, tree)
+        points_midpoint = midpoint_circle_segment(circles[0], intersect_point_circle_before,
+                                                  intersect_point_circle_after, points, tree)
+        draw_pixels(points_midpoint, surface)
+
+        intersect_point_circle_before = points[-1]
+        intersect_point_circle_after = closest_to_curve(circle_intersection(circles[-1], circles[-2]), points, tree)
+        points_midpoint = midpoint_circle_segment(circles[-1], intersect_point_circle_before,
+                                                  intersect_point_circle_after, points, tree)
+        draw_pixels(points_midpoint, surface)
+
+
+def interface():
+    """
+    Interface for creating a metro line
+
+    Control :
+
+    - Up arrow ↑ Create a station facing north
+
+    - Down arrow ↓ Create a station facing south
+
+    - Left arrow ← Create a station facing west
+
+    - Right arrow → Create a station facing east
+    """
+    metro = Metro_Line('A')
+    surface = pygame.display.set_mode((1000, 1000))
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return
+
+            if event.type == pygame.KEYDOWN:
+                angle = 0
+                if event.key == pygame.K_UP:
+                    angle = pi / 2
+                elif event.key == pygame.K_DOWN:
+                    angle = -pi / 2
+                elif event.key == pygame.K_LEFT:
+                    angle = pi
+                x, y = pygame.mouse.get_pos()
+                metro.add_station(Station(Position(x, y), angle, str(len(metro.stations))))
+                draw_metro_line(metro, surface)
+
+        pygame.display.flip()
+
+
+def main():
+    interface()
+
+
+if __name__ == "__main__":
+    main()
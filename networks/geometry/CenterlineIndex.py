@@ -0,0 +1,67 @@
+from typing import List, Union
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from networks.geometry.Point2D import Point2D
+from networks.geometry.Point3D import Point3D
+
+
+class CenterlineIndex:
+    def __init__(self, points: Union[List[Point2D], List[Point3D], np.ndarray], removed_axis: str = 'y'):
+        """KD-tree over the points of a centerline, projected on a plane, to find the nearest centerline point of many points at once.
+
+        Build it once per road, then use nearest instead of calling Point2D.nearest for each point.
+
+        Args:
+            points (List[Point2D] | List[Point3D] | np.ndarray): Points of the centerline, in order. Point3D are projected by removing removed_axis, arrays must already be 2d (N, 2).
+            removed_axis (str, optional): Axis removed from Point3D. Defaults to 'y'.
+
+        >>> CenterlineIndex([Point2D(0, 0), Point2D(5, 0), Point2D(10, 0)]).nearest([Point2D(4, 3), Point2D(11, -1)])
+        array([1, 2])
+        """
+        if len(points) and isinstance(points[0], Point3D):
+            points = Point3D.to_2d(points, removed_axis)
+        if len(points) and isinstance(points[0], Point2D):
+            points = [point.coordinates for point in points]
+        self.points = np.asarray(points).reshape(-1, 2)
+        self.tree = cKDTree(self.points)
+
+    def __len__(self):
+        return len(self.points)
+
+    def nearest(self, points: Union[List[Point2D], np.ndarray], k: int = 8) -> np.ndarray:
+        """Return the index of the nearest centerline point of each point. If multiple nearest points, returns the first in the centerline, like Point2D.nearest.
+
+        Args:
+            points (List[Point2D] | np.ndarray): Points to project, as Point2D or an array (N, 2).
+            k (int, optional): Number of neighbors fetched at once to settle the ties. Defaults to 8.
+
+        Returns:
+            np.ndarray: Index in the centerline of the nearest point of each point.
+        """
+        if len(points) and isinstance(points[0], Point2D):
+            points = [point.coordinates for point in points]
+        points = np.asarray(points).reshape(-1, 2)
+        if len(points) == 0 or len(self.points) == 0:
+            return np.zeros(len(points), dtype=np.intp)
+
+        k = min(k, len(self.points))
+        _, candidates = self.tree.query(points, k=k)
+        candidates = candidates.reshape(len(points), k)
+
+        # Distances computed like Point2D.distance, so that equal distances are found equal.
+        delta = self.points[candidates] - points[:, None, :]
+        distances = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2)
+        shortest = distances.min(axis=1)
+        tied = distances == shortest[:, None]
+        indices = np.where(tied, candidates, len(self.points)).min(axis=1)
+
+        # When every fetched neighbor is tied, more points may be at the same distance.
+        for i in np.flatnonzero(tied[:, -1] & (k < len(self.points))).tolist():
+            radius = shortest[i] * (1 + 1e-9) + 1e-9
+            neighbors = np.array(self.tree.query_ball_point(points[i], radius))
+            delta = self.points[neighbors] - points[i]
+            distances = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+            indices[i] = neighbors[distances == distances.min()].min()
+        return indices
@@ -24,17 +24,42 @@ class Circle:
         return f"Circle(center: {self.center}, radius: {self.radius}, spaced_radius: {self.spaced_radius}, inner: {self.inner}, outer: {self.outer})"
 
     def circle(self, radius: int) -> List[Point2D]:
+        """Compute discrete value of a 2d-circle, appended to self.points.
+
+        Args:
+            radius (int): Radius of the circle.
+
+        Returns:
+            list(Point2D): List of 2d-coordinates composing the circle, four by four, with duplicates on the axis.
+        """
+        self.points.extend(Point2D(x, y)
+                           for x, y in self.circle_array(radius).tolist())
+        return self.points
+
+    def circle_array(self, radius: int) -> np.ndarray:
+        """Compute discrete value of a 2d-circle in the order of circle, with numpy.
+
+        Args:
+            radius (int): Radius of the circle.
+
+        Returns:
+            np.ndarray: Coordinates (N, 2) of the circle, four by four, with duplicates on the axis.
+
+        >>> Circle(Point2D(0, 0)).circle_array(1)
+        array([[ 1,  0],
+               [ 0,  1],
+               [-1,  0],
+               [ 0, -1]])
+        """
         self.radius = radius
-        center = self.center.copy()
 
+        # Only the octant walk is done in Python, the four symmetric points of each step are computed at once.
+        steps = []
         x = -radius
         y = 0
         error = 2-2*radius
         while (True):
-            self.points.append(Point2D(center.x-x, center.y+y))
-            self.points.append(Point2D(center.x-y, center.y-x))
-            self.points.append(Point2D(center.x+x, center.y-y))
-            self.points.append(Point2D(center.x+y, center.y+x))
+            steps.append((x, y))
             r = error
             if (r <= y):
                 y += 1
@@ -46,10 +71,14 @@ class Circle:
                 continue
             else:
                 break
-        return self.points
+
+        x, y = np.array(steps, dtype=np.int64).T
+        points = np.stack((np.stack((-x, y), axis=1), np.stack((-y, -x), axis=1),
+                           np.stack((x, -y), axis=1), np.stack((y, x), axis=1)), axis=1)
+        return points.reshape(-1, 2) + np.array((self.center.x, self.center.y))
 
     def circle_thick(self, inner: int, outer: int) -> List[Point2D]:
-        """Compute discrete value of a 2d-circle with thickness. 
+        """Compute discrete value of a 2d-circle with thickness, appended to self.points_thick.
 
         From: https://stackoverflow.com/questions/27755514/circle-with-thickness-drawing-algorithm
 
@@ -58,14 +87,34 @@ class Circle:
             outer (int): The maximum radius where disc filling stops (included).
 
         Returns:
-            list(Point2D): List of 2d-coordinates composing the surface. Note that some coordinates are redondant and are not ordered.
+            list(Point2D): List of 2d-coordinates composing the surface, without duplicates, sorted by x then y.
 
-        >>> Circle(Point2D(0, 0), 5, 10)
+        >>> Circle(Point2D(0, 0)).circle_thick(5, 10)
         """
+        self.points_thick.extend(
+            Point2D(x, y) for x, y in self.circle_thick_array(inner, outer).tolist())
+        return self.points_thick
+
+    def circle_thick_array(self, inner: int, outer: int) -> np.ndarray:
+        """Compute discrete value of a 2d-circle with thickness, as a masked grid around the center.
+
+        The radii walk of circle_thick gives, for each distance d to an axis, the interval of distances to the other axis filled by the lines drawn at d. A pixel is filled if it is in the interval of its row or of its column.
+
+        Args:
+            inner (int): The minimum radius at which the disc is filled (included).
+            outer (int): The maximum radius where disc filling stops (included).
 
+        Returns:
+            np.ndarray: Coordinates (N, 2) of the surface, without duplicates, sorted by x then y.
+
+        >>> Circle(Point2D(0, 0)).circle_thick_array(1, 1)
+        array([[-1,  0],
+               [ 0, -1],
+               [ 0,  1],
+               [ 1,  0]])
+        """
         self.inner = inner
         self.outer = outer
-        center = self.center.copy()
 
         xo = outer
         xi = inner
@@ -74,15 +123,11 @@ class Circle:
         erro = 1 - xo
         erri = 1 - xi
 
+        lows = []
+        highs = []
         while xo >= y:
-            self._x_line(center.x + xi, center.x + xo, center.y + y)
-            self._y_line(center.x + y,  center.y + xi, center.y + xo)
-            self._x_line(center.x - xo, center.x - xi, center.y + y)
-            self._y_line(center.x - y,  center.y + xi, center.y + xo)
-            self._x_line(center.x - xo, center.x - xi, center.y - y)
-            self._y_line(center.x - y,  center.y - xo, center.y - xi)
-            self._x_line(center.x + xi, center.x + xo, center.y - y)
-            self._y_line(center.x + y,  center.y - xo, center.y - xi)
+            lows.append(xi)
+            highs.append(xo)
 
             y += 1
 
@@ -100,7 +145,49 @@ class Circle:
                 else:
                     xi -= 1
                     erri += 2 * (y - xi + 1)
-        return self.points_thick
+
+        if not lows:
+            return np.empty((0, 2), dtype=np.int64)
+
+        # A line from xi to xo and its mirror fill the distances from max(xi, 0) to max(xo, -xi), xo being positive.
+        lows = np.array(lows)
+        highs = np.array(highs)
+        empty = lows > highs
+        lows, highs = np.maximum(lows, 0), np.maximum(highs, -lows)
+        lows[empty], highs[empty] = 1, 0
+        extent = max(int(highs.max()), len(lows) - 1)
+
+        # The last interval is empty, for the distances without line.
+        lows = np.append(lows, 1)
+        highs = np.append(highs, 0)
+        distances = np.abs(np.arange(-extent, extent + 1))
+        column = np.minimum(distances, len(lows) - 1)[:, None]
+        row = column.T
+        mask = ((lows[row] <= distances[:, None]) & (distances[:, None] <= highs[row])) | \
+            ((lows[column] <= distances[None, :]) & (distances[None, :] <= highs[column]))
+        return np.argwhere(mask) - extent + np.array((self.center.x, self.center.y))
+
+    def arc_thick_array(self, inner: int, outer: int, start: Point2D, end: Point2D) -> np.ndarray:
+        """Compute the part of a 2d-circle with thickness between two points, like the corner of a road.
+
+        The surface is clipped to the triangle of the center and of the two points pushed 5 times farther from the center, so that the whole width is kept.
+
+        Args:
+            inner (int): The minimum radius at which the disc is filled (included).
+            outer (int): The maximum radius where disc filling stops (included).
+            start (Point2D): First point of the arc.
+            end (Point2D): Last point of the arc.
+
+        Returns:
+            np.ndarray: Coordinates (N, 2) of the arc, without duplicates, sorted by x then y.
+        """
+        points = self.circle_thick_array(inner, outer)
+        center = Point2D.to_arrays(self.center)
+        corner_a = Point2D.from_arrays(Point2D.to_arrays(
+            start) + 5 * (Point2D.to_arrays(start) - center))
+        corner_b = Point2D.from_arrays(Point2D.to_arrays(
+            end) + 5 * (Point2D.to_arrays(end) - center))
+        return points[Point2D.is_in_triangle_array(points, corner_a, self.center, corner_b)]
 
     def circle_spaced(self, number: int, radius: int) -> List[Point2D]:
         """Get evenly spaced coordinates of the circle.
@@ -130,13 +217,3 @@ class Circle:
             ).round()
             self.spaced_points[i] = current_point
         return self.spaced_points
-
-    def _x_line(self, x1, x2, y):
-        while x1 <= x2:
-            self.points_thick.append(Point2D(x1, y))
-            x1 += 1
-
-    def _y_line(self, x, y1, y2):
-        while y1 <= y2:
-            self.points_thick.append(Point2D(x, y1))
-            y1 += 1
@@ -4,6 +4,7 @@ from typing import List, Union
 import numpy as np
 
 from Enums import ROTATION
+from networks.geometry.point_tools import nearest_neighbor_order
 
 
 class Point2D:
@@ -72,6 +73,42 @@ class Point2D:
         else:
             return (s_p <= 0) and (t_p <= 0) and (s_p + t_p) >= d
 
+    @staticmethod
+    def is_in_triangle_array(points: np.ndarray, xy0: "Point2D", xy1: "Point2D", xy2: "Point2D") -> np.ndarray:
+        """Vectorized is_in_triangle, for many points at once.
+
+        Args:
+            points (np.ndarray): Coordinates (N, 2) of the points to test.
+            xy0 (Type[Point2D]): Point of the triangle.
+            xy1 (Type[Point2D]): Point of the triangle.
+            xy2 (Type[Point2D]): Point of the triangle.
+
+        Returns:
+            np.ndarray: Boolean mask (N,), True for the points inside the triangle.
+
+        >>> Point2D.is_in_triangle_array(np.array([[0, 0], [0, 30]]), Point2D(10, 10), Point2D(-10, 20), Point2D(0, -20))
+        array([ True, False])
+        """
+        points = np.asarray(points).reshape(-1, 2)
+        if points.dtype.kind in 'iu':
+            points = points.astype(np.int64)
+        dx = points[:, 0] - xy0.x
+        dy = points[:, 1] - xy0.y
+
+        dx2 = xy2.x - xy0.x
+        dy2 = xy2.y - xy0.y
+        dx1 = xy1.x - xy0.x
+        dy1 = xy1.y - xy0.y
+
+        s_p = (dy2 * dx) - (dx2 * dy)
+        t_p = (dx1 * dy) - (dy1 * dx)
+        d = (dx1 * dy2) - (dy1 * dx2)
+
+        if d > 0:
+            return (s_p >= 0) & (t_p >= 0) & ((s_p + t_p) <= d)
+        else:
+            return (s_p <= 0) & (t_p <= 0) & ((s_p + t_p) >= d)
+
     def nearest(self, points: List["Point2D"], return_index: bool = False) -> Union["Point2D", List[Union["Point2D", int]]]:
         """Return the nearest point. If multiple nearest point, returns the first in the list.
 
@@ -90,6 +127,7 @@ class Point2D:
         """Get an optimized ordered path starting from the current point.
 
         From: https://stackoverflow.com/questions/45829155/sort-points-in-order-to-have-a-continuous-curve-using-python
+        Each point is followed by the nearest remaining one, found with a KD-tree. The given list is not modified.
 
         Args:
             points (List[Point2D]): List of 2d-points. Could contain the current point.
@@ -100,17 +138,11 @@ class Point2D:
         >>> Point2D(-2, -5).optimized_path([Point2D(0, 0), Point2D(10, 5), Point2D(1, 3)])
         [Point2D(x: -2, y: -5), Point2D(x: 0, y: 0), Point2D(x: 1, y: 3), Point2D(x: 10, y: 5)]
         """
-        start = self
-        if start not in points:
-            points.append(start)
-        pass_by = points
-        path = [start]
-        pass_by.remove(start)
-        while pass_by:
-            nearest = min(pass_by, key=lambda point: point.distance(path[-1]))
-            path.append(nearest)
-            pass_by.remove(nearest)
-        return path
+        points = list(points)
+        if self not in points:
+            points.append(self)
+        order = nearest_neighbor_order([point.coordinates for point in points], points.index(self))
+        return [self] + [points[i] for i in order[1:]]
 
     def sort_by_rotation(self, points: List["Point2D"], rotation: ROTATION = ROTATION.CLOCKWISE) -> List["Point2D"]:
         """Sort points in clockwise order, starting from current point.
@@ -1,6 +1,7 @@
 from math import sqrt
 from typing import List, Union
 from networks.geometry.Point2D import Point2D
+from networks.geometry.point_tools import nearest_neighbor_order
 
 import numpy as np
 
@@ -40,6 +41,7 @@ class Point3D:
         """Get an optimized ordered path starting from the current point.
 
         From: https://stackoverflow.com/questions/45829155/sort-points-in-order-to-have-a-continuous-curve-using-python
+        Each point is followed by the nearest remaining one, found with a KD-tree. The given list is not modified.
 
         Args:
             points (List[Point3D]): List of 3d-points. Could contain the current point.
@@ -50,17 +52,11 @@ class Point3D:
         >>> Point3D(-2, -5, 6).optimized_path([Point3D(0, 0, 7), Point3D(10, 5, 1), Point3D(1, 3, 3)])
         [Point3D(x: -2, y: -5, z: 6), Point3D(x: 0, y: 0, z: 7), Point3D(x: 1, y: 3, z: 3), Point3D(x: 10, y: 5, z: 1)]
         """
-        start = self
-        if start not in points:
-            points.append(start)
-        pass_by = points
-        path = [start]
-        pass_by.remove(start)
-        while pass_by:
-            nearest = min(pass_by, key=lambda point: point.distance(path[-1]))
-            path.append(nearest)
-            pass_by.remove(nearest)
-        return path
+        points = list(points)
+        if self not in points:
+            points.append(self)
+        order = nearest_neighbor_order([point.coordinates for point in points], points.index(self))
+        return [self] + [points[i] for i in order[1:]]
 
     def round(self, ndigits: int = None) -> "Point3D":
         self.x = round(self.x, ndigits)
@@ -1,3 +1,4 @@
+import logging
 from math import inf, sqrt
 from typing import List, Tuple, Union
 
@@ -7,6 +8,8 @@ from networks.geometry.Circle import Circle
 from networks.geometry.Point2D import Point2D
 from networks.geometry.Segment2D import Segment2D
 
+logger = logging.getLogger(__name__)
+
 
 class Polyline:
     def __init__(self, points: List[Point2D]):
@@ -28,9 +31,8 @@ class Polyline:
         self.length_polyline = len(self.points_array)
 
         if self.length_polyline < 4:
-            print(self.length_polyline)
-            print(self.points_array)
-            print(self.output_points)
+            logger.debug("Polyline of %d points after removing collinear points: %s, from %s",
+                         self.length_polyline, self.points_array, self.output_points)
             raise ValueError("The list must contain at least 4 elements.")
 
         self.vectors = [None] * self.length_polyline  # v
@@ -112,7 +114,7 @@ class Polyline:
 
     def get_arcs(self) -> List[Point2D]:
         for i in range(1, self.length_polyline-1):
-            points = Circle(self.centers[i]).circle(self.radii[i])
+            points = Circle(self.centers[i]).circle_array(self.radii[i])
 
             # Better to do here than drawing circle arc inside big triangle!
             double_point_a = Point2D.from_arrays(Point2D.to_arrays(self.acrs_intersections[i][0]) + 5 * (Point2D.to_arrays(
@@ -120,9 +122,10 @@ class Polyline:
             double_point_b = Point2D.from_arrays(Point2D.to_arrays(self.acrs_intersections[i][2]) + 5 * (Point2D.to_arrays(
                 self.acrs_intersections[i][2]) - Point2D.to_arrays(self.centers[i])))
 
-            for j in range(len(points)):
-                if points[j].is_in_triangle(double_point_a, self.centers[i], double_point_b):
-                    self.arcs[i].append(points[j])
+            inside = Point2D.is_in_triangle_array(
+                points, double_point_a, self.centers[i], double_point_b)
+            self.arcs[i].extend(Point2D(x, y)
+                                for x, y in points[inside].tolist())
         return self.arcs
 
     def get_segments(self) -> List[Segment2D]:
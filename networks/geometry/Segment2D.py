@@ -4,6 +4,7 @@ import numpy as np
 
 from Enums import LINE_OVERLAP, LINE_THICKNESS_MODE
 from networks.geometry.Point2D import Point2D
+from networks.geometry.segment_tools import bresenham_steps
 
 
 class Segment2D:
@@ -21,6 +22,7 @@ class Segment2D:
         """Modified Bresenham draw (line) with optional overlap.
 
         From: https://github.com/ArminJo/Arduino-BlueDisplay/blob/master/src/LocalGUI/ThickLine.hpp
+        Points are computed by segment_array, then appended to self.points.
 
         Args:
             start (Point2D): Start point of the segment.
@@ -30,89 +32,116 @@ class Segment2D:
 
         >>> Segment2D(Point2D(0, 0), Point2D(10, 15))
         """
+        self._add_points(self.segment_array(
+            start, end, overlap), _is_computing_thickness)
 
-        if start is None or end is None:
-            start = self.start.copy()
-            end = self.end.copy()
-        else:
-            start = start.copy()
-            end = end.copy()
-
-        # Direction
-        delta_x = end.x - start.x
-        delta_y = end.y - start.y
-
-        if (delta_x < 0):
-            delta_x = -delta_x
-            step_x = -1
-        else:
-            step_x = +1
-
-        if (delta_y < 0):
-            delta_y = -delta_y
-            step_y = -1
-        else:
-            step_y = +1
-
-        delta_2x = 2*delta_x
-        delta_2y = 2*delta_y
+        if not _is_computing_thickness:
+            return self.points
+        return None
 
-        self._add_points(start, _is_computing_thickness)
+    def segment_array(self, start: Point2D = None, end: Point2D = None, overlap: LINE_OVERLAP = LINE_OVERLAP.NONE) -> np.ndarray:
+        """Modified Bresenham draw (line) with optional overlap, computed at once with numpy.
 
-        if (delta_x > delta_y):
-            error = delta_2y - delta_x
-            while (start.x != end.x):
-                start.x += step_x
-                if (error >= 0):
-                    if (overlap == LINE_OVERLAP.MAJOR):
-                        self._add_points(start, _is_computing_thickness)
+        Args:
+            start (Point2D, optional): Start point of the segment. Defaults to self.start.
+            end (Point2D, optional): End point of the segment. Defaults to self.end.
+            overlap (LINE_OVERLAP): Overlap draws additional pixel when changing minor direction. For standard bresenham overlap, choose LINE_OVERLAP_NONE. Can also be LINE_OVERLAP_MAJOR or LINE_OVERLAP_MINOR.
 
-                    start.y += step_y
-                    if (overlap == LINE_OVERLAP.MINOR):
-                        self._add_points(
-                            Point2D(start.copy().x - step_x, start.copy().y), _is_computing_thickness)
-                    error -= delta_2x
-                error += delta_2y
-                self._add_points(start, _is_computing_thickness)
+        Returns:
+            np.ndarray: Coordinates (N, 2) of the points, in drawing order.
+
+        >>> Segment2D(Point2D(0, 0), Point2D(4, 2)).segment_array()
+        array([[0, 0],
+               [1, 1],
+               [2, 1],
+               [3, 2],
+               [4, 2]], dtype=int32)
+        """
+        if start is None or end is None:
+            start = self.start
+            end = self.end
+        return self._pattern(end.x - start.x, end.y - start.y, overlap) + np.array((start.x, start.y), dtype=np.int32)
+
+    @staticmethod
+    def _pattern(delta_x: int, delta_y: int, overlap: LINE_OVERLAP) -> np.ndarray:
+        """Points of a segment starting at the origin. A segment is a translation of the pattern of its delta."""
+        step_x = -1 if delta_x < 0 else 1
+        step_y = -1 if delta_y < 0 else 1
+        delta_x = abs(int(delta_x))
+        delta_y = abs(int(delta_y))
+
+        # Ties are drawn along y, like the pixel walk.
+        if delta_x > delta_y:
+            delta_major, delta_minor, steps = delta_x, delta_y, (step_x, step_y)
         else:
-            error = delta_2x - delta_y
-            while (start.y != end.y):
-                start.y += step_y
-                if (error >= 0):
-                    if (overlap == LINE_OVERLAP.MAJOR):
-                        self._add_points(start, _is_computing_thickness)
-
-                    start.x += step_x
-                    if (overlap == LINE_OVERLAP.MINOR):
-                        self._add_points(
-                            Point2D(start.copy().x, start.copy().y - step_y), _is_computing_thickness)
-                    error -= delta_2y
-                error += delta_2x
-                self._add_points(start, _is_computing_thickness)
-
-        if not _is_computing_thickness:
-            return self.points
-        return None
+            delta_major, delta_minor, steps = delta_y, delta_x, (step_y, step_x)
+
+        points = np.empty((delta_major + 1, 2), dtype=np.int32)
+        points[:, 0] = np.arange(delta_major + 1)
+        points[:, 1] = bresenham_steps(delta_major, delta_minor)
+
+        if overlap != LINE_OVERLAP.NONE and delta_major > 0:
+            # Each step draws an additional pixel before its point when the minor coordinate changes.
+            changes = points[1:, 1] != points[:-1, 1]
+            rows = np.empty((delta_major, 2, 2), dtype=np.int32)
+            if overlap == LINE_OVERLAP.MAJOR:
+                rows[:, 0, 0] = points[1:, 0]
+                rows[:, 0, 1] = points[:-1, 1]
+            else:
+                rows[:, 0, 0] = points[:-1, 0]
+                rows[:, 0, 1] = points[1:, 1]
+            rows[:, 1] = points[1:]
+            drawn = np.ones((delta_major, 2), dtype=bool)
+            drawn[:, 0] = changes
+            points = np.concatenate((points[:1], rows[drawn]))
+
+        points *= np.array(steps, dtype=np.int32)
+        if delta_x > delta_y:
+            return points
+        return points[:, ::-1].copy()
 
     def segment_thick(self, thickness: int, thickness_mode: LINE_THICKNESS_MODE) -> List[Point2D]:
         """Bresenham with thickness.
 
         From: https://github.com/ArminJo/Arduino-BlueDisplay/blob/master/src/LocalGUI/ThickLine.hpp
         Murphy's Modified Bresenham algorithm : http://zoo.co.uk/murphy/thickline/index.html
+        Points are computed by segment_thick_array, then appended to self.points_thick.
 
         Args:
-            start (Point2D): Start point of the segment.
-            end (Point2D): End point of the segment.
             thickness (int): Total width of the surface. Placement relative to the original segment depends on thickness_mode.
             thickness_mode (LINE_THICKNESS_MODE): Can be one of LINE_THICKNESS_MIDDLE, LINE_THICKNESS_DRAW_CLOCKWISE, LINE_THICKNESS_DRAW_COUNTERCLOCKWISE.
 
         >>> self.compute_thick_segment(self.start, self.end, self.thickness, self.thickness_mode)
         """
-        start = self.start.copy()
-        end = self.end.copy()
+        self._add_points(self.segment_thick_array(
+            thickness, thickness_mode), True)
+        return self.points_thick
 
-        delta_y = end.x - start.x
-        delta_x = end.y - start.y
+    def segment_thick_array(self, thickness: int, thickness_mode: LINE_THICKNESS_MODE) -> np.ndarray:
+        """Bresenham with thickness, computed with numpy.
+
+        Every parallel line is the same Bresenham pattern moved along the perpendicular, so only the moves are walked.
+
+        Args:
+            thickness (int): Total width of the surface. Placement relative to the original segment depends on thickness_mode.
+            thickness_mode (LINE_THICKNESS_MODE): Can be one of LINE_THICKNESS_MIDDLE, LINE_THICKNESS_DRAW_CLOCKWISE, LINE_THICKNESS_DRAW_COUNTERCLOCKWISE.
+
+        Returns:
+            np.ndarray: Coordinates (N, 2) of the points, line after line, with duplicates where lines overlap.
+
+        >>> Segment2D(Point2D(0, 0), Point2D(2, 0)).segment_thick_array(2, LINE_THICKNESS_MODE.MIDDLE)
+        array([[ 0, -1],
+               [ 1, -1],
+               [ 2, -1],
+               [ 0,  0],
+               [ 1,  0],
+               [ 2,  0]], dtype=int32)
+        """
+        start_x = self.start.x
+        start_y = self.start.y
+
+        delta_y = self.end.x - self.start.x
+        delta_x = self.end.y - self.start.y
 
         swap = True
         if (delta_x < 0):
@@ -138,6 +167,8 @@ class Segment2D:
         elif (thickness_mode == LINE_THICKNESS_MODE.DRAW_CLOCKWISE):
             draw_start_adjust_count = 0
 
+        # Start of each line and its overlap.
+        lines = []
         if (delta_x >= delta_y):
             if swap:
                 draw_start_adjust_count = (
@@ -148,32 +179,24 @@ class Segment2D:
 
             error = delta_2y - delta_x
             for i in range(draw_start_adjust_count, 0, -1):
-
-                start.x -= step_x
-                end.x -= step_x
+                start_x -= step_x
                 if error >= 0:
-                    start.y -= step_y
-                    end.y -= step_y
+                    start_y -= step_y
                     error -= delta_2x
                 error += delta_2x
 
-            self.segment(
-                start, end, overlap=LINE_OVERLAP.NONE, _is_computing_thickness=True)
+            lines.append((start_x, start_y, LINE_OVERLAP.NONE))
 
             error = delta_2x - delta_x
             for i in range(thickness, 1, -1):
-                start.x += step_x
-                end.x += step_x
+                start_x += step_x
                 overlap = LINE_OVERLAP.NONE
                 if (error >= 0):
-                    start.y += step_y
-                    end.y += step_y
+                    start_y += step_y
                     error -= delta_2x
                     overlap = LINE_OVERLAP.MAJOR
                 error += delta_2y
-
-                self.segment(
-                    start, end, overlap=overlap, _is_computing_thickness=True)
+                lines.append((start_x, start_y, overlap))
 
         else:
             if swap:
@@ -185,33 +208,31 @@ class Segment2D:
 
             error = delta_2x - delta_y
             for i in range(draw_start_adjust_count, 0, -1):
-                start.y -= step_y
-                end.y -= step_y
+                start_y -= step_y
                 if (error >= 0):
-                    start.x -= step_x
-                    end.x -= step_x
+                    start_x -= step_x
                     error -= delta_2y
                 error += delta_2x
 
-            self.segment(
-                start, end, overlap=LINE_OVERLAP.NONE, _is_computing_thickness=True)
+            lines.append((start_x, start_y, LINE_OVERLAP.NONE))
 
             error = delta_2x - delta_y
             for i in range(thickness, 1, -1):
-                start.y += step_y
-                end.y += step_y
+                start_y += step_y
                 overlap = LINE_OVERLAP.NONE
                 if (error >= 0):
-                    start.x += step_x
-                    end.x += step_x
+                    start_x += step_x
                     error -= delta_2y
                     overlap = LINE_OVERLAP.MAJOR
                 error += delta_2x
+                lines.append((start_x, start_y, overlap))
 
-                self.segment(
-                    start, end, overlap=overlap, _is_computing_thickness=True)
-
-        return self.points_thick
+        patterns = {}
+        for _, _, overlap in lines:
+            if overlap not in patterns:
+                patterns[overlap] = self._pattern(
+                    self.end.x - self.start.x, self.end.y - self.start.y, overlap)
+        return np.concatenate([patterns[overlap] + np.array((x, y), dtype=np.int32) for x, y, overlap in lines])
 
     def perpendicular(self, distance: int) -> List[Point2D]:
         """Compute perpendicular points from both side of the segment placed at start level.
@@ -240,8 +261,9 @@ class Segment2D:
                 np.round((self.start.y + self.end.y) / 2.0).astype(int),
                 )
 
-    def _add_points(self, points, is_computing_thickness):
+    def _add_points(self, points: np.ndarray, is_computing_thickness: bool):
+        points = [Point2D(x, y) for x, y in points.tolist()]
         if is_computing_thickness:
-            self.points_thick.append(points.copy())
+            self.points_thick.extend(points)
         else:
-            self.points.append(points.copy())
+            self.points.extend(points)
@@ -1,6 +1,10 @@
 from typing import List
+
+import numpy as np
+
 from Enums import LINE_OVERLAP
 from networks.geometry.Point3D import Point3D
+import networks.geometry.segment_tools as segment_tools
 
 
 class Segment3D:
@@ -16,97 +20,35 @@ class Segment3D:
         """Calculate a segment between two points in 3D space. 3d Bresenham algorithm.
 
         From: https://www.geeksforgeeks.org/bresenhams-algorithm-for-3-d-line-drawing/
+        Points are computed by segment_array, then appended to self.output_points.
 
         Args:
             overlap (bool, optional): If False, remove unnecessary points connecting to other points side by side, leaving only a diagonal connection. Defaults to False.
 
         >>> Segment3D(Point3D(0, 0, 0), Point3D(10, 10, 15))
         """
-        start = self.start.copy()
-        end = self.end.copy()
-        self.output_points.append(start.copy())
-        dx = abs(self.end.x - self.start.x)
-        dy = abs(self.end.y - self.start.y)
-        dz = abs(self.end.z - self.start.z)
-        if end.x > start.x:
-            xs = 1
-        else:
-            xs = -1
-        if end.y > start.y:
-            ys = 1
-        else:
-            ys = -1
-        if end.z > start.z:
-            zs = 1
-        else:
-            zs = -1
+        self.output_points.extend(
+            Point3D(x, y, z) for x, y, z in self.segment_array(overlap).tolist())
+        return self.output_points
 
-        # Driving axis is X-axis
-        if dx >= dy and dx >= dz:
-            p1 = 2 * dy - dx
-            p2 = 2 * dz - dx
-            while start.x != end.x:
-                start.x += xs
-                self.output_points.append(start.copy())
-                if p1 >= 0:
-                    start.y += ys
-                    if not overlap:
-                        if self.output_points[-1].y != start.y:
-                            self.output_points.append(start.copy())
-                    p1 -= 2 * dx
-                if p2 >= 0:
-                    start.z += zs
-                    if not overlap:
-                        if self.output_points[-1].z != start.z:
-                            self.output_points.append(start.copy())
-                    p2 -= 2 * dx
-                p1 += 2 * dy
-                p2 += 2 * dz
+    def segment_array(self, overlap: bool = False) -> np.ndarray:
+        """Calculate a segment between two points in 3D space at once with numpy. 3d Bresenham algorithm.
 
-        # Driving axis is Y-axis
-        elif dy >= dx and dy >= dz:
-            p1 = 2 * dx - dy
-            p2 = 2 * dz - dy
-            while start.y != end.y:
-                start.y += ys
-                self.output_points.append(start.copy())
-                if p1 >= 0:
-                    start.x += xs
-                    if not overlap:
-                        if self.output_points[-1].x != start.x:
-                            self.output_points.append(start.copy())
-                    p1 -= 2 * dy
-                if p2 >= 0:
-                    start.z += zs
-                    if not overlap:
-                        if self.output_points[-1].z != start.z:
-                            self.output_points.append(start.copy())
-                    p2 -= 2 * dy
-                p1 += 2 * dx
-                p2 += 2 * dz
+        Computed by segment_tools.discrete_segment.
 
-        # Driving axis is Z-axis
-        else:
-            p1 = 2 * dy - dz
-            p2 = 2 * dx - dz
-            while start.z != end.z:
-                start.z += zs
-                self.output_points.append(start.copy())
-                if p1 >= 0:
-                    start.y += ys
-                    if not overlap:
-                        if self.output_points[-1].y != start.y:
-                            self.output_points.append(start.copy())
-                    p1 -= 2 * dz
-                if p2 >= 0:
-                    start.x += xs
-                    if not overlap:
-                        if self.output_points[-1].x != start.x:
-                            self.output_points.append(start.copy())
-                    p2 -= 2 * dz
-                p1 += 2 * dy
-                p2 += 2 * dx
-        return self.output_points
+        Args:
+            overlap (bool, optional): If False, remove unnecessary points connecting to other points side by side, leaving only a diagonal connection. Defaults to False.
+
+        Returns:
+            np.ndarray: Coordinates (N, 3) of the points, in drawing order.
+
+        >>> Segment3D(Point3D(0, 0, 0), Point3D(2, 1, 0)).segment_array()
+        array([[0, 0, 0],
+               [1, 0, 0],
+               [1, 1, 0],
+               [2, 1, 0]], dtype=int32)
+        """
+        return segment_tools.discrete_segment(self.start.coordinates, self.end.coordinates, pixel_perfect=overlap)
 
     def middle_point(self):
         return (np.round((self.start.x + self.end.x) / 2.0).astype(int),
@@ -1,5 +1,4 @@
 import networks.geometry.curve_tools as curve_tools
-import networks.geometry.segment_tools as segment_tools
 import numpy as np
 
 
@@ -17,36 +16,89 @@ class Strip:
         self.curvature = curve_tools.curvature(self.curve)
 
     def compute_surface_perpendicular(self, width, normals):
+        """Compute the surface of the strip, quad by quad between the perpendiculars of two consecutive curve points.
+
+        Args:
+            width (int): Width of the strip, centered on the curve.
+            normals (np.array): (N, 3) normal of the surface at each point of the curve.
+
+        Returns:
+            np.array: (M, 3) coordinates of the surface, without duplicates, quad after quad.
+        """
         self.offset_left = curve_tools.offset(self.curve, width/2, normals)
         self.offset_right = curve_tools.offset(self.curve, -width/2, normals)
-        self.perpendicular_segment = []
-
-        for i in range(len(self.offset_left)):
-            self.perpendicular_segment.append(segment_tools.discrete_segment(
-                self.offset_left[i], self.offset_right[i], pixel_perfect=False))
-
-        self.surface = []
-
-        for i in range(len(self.perpendicular_segment)-1):
-            self.surface.append([])
-            for j in range(len(self.perpendicular_segment[i])):
-                # Hypothesis
-                max_length_index = i
-                min_length_index = i+1
-                proportion = len(
-                    self.perpendicular_segment[min_length_index])/len(self.perpendicular_segment[max_length_index])
-
-                # Reverse order if wrong hypothesis
-                if proportion > 1:
-                    max_length_index = i+1
-                    min_length_index = i
-                    proportion = len(
-                        self.perpendicular_segment[min_length_index])/len(self.perpendicular_segment[max_length_index])
-
-                self.surface[i].append([])
-                for k in range(len(self.perpendicular_segment[max_length_index])-1):
-                    self.surface[i][j].append(segment_tools.discrete_segment(
-                        self.perpendicular_segment[max_length_index][k], self.perpendicular_segment[min_length_index][round(k * proportion)], pixel_perfect=False))
+
+        quads = np.stack((self.offset_left[:-1], self.offset_right[:-1],
+                          self.offset_right[1:], self.offset_left[1:]), axis=1)
+        self.surface = self.fill_quads(quads)
+        return self.surface
+
+    @staticmethod
+    def fill_quads(quads):
+        """Rasterize quads in the x, z plane with a scanline fill, the height being interpolated along the edges then along each row.
+
+        All the rows of all the quads are filled at once: each row is cut by the edges of its quad, and the cells between the first and the last cut are filled. Concave quads are filled up to their hull.
+
+        Args:
+            quads (np.array): (Q, 4, 3) corners (x, y, z) of each quad, in order around it.
+
+        Returns:
+            np.array: (M, 3) coordinates of the filled cells, without duplicates. A cell shared by several quads keeps the first height.
+
+        >>> Strip.fill_quads(np.array([[(0, 0, 0), (2, 0, 0), (2, 2, 2), (0, 2, 2)]]))
+        array([[0, 0, 0],
+               [1, 0, 0],
+               [2, 0, 0],
+               [0, 1, 1],
+               [1, 1, 1],
+               [2, 1, 1],
+               [0, 2, 2],
+               [1, 2, 2],
+               [2, 2, 2]])
+        """
+        quads = np.asarray(quads, dtype=float).reshape(-1, 4, 3)
+        if len(quads) == 0:
+            return np.empty((0, 3), dtype=int)
+
+        # One scanline per z of each quad.
+        z_min = np.round(quads[:, :, 2].min(axis=1)).astype(int)
+        z_max = np.round(quads[:, :, 2].max(axis=1)).astype(int)
+        row_counts = z_max - z_min + 1
+        row_quads = np.repeat(np.arange(len(quads)), row_counts)
+        zs = np.repeat(z_min - np.cumsum(row_counts) + row_counts, row_counts) + \
+            np.arange(row_counts.sum())
+
+        # Cut of each row by the 4 edges of its quad. Edges along the row cut it at both ends.
+        starts = quads[row_quads]
+        ends = np.roll(quads, -1, axis=1)[row_quads]
+        dz = ends[:, :, 2] - starts[:, :, 2]
+        flat = dz == 0
+        t = np.where(flat, 0, (zs[:, None] - starts[:, :, 2]) / np.where(flat, 1, dz))
+        cut = np.where(flat, np.abs(zs[:, None] - starts[:, :, 2]) <= 0.5, (t >= 0) & (t <= 1))
+        cuts = np.concatenate((starts + t[:, :, None] * (ends - starts), np.where(flat[:, :, None], ends, starts)), axis=1)
+        cut = np.concatenate((cut, cut & flat), axis=1)
+
+        x = np.where(cut, cuts[:, :, 0], np.inf)
+        left = np.argmin(x, axis=1)
+        right = np.argmax(np.where(cut, cuts[:, :, 0], -np.inf), axis=1)
+        rows = np.arange(len(zs))
+        valid = cut.any(axis=1)
+        x_left, y_left = cuts[rows, left, 0], cuts[rows, left, 1]
+        x_right, y_right = cuts[rows, right, 0], cuts[rows, right, 1]
+
+        # Cells of each row, the height going linearly from the left cut to the right cut.
+        first = np.round(x_left).astype(int)
+        counts = np.where(valid, np.round(x_right).astype(int) - first + 1, 0)
+        cell_rows = np.repeat(rows, counts)
+        xs = np.repeat(first - np.cumsum(counts) + counts, counts) + \
+            np.arange(counts.sum())
+        span = (x_right - x_left)[cell_rows]
+        ratio = np.where(span > 0, (xs - x_left[cell_rows]) / np.where(span > 0, span, 1), 0)
+        ys = np.round(y_left[cell_rows] + np.clip(ratio, 0, 1) * (y_right - y_left)[cell_rows]).astype(int)
+
+        surface = np.stack((xs, ys, zs[cell_rows]), axis=1)
+        _, first_cells = np.unique(surface[:, [0, 2]], axis=0, return_index=True)
+        return surface[np.sort(first_cells)]
 
     def compute_surface_parallel(self, inner_range, outer_range, resolution, normals):
         self.left_side = []
@@ -1,18 +1,17 @@
 import numpy as np
 import networks.geometry.segment_tools as segment_tools
-from scipy import interpolate
-from math import sqrt
 
 
 def curve(target_points, resolution=40):
     """
-    Returns a list of spaced points that approximate a smooth curve following target_points.
+    Returns an array (resolution, 3) of spaced points that approximate a smooth curve following target_points.
 
     https://stackoverflow.com/questions/18962175/spline-interpolation-coefficients-of-a-line-curve-in-3d-space
     """
+    from scipy import interpolate
+
     # Remove duplicates. Curve can't intersect itself
-    points = tuple(map(tuple, np.array(target_points)))
-    points = sorted(set(points), key=points.index)
+    points = list(dict.fromkeys(map(tuple, np.array(target_points))))
 
     # Change coordinates structure to (x1, x2, x3, ...), (y1, y2, y3, ...) (z1, z2, z3, ...)
     coords = np.array(points, dtype=np.float32)
@@ -22,16 +21,10 @@ def curve(target_points, resolution=40):
 
     # Compute
     tck, u = interpolate.splprep([x, y, z], s=3, k=2)
-    x_knots, y_knots, z_knots = interpolate.splev(tck[0], tck)
     u_fine = np.linspace(0, 1, resolution)
     x_fine, y_fine, z_fine = interpolate.splev(u_fine, tck)
 
-    x_rounded = np.round(x_fine).astype(int)
-    y_rounded = np.round(y_fine).astype(int)
-    z_rounded = np.round(z_fine).astype(int)
-
-    return [(x, y, z) for x, y, z in zip(
-        x_rounded, y_rounded, z_rounded)]
+    return np.round(np.stack((x_fine, y_fine, z_fine), axis=1)).astype(int)
 
 
 def curvature(curve):
@@ -50,61 +43,67 @@ def curvature(curve):
     [ 0.70710678 0. -0.70710678]
     [ 0.38268343 0. -0.92387953]]
     """
-    curve_points = np.array(curve)
-    dx_dt = np.gradient(curve_points[:, 0])
-    dy_dt = np.gradient(curve_points[:, 1])
-    dz_dt = np.gradient(curve_points[:, 2])
-    velocity = np.array([[dx_dt[i], dy_dt[i], dz_dt[i]]
-                        for i in range(dx_dt.size)])
-
-    ds_dt = np.sqrt(dx_dt * dx_dt + dy_dt * dy_dt + dz_dt * dz_dt)
-
-    tangent = np.array([1/ds_dt]).transpose() * velocity
-    tangent_x = tangent[:, 0]
-    tangent_y = tangent[:, 1]
-    tangent_z = tangent[:, 2]
-
-    deriv_tangent_x = np.gradient(tangent_x)
-    deriv_tangent_y = np.gradient(tangent_y)
-    deriv_tangent_z = np.gradient(tangent_z)
-
-    dT_dt = np.array([[deriv_tangent_x[i], deriv_tangent_y[i], deriv_tangent_z[i]]
-                     for i in range(deriv_tangent_x.size)])
-    length_dT_dt = np.sqrt(
-        deriv_tangent_x * deriv_tangent_x + deriv_tangent_y * deriv_tangent_y + deriv_tangent_z * deriv_tangent_z + 0.0001)
-
-    normal = np.array([1/length_dT_dt]).transpose() * dT_dt
+    velocity = np.gradient(np.array(curve), axis=0)
+    ds_dt = np.sqrt(np.sum(velocity * velocity, axis=1))
+    tangent = (1 / ds_dt)[:, None] * velocity
+
+    dT_dt = np.gradient(tangent, axis=0)
+    length_dT_dt = np.sqrt(np.sum(dT_dt * dT_dt, axis=1) + 0.0001)
+
+    normal = (1 / length_dT_dt)[:, None] * dT_dt
     return normal
 
 
 def offset(curve, distance, normals):
+    """Get the curve moved sideways at a distance, every segment being moved along its own orthogonal at once.
+
+    Args:
+        curve (np.array): (N, 3) points of the curve.
+        distance (int): distance from the curve. Positive direction means left.
+        normals (np.array): (N, 3) normal of the surface at each point of the curve, only the first N - 1 are used.
+
+    Raises:
+        ValueError: if the number of normals and points do not match, or if a segment and its normal are not linearly independent.
+
+    Returns:
+        np.array: (N, 3) points of the offset curve. Inner points are the middle of the two offset segments joining there.
+
+    >>> offset(np.array([(0, 0, 0), (0, 0, 10), (0, 0, 20)]), 5, [(0, 1, 0)] * 3)
+    array([[-5,  0,  0],
+           [-5,  0, 10],
+           [-5,  0, 20]])
+    """
     if len(normals) != len(curve):
         raise ValueError(
             'Number of normals and number of points in the curve do not match')
 
     # Offsetting
-    offset_segments = [segment_tools.parallel(
-        (curve[i], curve[i+1]), distance, normals[i]) for i in range(len(curve) - 1)]
+    curve = np.asarray(curve, dtype=float)
+    directions = segment_tools.normalized(curve[1:] - curve[:-1])
+    orthogonals = np.cross(
+        directions, segment_tools.normalized(np.asarray(normals)[:-1]))
+    if np.any(np.all(orthogonals == 0, axis=1)):
+        raise ValueError("The input vectors are not linearly independent.")
+    starts = (orthogonals * distance + curve[:-1]).astype(int)
+    ends = (orthogonals * distance + curve[1:]).astype(int)
 
     # Combining segments
-    combined_curve = []
-    combined_curve.append(np.round(offset_segments[0][0]).tolist())
-    for i in range(0, len(offset_segments)-1):
-        combined_curve.append(segment_tools.middle_point(
-            offset_segments[i][1], offset_segments[i+1][0]))
-    combined_curve.append(np.round(offset_segments[-1][1]).tolist())
-
+    combined_curve = np.empty((len(curve), 3), dtype=int)
+    combined_curve[0] = starts[0]
+    combined_curve[1:-1] = segment_tools.middle_point(ends[:-1], starts[1:])
+    combined_curve[-1] = ends[-1]
     return combined_curve
 
 
 def resolution_distance(target_points, spacing_distance):
-    length = 0
-    for i in range(len(target_points) - 1):
-        length += sqrt(
-            ((target_points[i][0] - target_points[i + 1][0]) ** 2)
-            + ((target_points[i][1] - target_points[i + 1][1]) ** 2)
-            + ((target_points[i][2] - target_points[i + 1][2]) ** 2)
-        )
+    """Get the number of points to place along target_points every spacing_distance, and the length of the path.
+
+    >>> resolution_distance([(0, 0, 0), (0, 0, 10), (0, 30, 50)], 10)
+    (6, 60.0)
+    """
+    lengths = segment_tools.get_distance(
+        np.asarray(target_points)[:-1], np.asarray(target_points)[1:])
+    length = sum(lengths.tolist(), 0)
     return round(length / spacing_distance), length
 
 
@@ -113,15 +112,11 @@ def simplify_segments(points, epsilon):
         return points
 
     # Find the point with the maximum distance
-    max_distance = 0
-    max_index = 0
     end_index = len(points) - 1
-
-    for i in range(1, end_index):
-        distance = get_distance(points[i], points[0])
-        if distance > max_distance:
-            max_distance = distance
-            max_index = i
+    distances = segment_tools.get_distance(
+        np.asarray(points[1:end_index]), np.asarray(points[0]))
+    max_index = int(np.argmax(distances)) + 1
+    max_distance = distances[max_index - 1]
 
     simplified_points = []
 
@@ -1,5 +1,6 @@
 from math import sqrt, cos, pi, sin
 import numpy as np
+from scipy.spatial import cKDTree
 
 
 def segments_intersection(line0, line1, full_line=True):
@@ -317,3 +318,88 @@ def curved_corner_by_curvature(
     distance_from_intersection = round(distance(start_curve_point, center))
     return curve_corner_points, center, distance_from_intersection, parallel(
         (xyz0, intersection), -curvature_radius), parallel((xyz1, intersection), curvature_radius)
+
+
+# Below this number of points, nearest_neighbor_order scans the points instead of building a KD-tree.
+SMALL_PATH_SIZE = 128
+
+
+def nearest_neighbor_order(coordinates, start=0):
+    """
+    Order points by walking from the start to the nearest point not visited yet, like the greedy optimized_path,
+    but with a KD-tree instead of a scan of the remaining points at each step.
+
+    Distances are computed like Point2D.distance, and when several points are at the same distance, the first one
+    in the input is taken, so the order is exactly the one of the greedy walk.
+
+    Args:
+        coordinates (np.ndarray): Coordinates of the points (N, 2) or (N, 3).
+        start (int, optional): Index of the first point. Defaults to 0.
+
+    Returns:
+        list: Indices of the points in walking order, starting with start.
+
+    >>> nearest_neighbor_order(np.array([(0, 0), (10, 5), (1, 3), (-2, -5)]), 3)
+    [3, 0, 2, 1]
+    """
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    count = len(coordinates)
+    if count == 0:
+        return []
+    remaining = np.ones(count, dtype=bool)
+    remaining[start] = False
+    order = [start]
+    current = start
+
+    if count <= SMALL_PATH_SIZE:
+        # A scan of all the points is cheaper than the queries for short paths.
+        for _ in range(count - 1):
+            delta = coordinates - coordinates[current]
+            distances = np.sqrt(np.sum(delta ** 2, axis=1))
+            distances[~remaining] = np.inf
+            current = int(np.argmin(distances))
+            remaining[current] = False
+            order.append(current)
+        return order
+
+    tree = cKDTree(coordinates)
+    k = min(8, count)
+    for _ in range(count - 1):
+        while True:
+            distances, candidates = tree.query(coordinates[current], k=k)
+            distances, candidates = np.atleast_1d(distances), np.atleast_1d(candidates)
+            candidates = candidates[remaining[candidates]]
+            if len(candidates):
+                delta = coordinates[candidates] - coordinates[current]
+                exact = np.sqrt(np.sum(delta ** 2, axis=1))
+                shortest = exact.min()
+                # Every point at the shortest distance was fetched if a farther point was fetched too.
+                if k == count or distances[-1] > shortest * (1 + 1e-9) + 1e-9:
+                    break
+            k = min(2 * k, count)
+        current = int(candidates[exact == shortest].min())
+        remaining[current] = False
+        order.append(current)
+        k = max(min(8, count), k // 2)
+    return order
+
+
+def optimized_path(points, start):
+    """
+    Get an ordered path of points starting from start, each point being followed by the nearest remaining one.
+
+    Args:
+        points (list): Coordinates of the points. Could contain start.
+        start (tuple): Coordinates of the first point.
+
+    Returns:
+        list: Ordered points, starting with start.
+
+    >>> optimized_path([(0, 0), (10, 5), (1, 3)], (-2, -5))
+    [(-2, -5), (0, 0), (1, 3), (10, 5)]
+    """
+    points = [tuple(point) for point in points]
+    start = tuple(start)
+    if start not in points:
+        points.append(start)
+    return [points[i] for i in nearest_neighbor_order(points, points.index(start))]
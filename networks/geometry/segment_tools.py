@@ -18,12 +18,15 @@ def parallel(segment, distance, normal=np.array([0, 1, 0])):
 
 
 def normalized(vector):
-    magnitude = np.linalg.norm(vector)
-    if magnitude != 0:
-        normalized_vector = vector / magnitude
-        return normalized_vector
-    else:
-        return [0, 0, 0]
+    """Get the unit vector of a vector, or of each vector along the last axis of an array. Null vectors stay null.
+
+    >>> normalized(np.array([[3, 0, 4], [0, 0, 0]]))
+    array([[0.6, 0. , 0.8],
+           [0. , 0. , 0. ]])
+    """
+    vector = np.asarray(vector, dtype=float)
+    magnitude = np.linalg.norm(vector, axis=-1, keepdims=True)
+    return np.divide(vector, magnitude, out=np.zeros_like(vector), where=magnitude != 0)
 
 
 def orthogonal(origin, point, distance, normal=np.array([0, 1, 0])):
@@ -54,3 +57,98 @@ def orthogonal(origin, point, distance, normal=np.array([0, 1, 0])):
 
     orthogonal = np.add(np.multiply(orthogonal, distance), origin).astype(int)
     return orthogonal
+
+
+def bresenham_steps(delta_major, delta_minor):
+    """Get the minor coordinate of each point of a Bresenham line, relative to its start, without walking the line.
+
+    The line moves on the minor axis as soon as the error reaches half a pixel, so the minor coordinate of the point i is floor((2 * delta_minor * i + delta_major) / (2 * delta_major)).
+
+    Args:
+        delta_major (int): Length of the line on its major axis, positive.
+        delta_minor (int): Length of the line on its minor axis, positive and not greater than delta_major.
+
+    Returns:
+        np.array: Minor coordinates of the delta_major + 1 points of the line.
+
+    >>> bresenham_steps(5, 2)
+    array([0, 0, 1, 1, 2, 2], dtype=int32)
+    """
+    if delta_major == 0:
+        return np.zeros(1, dtype=np.int32)
+    steps = np.arange(delta_major + 1, dtype=np.int64)
+    return ((2 * delta_minor * steps + delta_major) // (2 * delta_major)).astype(np.int32)
+
+
+def discrete_segment(start, end, pixel_perfect=True):
+    """Get the blocks of a segment between two points in 3D space, with the 3d Bresenham algorithm computed at once.
+
+    From: https://www.geeksforgeeks.org/bresenhams-algorithm-for-3-d-line-drawing/
+
+    Args:
+        start (tuple or np.array): (x y z) start of the segment, rounded.
+        end (tuple or np.array): (x y z) end of the segment, rounded.
+        pixel_perfect (bool, optional): Blocks are placed diagonally, not side by side, if True. Defaults to True.
+
+    Returns:
+        np.array: (N, 3) coordinates of the blocks, in order from start.
+
+    >>> discrete_segment((0, 0, 0), (2, 1, 0), pixel_perfect=False)
+    array([[0, 0, 0],
+           [1, 0, 0],
+           [1, 1, 0],
+           [2, 1, 0]], dtype=int32)
+    """
+    start = np.round(start).astype(np.int32)
+    delta = np.round(end).astype(np.int32) - start
+    steps = np.where(delta > 0, 1, -1).astype(np.int32)
+    dx, dy, dz = np.abs(delta).tolist()
+
+    # Driving axis, then the other axes in the order they move within a step.
+    if dx >= dy and dx >= dz:
+        axes = (0, 1, 2)
+    elif dy >= dx and dy >= dz:
+        axes = (1, 0, 2)
+    else:
+        axes = (2, 1, 0)
+    driving, first, second = axes
+    length = (dx, dy, dz)[driving]
+
+    points = np.empty((length + 1, 3), dtype=np.int32)
+    points[:, driving] = np.arange(length + 1)
+    points[:, first] = bresenham_steps(length, (dx, dy, dz)[first])
+    points[:, second] = bresenham_steps(length, (dx, dy, dz)[second])
+
+    # Each step draws its point before the moves on the other axes, then one point after each move if not pixel perfect.
+    rows = np.empty((length, 3, 3), dtype=np.int32)
+    rows[:, 0] = points[:-1]
+    rows[:, 0, driving] = points[1:, driving]
+    drawn = np.zeros((length, 3), dtype=bool)
+    drawn[:, 0] = True
+    if not pixel_perfect:
+        rows[:, 1] = rows[:, 0]
+        rows[:, 1, first] = points[1:, first]
+        rows[:, 2] = points[1:]
+        drawn[:, 1] = points[1:, first] != points[:-1, first]
+        drawn[:, 2] = points[1:, second] != points[:-1, second]
+    points = np.concatenate((points[:1], rows[drawn]))
+    return points * steps + start
+
+
+def middle_point(start, end):
+    """Get the rounded middle of two points, or of each pair of points of two arrays.
+
+    >>> middle_point((0, 0, 0), (3, 2, 10))
+    array([2, 1, 5])
+    """
+    return np.round((np.asarray(start) + np.asarray(end)) / 2).astype(int)
+
+
+def get_distance(start, end):
+    """Get the distance between two points, or between each pair of points of two arrays.
+
+    >>> get_distance((0, 0, 0), (2, 3, 6))
+    7.0
+    """
+    delta = np.asarray(end, dtype=float) - np.asarray(start, dtype=float)
+    return np.sqrt(np.sum(delta ** 2, axis=-1))
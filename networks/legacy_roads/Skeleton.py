@@ -1,7 +1,4 @@
 import numpy as np
-import skan
-from skimage.morphology import skeletonize
-from skan.csr import skeleton_to_csgraph
 from collections import Counter
 from PIL import Image
 import random
@@ -18,6 +15,9 @@ class Skeleton:
         self.coordinates = []
 
     def setSkeleton(self, data):
+        from skan.csr import skeleton_to_csgraph
+        from skimage.morphology import skeletonize
+
         binary_skeleton = skeletonize(data)
 
         graph, coordinates = skeleton_to_csgraph(binary_skeleton)
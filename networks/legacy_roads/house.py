@@ -1,10 +1,11 @@
 from gdpc import *
 import networks.legacy_roads.list_block
+from placement.PlacementSink import get_placement_sink
 from random import randint
 
 
 def delete(co1,co2):
-    editor = Editor(buffering=  True) 
+    editor = get_placement_sink()
     x=abs((co2[0])-(co1[0]))
     z=abs((co2[2])-(co1[2]))
     y= abs(co2[1]-co1[1])
@@ -48,7 +49,7 @@ def mur_sol(co1,co2,block):
         
         tailleZ=co2[2]-co1[2]
         midtailleZ=(tailleZ//2)+z1
-    editor = Editor(buffering=  True) 
+    editor = get_placement_sink()
     
     if y1==y2:
         
@@ -103,7 +104,7 @@ def mur_sol(co1,co2,block):
     
 def poserEscalier(co1,co2,type):
     
-    editor = Editor(buffering=  True) 
+    editor = get_placement_sink()
     x1=co1[0]
     y1=co1[1]
     z1=co1[2]
@@ -154,7 +155,7 @@ def poserEscalier(co1,co2,type):
    
                 
 def poserPorte(co,type):
-    editor = Editor(buffering=  True) 
+    editor = get_placement_sink()
     editor.placeBlock((co[0],co[1],co[2]),type)
     
     
@@ -180,7 +181,7 @@ def poserToit(co1,co2,hauteurMax,cotegarage,style,direction):
     mur=Block(style['mur'])
     
     
-    editor = Editor(buffering=  True) 
+    editor = get_placement_sink()
     if  x1<0 or x2<0:
         if  x1<0 and x2>=0:
             tailleX=x2-x1
@@ -1166,7 +1167,7 @@ def poserToit(co1,co2,hauteurMax,cotegarage,style,direction):
                                 editor.placeBlock((x1-1,y1+4+i,z1+i),toit_esca_droite_ret)
                 
 def poserFenetre(co1,co2,type):
-    editor = Editor(buffering=  True) 
+    editor = get_placement_sink()
     
     x=abs((co2[0])-(co1[0]))
     z=abs((co2[2])-(co1[2]))
@@ -1247,7 +1248,7 @@ def poserGarage(co1,co2):
     x2=co2[0]
     y2=co2[1]
     z2=co2[2]
-    editor = Editor(buffering=  True) 
+    editor = get_placement_sink()
     if  x1<0 or x2<0:
         if  x1<0 and x2>=0:
             x=x2-x1
@@ -1409,7 +1410,7 @@ def house(co1,co2,cotegarage,hauteurMax,nb_style,direction):# ,etage):
     hauteurMin=min(co2[1],co1[1])
     tailleZ=abs(co2[2])-abs(co1[2])
     
-    editor = Editor(buffering=  True) 
+    editor = get_placement_sink()
     
     
     
@@ -1,9 +1,7 @@
 from math import sqrt
 from math import pi
 from math import cos, sin
-import matplotlib.pyplot as plt
 import numpy as np
-from scipy import interpolate
 
 
 def line(xyz1, xyz2, pixelPerfect=True):
@@ -182,6 +180,8 @@ def curve(points, number_true_pts=40, debug=False):
     Returns:
         tuple: Tuple of list of each coordinate.
     """
+    from scipy import interpolate
+
     # Remove duplicates.
     points = tuple(map(tuple, points))
     points = sorted(set(points), key=points.index)
@@ -205,6 +205,8 @@ def curve(points, number_true_pts=40, debug=False):
     x_fine, y_fine, z_fine = interpolate.splev(u_fine, tck)
 
     if debug:
+        import matplotlib.pyplot as plt
+
         fig2 = plt.figure(2)
         ax3d = fig2.add_subplot(111, projection="3d")
         ax3d.plot(x_sample, y_sample, z_sample, "r*")
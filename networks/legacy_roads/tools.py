@@ -1,15 +1,14 @@
 from gdpc import Block as place
-from gdpc import Editor
 import networks.legacy_roads.maths as maths
+from placement.PlacementSink import get_placement_sink
 
 
 USE_BATCHING = True
-editor = Editor(buffering=True, caching=True, multithreading=True)
 
 
 def setBlock(block, xyz):
     x, y, z = xyz
-    editor.placeBlock((x, y, z), place(block))
+    get_placement_sink().placeBlock((x, y, z), place(block))
 
 
 def getBlock(xyz):
@@ -31,7 +30,7 @@ def fillBlock(block, xyz):
             for k in range(min(xyz[2], xyz[5]), max(xyz[2], xyz[5])+1):
                 coordinates.append((i, j, k))
 
-    editor.placeBlock(coordinates, place(block))
+    get_placement_sink().placeBlock(coordinates, place(block))
 
 
 def setLine(block, xyz0, xyz1, pixelPerfect=True):
@@ -1,11 +1,13 @@
 import networks.geometry.curve_tools as curve_tools
+import networks.geometry.segment_tools as segment_tools
 import networks.geometry.Strip as Strip
 import networks.roads.lanes.Lane as Lane
 import networks.roads.lines.Line as Line
-import json
-import random
+import numpy as np
 
 from gdpc import Editor, Block, geometry
+from placement.PlacementSink import get_placement_sink
+from utils.sampling import load_compiled_json
 
 
 class Road:
@@ -15,7 +17,7 @@ class Road:
         self.width = 10  # TODO
 
     def place_roads(self):
-        editor = Editor(buffering=True)
+        editor = get_placement_sink()
 
         self.resolution, self.distance = curve_tools.resolution_distance(
             self.coordinates, 12)
@@ -29,58 +31,50 @@ class Road:
         for i in range(len(self.curve_surface.curvature)):
             self.curvature.append((0, 1, 0))
 
-        with open('networks/roads/lanes/lanes.json') as lanes_materials:
-            lane_type = json.load(lanes_materials).get('classic_lane')
+        lane_type = load_compiled_json('networks/roads/lanes/lanes.json').get('classic_lane')
 
         # for coordinate, block in surface:
         #     editor.placeBlock(coordinate, Block(block))
 
-        with open('networks/roads/lines/lines.json') as lines_materials:
-            line_type = json.load(lines_materials).get('solid_white')
-        with open('networks/roads/lines/lines.json') as lines_materials:
-            middle_line_type = json.load(lines_materials).get('broken_white')
+        line_type = load_compiled_json('networks/roads/lines/lines.json').get('solid_white')
+        middle_line_type = load_compiled_json('networks/roads/lines/lines.json').get('broken_white')
 
         print(line_type, lane_type)
 
         # for coordinate, block in surface:
         #     editor.placeBlock(coordinate, Block(block))
 
-        lines_coordinates = []
-        middle_lines_coordinates = []
-
         # Perpendicular
-        self.curve_surface.compute_surface_perpendicular(10, self.curvature)
-        for i in range(len(self.curve_surface.surface)):
-            for j in range(len(self.curve_surface.surface[i])):
-                for k in range(len(self.curve_surface.surface[i][j])):
-                    for l in range(len(self.curve_surface.surface[i][j][k])):
-                        editor.placeBlock(
-                            self.curve_surface.surface[i][j][k][l], Block(random.choices(
-                                list(lane_type.keys()),
-                                weights=lane_type.values(),
-                                k=1,)[0]))
-                        editor.placeBlock(
-                            (self.curve_surface.surface[i][j][k][l][0], self.curve_surface.surface[i][j][k][l][1]-1, self.curve_surface.surface[i][j][k][l][2]), Block(random.choices(
-                                list(lane_type.keys()),
-                                weights=lane_type.values(),
-                                k=1,)[0]))
-                    if k == 0 or k == len(self.curve_surface.surface[i][j])-1:
-                        lines_coordinates.extend(
-                            self.curve_surface.surface[i][j][k])
-                    if k == round((len(self.curve_surface.surface[i][j])-1)/2):
-                        middle_lines_coordinates.extend(
-                            self.curve_surface.surface[i][j][k])
-
-        line = Line.Line(lines_coordinates, line_type)
-        line.get_blocks()
-        middle_line = Line.Line(middle_lines_coordinates, middle_line_type)
-        middle_line.get_blocks()
-        for i in range(len(line.coordinates_with_blocks)):
-            editor.placeBlock(
-                line.coordinates_with_blocks[i][0], Block(line.coordinates_with_blocks[i][1]))
-        for i in range(len(middle_line.coordinates_with_blocks)):
-            editor.placeBlock(
-                middle_line.coordinates_with_blocks[i][0], Block(middle_line.coordinates_with_blocks[i][1]))
+        surface = self.curve_surface.compute_surface_perpendicular(
+            10, self.curvature)
+        surface = np.asarray(surface, dtype=np.int64).reshape(-1, 3)
+        # Each block of the surface, then the block under it, like when they were placed one by one.
+        surface_positions = np.stack(
+            (surface, surface - (0, 1, 0)), axis=1).reshape(-1, 3)
+        surface_ids = lane_type.sample_ids(len(surface_positions), editor.palette)
+
+        # Side lines follow the edges of the surface, the middle line follows the curve.
+        lines_coordinates = self._line_coordinates(
+            self.curve_surface.offset_left) + self._line_coordinates(self.curve_surface.offset_right)
+        middle_lines_coordinates = self._line_coordinates(
+            self.curve_surface.curve)
+
+        line_positions, line_ids = Line.Line(
+            lines_coordinates, line_type).get_block_ids(editor.palette)
+        middle_line_positions, middle_line_ids = Line.Line(
+            middle_lines_coordinates, middle_line_type).get_block_ids(editor.palette)
+
+        # One batch for the whole road: the lines are placed over the surface.
+        editor.place_ids(np.concatenate((surface_positions, line_positions, middle_line_positions)),
+                         np.concatenate((surface_ids, line_ids, middle_line_ids)))
+
+    @staticmethod
+    def _line_coordinates(points):
+        """Blocks of the discrete segments joining points, without repeating the joints."""
+        segments = [segment_tools.discrete_segment(points[i], points[i+1])[:-1]
+                    for i in range(len(points) - 1)]
+        segments.append(np.round(points[-1:]).astype(int))
+        return [tuple(point) for point in np.concatenate(segments).tolist()]
 
 # offset = curve.offset(curve_surface.curve, -9, curvature)
 # for i in range(len(offset)-1):
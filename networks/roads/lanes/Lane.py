@@ -1,17 +1,19 @@
 import networks.geometry.curve_tools as curve_tools
 import networks.geometry.Strip as Strip
 import networks.geometry.segment_tools as segment_tools
-import random
+import numpy as np
+
+from utils.sampling import compile_weights
 
 
 class Lane:
     def __init__(self, coordinates, lane_materials,  width):
         self.coordinates = coordinates
         self.width = width
-        self.lane_materials = lane_materials
+        self.lane_materials = compile_weights(lane_materials)
         self.surface = []
 
-    def get_surface(self):
+    def _compute_surface(self):
         resolution, distance = curve_tools.resolution_distance(
             self.coordinates, 6)
 
@@ -35,14 +37,26 @@ class Lane:
         #                 weights=self.lane_materials.values(),
         #                 k=1,)[0]))
 
-        curve_surface.compute_surface_perpendicular(self.width, normals)
-        for i in range(len(curve_surface.surface)):
-            for j in range(len(curve_surface.surface[i])):
-                for k in range(len(curve_surface.surface[i][j])):
-                    for l in range(len(curve_surface.surface[i][j][k])):
-                        self.surface.append((curve_surface.surface[i][j][k][l], random.choices(
-                            list(self.lane_materials.keys()),
-                            weights=self.lane_materials.values(),
-                            k=1,)[0]))
+        return np.asarray(curve_surface.compute_surface_perpendicular(
+            self.width, normals), dtype=np.int64).reshape(-1, 3)
+
+    def get_surface(self):
+        surface = self._compute_surface()
+        materials = self.lane_materials.sample_values(len(surface))
+        for coordinate, material in zip(surface.tolist(), materials):
+            self.surface.append((tuple(coordinate), material))
 
         return self.surface
+
+    def get_surface_ids(self, palette):
+        """
+        Draw the blocks of the lane as IDs in a palette, ready for a bulk placement.
+
+        Args:
+            palette (Palette): Palette the blocks are interned in, like the one of the placement sink.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Coordinates (N, 3) and palette ID of each block of the surface.
+        """
+        surface = self._compute_surface()
+        return surface, self.lane_materials.sample_ids(len(surface), palette)
@@ -1,35 +1,52 @@
 import networks.geometry.curve_tools as curve_tools
 import networks.geometry.segment_tools as segment_tools
-import random
+import numpy as np
+
+from utils.sampling import compile_weights
 
 
 class Line:
     def __init__(self, coordinates, line_materials):
         self.coordinates = coordinates  # Full lines coordinates, not just endpoints
-        self.line_materials = line_materials  # From lines.json
+        self.line_materials = compile_weights(line_materials)  # From lines.json
         self.coordinates_with_blocks = []  # Output
 
+    def _pattern_parts(self):
+        """Index in line_materials of the pattern part of each coordinate."""
+        pattern = np.repeat(np.arange(len(self.line_materials)),
+                            [length for _, length in self.line_materials])
+        return pattern[np.arange(len(self.coordinates)) % len(pattern)]
+
     def get_blocks(self):
-        pattern_length = 0
-        pattern_materials = []
-
-        # Create the pattern materials list with correct materials depending on the selected pattern.
-        for pattern in self.line_materials:
-            pattern_length += pattern[1]
-            for _ in range(pattern[1]):
-                pattern_materials.append(pattern[0])
-
-        pattern_iteration = 0
-        for coordinate in self.coordinates:
-            block = random.choices(
-                list(pattern_materials[pattern_iteration].keys()),
-                weights=pattern_materials[pattern_iteration].values(),
-                k=1)[0]
+        parts = self._pattern_parts()
+        blocks = np.empty(len(self.coordinates), dtype=object)
+        for i, (materials, _) in enumerate(self.line_materials):
+            selection = np.flatnonzero(parts == i)
+            blocks[selection] = np.array(materials.values, dtype=object)[materials.sample(len(selection))]
+
+        for coordinate, block in zip(self.coordinates, blocks.tolist()):
             if block != 'None':
                 self.coordinates_with_blocks.append((coordinate, block))
 
-            pattern_iteration += 1
-            if pattern_iteration >= pattern_length:
-                pattern_iteration = 0
-
         return self.coordinates_with_blocks
+
+    def get_block_ids(self, palette):
+        """
+        Draw the blocks of the line as IDs in a palette, ready for a bulk placement.
+
+        Args:
+            palette (Palette): Palette the blocks are interned in, like the one of the placement sink.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Coordinates (N, 3) and palette ID of each block, without the gaps of the
+                pattern.
+        """
+        coordinates = np.asarray(self.coordinates, dtype=np.int64).reshape(-1, 3)
+        parts = self._pattern_parts()
+        ids = np.empty(len(coordinates), dtype=np.int64)
+        for i, (materials, _) in enumerate(self.line_materials):
+            selection = np.flatnonzero(parts == i)
+            ids[selection] = materials.sample_ids(len(selection), palette)
+
+        kept = ids >= 0
+        return coordinates[kept], ids[kept]
@@ -1,5 +1,10 @@
 import json
+from math import floor
 from typing import List
+
+import numpy as np
+from scipy import ndimage
+
 from networks.geometry.Polyline import Polyline
 
 from networks.geometry.Point3D import Point3D
@@ -7,12 +12,25 @@ from networks.geometry.Point2D import Point2D
 from networks.geometry.Segment2D import Segment2D
 from networks.geometry.Segment3D import Segment3D
 from networks.geometry.Circle import Circle
-from Enums import LINE_THICKNESS_MODE
-from gdpc import Block, Editor
+from networks.geometry.CenterlineIndex import CenterlineIndex
+from Enums import LINE_THICKNESS_MODE, ROAD_SURFACE
+from gdpc import Editor
+from placement.Palette import get_palette
+from placement.PlacementSink import get_placement_sink
 
 
 class Road:
-    def __init__(self, coordinates: List[Point3D], width: int):
+    def __init__(self, coordinates: List[Point3D], width: int, editor: Editor = None, surface_mode: ROAD_SURFACE = ROAD_SURFACE.SEGMENTS):
+        """A road of constant width following coordinates, placed as soon as it is computed.
+
+        Args:
+            coordinates (List[Point3D]): Control points of the road, y being the height.
+            width (int): Width of the road.
+            editor (Editor, optional): Editor placing the blocks. Defaults to the shared placement sink.
+            surface_mode (ROAD_SURFACE, optional): SEGMENTS assembles thick segments and corner arcs, DISTANCE_FIELD rasterizes the whole surface at once from the distance to the centerline. Defaults to ROAD_SURFACE.SEGMENTS.
+        """
+        self.editor = editor
+        self.surface_mode = surface_mode
         self.coordinates = self._remove_collinear_points(coordinates)
         self.output_block = []
         # with open(road_configuration) as f:
@@ -32,9 +50,13 @@ class Road:
             self._projection_polyline()
 
         if len(self.coordinates) == 2:
-            self.segment_total_line_output = Segment2D(
-                Point3D.to_2d([self.coordinates[0]], 'y')[0], Point3D.to_2d([self.coordinates[1]], 'y')[0]).segment_thick(self.width, LINE_THICKNESS_MODE.MIDDLE)
-            self._projection_segment()
+            if self.surface_mode == ROAD_SURFACE.DISTANCE_FIELD:
+                self._surface_distance_field(
+                    Segment3D(self.coordinates[0], self.coordinates[1]).segment())
+            else:
+                self.segment_total_line_output = Segment2D(
+                    Point3D.to_2d([self.coordinates[0]], 'y')[0], Point3D.to_2d([self.coordinates[1]], 'y')[0]).segment_thick(self.width, LINE_THICKNESS_MODE.MIDDLE)
+                self._projection_segment()
             self.place()
 
     @staticmethod
@@ -54,37 +76,67 @@ class Road:
         return output_points
 
     def _surface(self):
+        # Nearest centerline point of the surface points, in x,z projection
+        self.centerline = CenterlineIndex(self.polyline_total_line_output, 'y')
+        heights = [point.y for point in self.polyline_total_line_output]
+        palette = get_palette()
+        stone, white_concrete = palette.intern("stone"), palette.intern("white_concrete")
+
         # Segments
 
         for i in range(1, len(self.polyline.segments)):
             if len(self.polyline.segments[i].segment()) > 2:
-                for j in range(len(self.polyline.segments[i].segment_thick(self.width, LINE_THICKNESS_MODE.MIDDLE))):
-                    # Get nearest in x,z projection
-                    nearest = self.polyline.segments[i].points_thick[j].nearest(
-                        Point3D.to_2d(self.polyline_total_line_output, removed_axis='y'), True)
+                points = self.polyline.segments[i].segment_thick_array(
+                    self.width, LINE_THICKNESS_MODE.MIDDLE)
+                for (x, z), nearest in zip(points.tolist(), self.centerline.nearest(points).tolist()):
                     self.output_block.append(
-                        (Point3D.insert_3d([self.polyline.segments[i].points_thick[j]], 'y', [self.polyline_total_line_output[nearest[0]].y])[0].coordinates, Block("stone")))
+                        ((x, heights[nearest], z), stone))
 
         for i in range(1, len(self.polyline.centers)-1):
             # Circle
 
-            circle = Circle(self.polyline.centers[i])
-            circle.circle_thick(int(
-                (self.polyline.radii[i]-self.width/2)), int((self.polyline.radii[i]+self.width/2)-1))
-
-            # Better to do here than drawing circle arc inside big triangle!
-            double_point_a = Point2D.from_arrays(Point2D.to_arrays(self.polyline.acrs_intersections[i][0]) + 5 * (Point2D.to_arrays(
-                self.polyline.acrs_intersections[i][0]) - Point2D.to_arrays(self.polyline.centers[i])))
-            double_point_b = Point2D.from_arrays(Point2D.to_arrays(self.polyline.acrs_intersections[i][2]) + 5 * (Point2D.to_arrays(
-                self.polyline.acrs_intersections[i][2]) - Point2D.to_arrays(self.polyline.centers[i])))
-
-            for j in range(len(circle.points_thick)):
-                if circle.points_thick[j].is_in_triangle(double_point_a, self.polyline.centers[i], double_point_b):
-                    nearest = circle.points_thick[j].nearest(
-                        Point3D.to_2d(self.polyline_total_line_output, removed_axis='y'), True)
-                    self.output_block.append(
-                        (Point3D.insert_3d([circle.points_thick[j]], 'y', [
-                            self.polyline_total_line_output[nearest[0]].y])[0].coordinates, Block("white_concrete")))
+            points = Circle(self.polyline.centers[i]).arc_thick_array(int(
+                (self.polyline.radii[i]-self.width/2)), int((self.polyline.radii[i]+self.width/2)-1),
+                self.polyline.acrs_intersections[i][0], self.polyline.acrs_intersections[i][2])
+            for (x, z), nearest in zip(points.tolist(), self.centerline.nearest(points).tolist()):
+                self.output_block.append(
+                    ((x, heights[nearest], z), white_concrete))
+
+    def _surface_distance_field(self, centerline: List[Point3D]):
+        """Rasterize the whole surface in one pass, from a distance transform of the centerline.
+
+        The centerline is drawn in a local grid around it. Every cell within width/2 of the centerline is placed at the height of its nearest centerline point, so the cost follows the area of the road, without seams or duplicates where segments and arcs join.
+
+        Args:
+            centerline (List[Point3D]): Points of the centerline in order, y being the height.
+        """
+        coordinates = np.array([(point.x, point.z)
+                               for point in centerline], dtype=np.int64)
+        heights = np.array([point.y for point in centerline])
+        radius = self.width / 2
+
+        margin = floor(radius) + 1
+        origin = coordinates.min(axis=0) - margin
+        shape = tuple(coordinates.max(axis=0) - origin + margin + 1)
+        cells = np.ravel_multi_index((coordinates - origin).T, shape)
+
+        # Like CenterlineIndex, a cell drawn by several centerline points takes the height of the first one.
+        cells, first = np.unique(cells, return_index=True)
+        owners = np.zeros(np.prod(shape), dtype=np.int64)
+        owners[cells] = first
+        background = np.ones(shape, dtype=bool)
+        background.flat[cells] = False
+
+        distances, nearest = ndimage.distance_transform_edt(
+            background, return_indices=True)
+        inside = distances <= radius
+        nearest = np.ravel_multi_index(
+            (nearest[0][inside], nearest[1][inside]), shape)
+        xs, zs = np.nonzero(inside)
+
+        block = get_palette().intern("stone")
+        for x, y, z in zip((xs + origin[0]).tolist(), heights[owners[nearest]].tolist(), (zs + origin[1]).tolist()):
+            self.output_block.append(((x, y, z), block))
 
     def _projection_polyline(self):
         nearest_points_to_reference = []
@@ -106,7 +158,10 @@ class Road:
                 self.polyline_total_line_output[i] = Point3D(
                     self.polyline.total_line_output[i].x, self.polyline_height.total_line_output[round(i*self.index_factor)].y, self.polyline.total_line_output[i].y)
 
-            self._surface()
+            if self.surface_mode == ROAD_SURFACE.DISTANCE_FIELD:
+                self._surface_distance_field(self.polyline_total_line_output)
+            else:
+                self._surface()
             self.place()
         # self.polyline_total_line_output = self.polyline_total_line_output[0].optimized_path(
         #     self.polyline_total_line_output)
@@ -116,13 +171,15 @@ class Road:
             self.coordinates[0], self.coordinates[1])
 
         reference = s.segment()
+        self.centerline = CenterlineIndex(reference, 'y')
+        black_concrete = get_palette().intern("black_concrete")
 
-        for i in range(len(self.segment_total_line_output)):
+        for point, nearest in zip(self.segment_total_line_output, self.centerline.nearest(self.segment_total_line_output).tolist()):
             self.output_block.append(((
-                self.segment_total_line_output[i].x, reference[self.segment_total_line_output[i].nearest(Point3D.to_2d(reference, 'y'), True)[0]].y, self.segment_total_line_output[i].y), Block("black_concrete")))
+                point.x, reference[nearest].y, point.y), black_concrete))
 
     def place(self):
-        editor = Editor(buffering=True)
+        editor = get_placement_sink() if self.editor is None else self.editor
         for i in range(len(self.output_block)):
             editor.placeBlock(self.output_block[i][0],
                               self.output_block[i][1])
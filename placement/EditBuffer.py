@@ -0,0 +1,241 @@
+from copy import copy
+import random
+from typing import Iterable, Optional, Union
+
+import numpy as np
+from gdpc import Block, Editor
+from glm import ivec3
+
+from placement.Palette import Palette, get_palette, normalize_block_id
+from placement.cuboids import merge_cuboids, split_cuboids
+from utils.instrumentation import count_blocks
+
+DEFAULT_BUFFER_LIMIT = 16384
+
+
+def is_same_block(block: Block, other: Block) -> bool:
+    """
+    Check if placing a block over another one would leave the world unchanged.
+
+    Args:
+        block (Block): Block to place.
+        other (Block): Block already in the world.
+
+    Returns:
+        bool: True if both blocks have the same id, states and data.
+    """
+    return (normalize_block_id(block.id) == normalize_block_id(other.id) and
+            block.states == other.states and
+            (block.data or None) == (other.data or None))
+
+
+def chunk_order(positions: np.ndarray) -> np.ndarray:
+    """
+    Get the order that sorts positions by chunk, then by y, z and x inside each chunk.
+
+    Args:
+        positions (np.ndarray): Positions (N, 3).
+
+    Returns:
+        np.ndarray: Indices sorting the positions.
+    """
+    return np.lexsort((positions[:, 0], positions[:, 2], positions[:, 1], positions[:, 2] >> 4, positions[:, 0] >> 4))
+
+
+class EditBuffer(Editor):
+    """
+    Editor that keeps only the last write of each coordinate until it is flushed.
+
+    The writes are flushed every bufferLimit distinct coordinates, DEFAULT_BUFFER_LIMIT by default rather than the
+    1024 of Editor so that overwrites are dropped over a long window, and on flushBuffer. On flush, writes that would
+    leave the world unchanged according to the cached WorldSlice (see Editor.loadWorldSlice with cache=True) are
+    dropped, and the others are sent sorted by chunk.
+
+    With fillCommands=True, the blocks without states or block entity data are merged into cuboids of identical
+    blocks and sent as /fill commands through the command endpoint. The other blocks are placed one by one.
+
+    Writes are kept as IDs of the shared palette (see placement.Palette). Generators can write IDs directly with
+    place_ids.
+
+    Attributes:
+        fillCommands (bool): Whether to send cuboids as /fill commands.
+        palette (Palette): Palette of the IDs of the writes.
+        stats (dict[str, int]): Number of blocks written by the generators ("written"), dropped because they were
+            overwritten ("overwritten") or already in the world ("unchanged"), and sent to the server ("sent"), and
+            number of /fill commands sent ("fills").
+    """
+
+    def __init__(self, *args, fillCommands: bool = False, bufferLimit: int = DEFAULT_BUFFER_LIMIT, **kwargs):
+        kwargs["buffering"] = True
+        super().__init__(*args, bufferLimit=bufferLimit, **kwargs)
+        self.fillCommands = fillCommands
+        self.palette: Palette = get_palette()
+        self._edits: dict[tuple[int, int, int], int] = {}
+        self.stats = {"written": 0, "overwritten": 0, "unchanged": 0, "sent": 0, "fills": 0}
+
+    def __len__(self) -> int:
+        return len(self._edits)
+
+    def _placeSingleBlockGlobal(self, position: ivec3, block: Union[Block, list[Block]],
+                                replace: Optional[Union[str, Iterable[str]]] = None):
+        if replace is not None:
+            if isinstance(replace, str):
+                replace = [replace]
+            if self.getBlockGlobal(position).id not in replace:
+                return True
+
+        if not isinstance(block, Block):
+            block = random.choice(block)
+        if not block.id:
+            return True
+
+        key = (int(position[0]), int(position[1]), int(position[2]))
+        self.stats["written"] += 1
+        count_blocks()
+        if self._edits.pop(key, None) is not None:
+            self.stats["overwritten"] += 1
+        self._edits[key] = self.palette.get_id(block)
+
+        if self.caching:
+            self._cache[ivec3(*key)] = block
+
+        if len(self._edits) >= self.bufferLimit:
+            self.flushBuffer()
+        return True
+
+    def place_ids(self, positions: np.ndarray, ids: np.ndarray):
+        """
+        Write many blocks given by their ID in the palette, in global coordinates. The transform of the editor is not
+        applied. If a position appears several times, the last one wins.
+
+        Args:
+            positions (np.ndarray): Global positions (N, 3).
+            ids (np.ndarray): ID of each block, or of all of them.
+        """
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 3)
+        ids = np.broadcast_to(np.asarray(ids, dtype=np.int64), (len(positions),))
+        # Blocks without id are skipped, like in placeBlock.
+        empty = np.array([not block.id for block in self.palette.blocks], dtype=bool)
+        kept = ~empty[ids]
+        edits = self._edits
+        before = len(edits)
+        for key, block_id in zip(map(tuple, positions[kept].tolist()), ids[kept].tolist()):
+            edits.pop(key, None)
+            edits[key] = block_id
+        written = int(np.count_nonzero(kept))
+        self.stats["written"] += written
+        self.stats["overwritten"] += before + written - len(edits)
+        count_blocks(written)
+
+        if self.caching:
+            for key, block_id in zip(map(tuple, positions[kept].tolist()), ids[kept].tolist()):
+                self._cache[ivec3(*key)] = self.palette.blocks[block_id]
+
+        if len(self._edits) >= self.bufferLimit:
+            self.flushBuffer()
+
+    def getBlockGlobal(self, position):
+        block_id = self._edits.get((int(position[0]), int(position[1]), int(position[2])))
+        if block_id is not None:
+            return copy(self.palette.blocks[block_id])
+        return super().getBlockGlobal(position)
+
+    def get_changes(self) -> list[tuple[tuple[int, int, int], int]]:
+        """
+        Get the pending writes that change the world, sorted by chunk.
+
+        Returns:
+            list[tuple[tuple[int, int, int], int]]: Positions and palette IDs of the blocks to send.
+        """
+        if not self._edits:
+            return []
+        positions = list(self._edits.keys())
+        order = chunk_order(np.array(positions, dtype=np.int64))
+        changes = []
+        for i in order.tolist():
+            position = positions[i]
+            block_id = self._edits[position]
+            if self._is_in_world(position, self.palette.blocks[block_id]):
+                self.stats["unchanged"] += 1
+                continue
+            changes.append((position, block_id))
+        return changes
+
+    def _is_in_world(self, position: tuple[int, int, int], block: Block) -> bool:
+        world_slice = self._worldSlice
+        if world_slice is None or not world_slice.box.contains(position):
+            return False
+        if self._worldSliceDecay[tuple(ivec3(*position) - world_slice.box.offset)]:
+            return False
+        return is_same_block(block, world_slice.getBlockGlobal(position))
+
+    def _fill_changes(self, changes: list[tuple[tuple[int, int, int], int]]) \
+            -> tuple[list[str], list[tuple[tuple[int, int, int], int]]]:
+        """
+        Build /fill commands for the cuboids of stateless blocks.
+
+        Args:
+            changes (list[tuple[tuple[int, int, int], int]]): Positions and palette IDs of the blocks to send.
+
+        Returns:
+            tuple[list[str], list[tuple[tuple[int, int, int], int]]]: /fill commands, and changes that still have to
+                be placed one by one.
+        """
+        blocks = self.palette.blocks
+        # Blocks are interned by namespaced id, so stateless blocks of the same id share their palette ID.
+        fillable = [not (block.states or block.data) for block in blocks]
+        positions, values, single = [], [], []
+        for position, block_id in changes:
+            if not fillable[block_id]:
+                single.append((position, block_id))
+                continue
+            positions.append(position)
+            values.append(block_id)
+        if not positions:
+            return [], single
+
+        cuboids = split_cuboids(merge_cuboids(np.array(positions), np.array(values)))
+        volumes = np.prod(cuboids[:, 3:6] - cuboids[:, 0:3] + 1, axis=1)
+        fills = [f"fill {x0} {y0} {z0} {x1} {y1} {z1} {normalize_block_id(blocks[value].id)}"
+                 for x0, y0, z0, x1, y1, z1, value in cuboids[volumes > 1].tolist()]
+        self.stats["fills"] += len(fills)
+        for x, y, z, _, _, _, value in cuboids[volumes == 1].tolist():
+            single.append(((x, y, z), value))
+        return fills, single
+
+    def _pop_changes(self) -> tuple[list[str], list[tuple[tuple[int, int, int], int]]]:
+        """
+        Take the pending writes that change the world and mark them as decayed in the cached WorldSlice.
+
+        With fillCommands, the cuboids are returned as /fill commands, and only the remaining blocks as changes. The
+        fills must be sent before the blocks: blocks with states, like doors or stairs, are drawn against the walls
+        and floors of the fills.
+
+        Returns:
+            tuple[list[str], list[tuple[tuple[int, int, int], int]]]: /fill commands, and positions and palette IDs
+                of the blocks to place, sorted by chunk.
+        """
+        changes = self.get_changes()
+        self._edits = {}
+        self.stats["sent"] += len(changes)
+        if self._worldSlice is not None:
+            for position, _ in changes:
+                if self._worldSlice.box.contains(position):
+                    self._worldSliceDecay[tuple(ivec3(*position) - self._worldSlice.box.offset)] = True
+        if self.fillCommands:
+            return self._fill_changes(changes)
+        return [], changes
+
+    def flushBuffer(self):
+        """Sends the /fill cuboids, then the other pending writes that change the world sorted by chunk, then the
+        queued commands."""
+        fills, changes = self._pop_changes()
+        if fills:
+            commands, self._commandBuffer = self._commandBuffer, fills
+            super().flushBuffer()
+            self._commandBuffer = commands
+        # The Editor buffer is filled directly: its buffered placement would flush it again when full.
+        blocks = self.palette.blocks
+        for position, block_id in changes:
+            self._buffer[ivec3(*position)] = blocks[block_id]
+        super().flushBuffer()
@@ -0,0 +1,155 @@
+import json
+from typing import Union
+
+import numpy as np
+from gdpc import Block, geometry
+
+
+class EditPlan:
+    """
+    A compact list of cuboid edits that can be inspected, cached and compared without a server.
+
+    Attributes:
+        palette (list[Block]): Blocks used by the plan, referenced by index.
+        cuboids (np.ndarray): One row per cuboid: x0, y0, z0, x1, y1, z1 (bounds included) and palette index.
+            Cuboids are placed in order, so a later cuboid overwrites an earlier one.
+    """
+
+    def __init__(self, palette: list[Block] = None, cuboids: np.ndarray = None):
+        self.palette: list[Block] = [] if palette is None else palette
+        self.cuboids: np.ndarray = np.zeros((0, 7), dtype=np.int32) if cuboids is None else np.asarray(
+            cuboids, dtype=np.int32).reshape(-1, 7)
+
+    def __len__(self) -> int:
+        return len(self.cuboids)
+
+    def __repr__(self) -> str:
+        return f"EditPlan({len(self)} cuboids, {self.volume} blocks, {len(self.palette)} blocks in palette)"
+
+    @property
+    def volume(self) -> int:
+        """Number of block placements needed to apply the plan."""
+        sizes = self.cuboids[:, 3:6] - self.cuboids[:, 0:3] + 1
+        return int(np.prod(sizes, axis=1).sum())
+
+    def get_palette_index(self, block: Block) -> int:
+        """
+        Get the index of a block in the palette, adding it if needed.
+
+        Args:
+            block (Block): Block to look for.
+
+        Returns:
+            int: Index of the block in the palette.
+        """
+        key = str(block)
+        for i in range(len(self.palette)):
+            if str(self.palette[i]) == key:
+                return i
+        self.palette.append(block)
+        return len(self.palette) - 1
+
+    def add_cuboids(self, cuboids: np.ndarray, block: Union[Block, None] = None):
+        """
+        Append cuboids to the plan.
+
+        Args:
+            cuboids (np.ndarray): Rows of x0, y0, z0, x1, y1, z1, plus the palette index if no block is given.
+            block (Block, optional): Block of all the added cuboids. Defaults to None.
+        """
+        cuboids = np.asarray(cuboids, dtype=np.int32)
+        if block is not None:
+            cuboids = cuboids.reshape(-1, 6)
+            cuboids = np.hstack((cuboids, np.full((len(cuboids), 1), self.get_palette_index(block), dtype=np.int32)))
+        self.cuboids = np.vstack((self.cuboids, cuboids.reshape(-1, 7)))
+
+    def extend(self, other: "EditPlan"):
+        """
+        Append the cuboids of another plan after the cuboids of this one.
+
+        Args:
+            other (EditPlan): Plan to append.
+        """
+        remap = np.array([self.get_palette_index(block) for block in other.palette], dtype=np.int32)
+        cuboids = other.cuboids.copy()
+        if len(cuboids):
+            cuboids[:, 6] = remap[cuboids[:, 6]]
+        self.add_cuboids(cuboids)
+
+    def voxels(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Expand the plan into single blocks, keeping only the last write of each coordinate.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Coordinates (N, 3) sorted by x, y, z and the palette index of each one.
+        """
+        if len(self.cuboids) == 0:
+            return np.zeros((0, 3), dtype=np.int32), np.zeros(0, dtype=np.int32)
+        sizes = self.cuboids[:, 3:6] - self.cuboids[:, 0:3] + 1
+        counts = np.prod(sizes, axis=1)
+        owner = np.repeat(np.arange(len(self.cuboids)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        size_y, size_z = sizes[owner, 1], sizes[owner, 2]
+        offsets = np.stack((local // (size_y * size_z), (local // size_z) % size_y, local % size_z), axis=1)
+        coordinates = self.cuboids[owner, 0:3] + offsets
+        values = self.cuboids[owner, 6]
+
+        # Last write wins: keep the last occurrence of each coordinate
+        order = np.lexsort((-np.arange(len(coordinates)), coordinates[:, 2], coordinates[:, 1], coordinates[:, 0]))
+        coordinates, values = coordinates[order], values[order]
+        first = np.ones(len(coordinates), dtype=bool)
+        first[1:] = np.any(coordinates[1:] != coordinates[:-1], axis=1)
+        return coordinates[first].astype(np.int32), values[first].astype(np.int32)
+
+    def diff(self, other: "EditPlan") -> np.ndarray:
+        """
+        Get the coordinates where applying this plan and the other one give different results.
+
+        Args:
+            other (EditPlan): Plan to compare with.
+
+        Returns:
+            np.ndarray: Coordinates (N, 3) written by only one plan or with a different block.
+        """
+        voxels = {}
+        for plan, side in ((self, 0), (other, 1)):
+            coordinates, values = plan.voxels()
+            for coordinate, value in zip(map(tuple, coordinates.tolist()), values.tolist()):
+                voxels.setdefault(coordinate, [None, None])[side] = str(plan.palette[value])
+        return np.array([coordinate for coordinate, (a, b) in voxels.items() if a != b], dtype=np.int32).reshape(-1, 3)
+
+    def place(self, editor):
+        """
+        Place the plan with an editor.
+
+        Args:
+            editor (Editor): Editor used to place the blocks.
+        """
+        for x0, y0, z0, x1, y1, z1, index in self.cuboids.tolist():
+            geometry.placeCuboid(editor, (x0, y0, z0), (x1, y1, z1), self.palette[index])
+
+    def save(self, path: str):
+        """
+        Save the plan to a .npz file.
+
+        Args:
+            path (str): Path of the file.
+        """
+        palette = np.array([json.dumps([block.id, block.states, block.data]) for block in self.palette], dtype=str)
+        np.savez_compressed(path, cuboids=self.cuboids, palette=palette)
+
+    @staticmethod
+    def load(path: str) -> "EditPlan":
+        """
+        Load a plan saved with EditPlan.save.
+
+        Args:
+            path (str): Path of the file.
+
+        Returns:
+            EditPlan: The loaded plan.
+        """
+        with np.load(path) as data:
+            palette = [Block(*json.loads(block)) for block in data["palette"].tolist()]
+            return EditPlan(palette, data["cuboids"])
+
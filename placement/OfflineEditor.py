@@ -0,0 +1,181 @@
+from copy import copy
+import logging
+import random
+from typing import Iterable, Optional, Union
+
+import numpy as np
+from gdpc import Block, Editor
+from gdpc.vector_tools import Box, Rect
+from glm import ivec3
+from nbt import nbt
+
+from placement.Palette import get_palette, normalize_block_id
+from placement.VoxelStore import VoxelStore
+from utils.instrumentation import count_blocks
+
+logger = logging.getLogger(__name__)
+
+STRUCTURE_DATA_VERSION = 3700  # Minecraft 1.20.4
+
+
+class OfflineEditor(Editor):
+    """
+    Editor that writes into an in-memory voxel store instead of a GDMC server, for dry runs and exports.
+
+    It can be used everywhere an Editor is used by the generators: placeBlock, getBlock, transform, pushTransform,
+    getBuildArea, and geometry.placeCuboid/placeLine. Nothing is sent over the network.
+
+    Attributes:
+        buildArea (Box): Build area returned by getBuildArea.
+        store (VoxelStore): Written blocks.
+        worldSlice (WorldSlice): Optional slice of the world, used for reads of blocks that were not written and
+            returned by loadWorldSlice.
+    """
+
+    def __init__(self, buildArea: Optional[Box] = None, worldSlice=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buildArea = Box((0, -64, 0), (256, 384, 256)) if buildArea is None else buildArea
+        self.store = VoxelStore()
+        self._worldSlice = worldSlice
+        if worldSlice is not None:
+            self._worldSliceDecay = np.zeros(worldSlice.box.size, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def getBuildArea(self) -> Box:
+        return self.buildArea
+
+    def _placeSingleBlockGlobal(self, position: ivec3, block: Union[Block, list[Block]],
+                                replace: Optional[Union[str, Iterable[str]]] = None):
+        if replace is not None:
+            if isinstance(replace, str):
+                replace = [replace]
+            if self.getBlockGlobal(position).id not in replace:
+                return True
+
+        if not isinstance(block, Block):
+            block = random.choice(block)
+        if not block.id:
+            return True
+
+        self.store.set((int(position[0]), int(position[1]), int(position[2])), self.store.get_index(block))
+        count_blocks()
+        return True
+
+    def place_ids(self, positions: np.ndarray, ids: np.ndarray):
+        """
+        Write many blocks given by their ID in the shared palette, in global coordinates, like EditBuffer.place_ids.
+
+        Args:
+            positions (np.ndarray): Global positions (N, 3).
+            ids (np.ndarray): ID of each block, or of all of them.
+        """
+        palette = get_palette()
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 3)
+        ids = np.broadcast_to(np.asarray(ids, dtype=np.int64), (len(positions),))
+        # Blocks without id are skipped, like in placeBlock.
+        remap = np.array([self.store.get_index(block) if block.id else 0 for block in palette.blocks], dtype=np.uint16)
+        values = remap[ids]
+        kept = values != 0
+        self.store.set_many(positions[kept], values[kept])
+        count_blocks(int(np.count_nonzero(kept)))
+
+    def getBlockGlobal(self, position):
+        value = self.store.get((int(position[0]), int(position[1]), int(position[2])))
+        if value:
+            return copy(self.store.palette[value])
+        if self._worldSlice is not None and self._worldSlice.box.contains(position):
+            return self._worldSlice.getBlockGlobal(position)
+        return Block("minecraft:air")
+
+    def getBiomeGlobal(self, position):
+        if self._worldSlice is not None and self._worldSlice.box.contains(position):
+            return self._worldSlice.getBiomeGlobal(position)
+        return ""
+
+    def loadWorldSlice(self, rect: Optional[Rect] = None, heightmapTypes=None, cache=False):
+        if self._worldSlice is None:
+            raise RuntimeError("OfflineEditor has no world slice. Give one to the constructor to read the world.")
+        return self._worldSlice
+
+    def flushBuffer(self):
+        pass
+
+    def runCommandGlobal(self, command: str, position=None, syncWithBuffer=False):
+        """Applies the fill and setblock commands to the store, and ignores the others."""
+        for line in command.split("\n"):
+            words = line.split()
+            if len(words) == 8 and words[0] == "fill":
+                first, last = ivec3(*map(int, words[1:4])), ivec3(*map(int, words[4:7]))
+                self.placeBlockGlobal(Box.between(first, last).inner, Block(words[7]))
+            elif len(words) == 5 and words[0] == "setblock":
+                self.placeBlockGlobal(ivec3(*map(int, words[1:4])), Block(words[4]))
+            elif words:
+                logger.info("Command ignored offline: %s", line)
+
+    def save_npz(self, path: str):
+        """
+        Save the written blocks to a .npz file, as positions, palette indices and a palette of block strings.
+
+        Args:
+            path (str): Path of the file.
+        """
+        positions, values = self.store.voxels()
+        palette = np.array([""] + [str(block) for block in self.store.palette[1:]], dtype=str)
+        np.savez_compressed(path, positions=positions, values=values, palette=palette)
+
+    def to_structure(self) -> nbt.NBTFile:
+        """
+        Convert the written blocks to the Minecraft structure format, with the lowest corner as origin.
+
+        Returns:
+            nbt.NBTFile: Structure, as saved by structure blocks.
+        """
+        positions, values = self.store.voxels()
+        origin = positions.min(axis=0) if len(positions) else np.zeros(3, dtype=np.int32)
+        size = positions.max(axis=0) - origin + 1 if len(positions) else np.zeros(3, dtype=np.int32)
+        used, states = np.unique(values, return_inverse=True)
+
+        structure = nbt.NBTFile()
+        structure.name = ""
+        structure.tags.append(nbt.TAG_Int(name="DataVersion", value=STRUCTURE_DATA_VERSION))
+        size_tag = nbt.TAG_List(name="size", type=nbt.TAG_Int)
+        size_tag.tags.extend(nbt.TAG_Int(int(value)) for value in size)
+        structure.tags.append(size_tag)
+
+        palette = nbt.TAG_List(name="palette", type=nbt.TAG_Compound)
+        for value in used.tolist():
+            block = self.store.palette[value]
+            state = nbt.TAG_Compound()
+            state.tags.append(nbt.TAG_String(name="Name", value=normalize_block_id(block.id)))
+            if block.states:
+                properties = nbt.TAG_Compound(name="Properties")
+                properties.tags.extend(nbt.TAG_String(name=key, value=str(value))
+                                       for key, value in block.states.items())
+                state.tags.append(properties)
+            palette.tags.append(state)
+        structure.tags.append(palette)
+
+        blocks = nbt.TAG_List(name="blocks", type=nbt.TAG_Compound)
+        for position, state in zip((positions - origin).tolist(), states.reshape(-1).tolist()):
+            block = nbt.TAG_Compound()
+            pos = nbt.TAG_List(name="pos", type=nbt.TAG_Int)
+            pos.tags.extend(nbt.TAG_Int(coordinate) for coordinate in position)
+            block.tags.append(pos)
+            block.tags.append(nbt.TAG_Int(name="state", value=state))
+            blocks.tags.append(block)
+        structure.tags.append(blocks)
+        structure.tags.append(nbt.TAG_List(name="entities", type=nbt.TAG_Compound))
+        return structure
+
+    def save_structure(self, path: str):
+        """
+        Save the written blocks to a structure file (.nbt), that can be loaded with a structure block or /place.
+
+        Block entity data is not exported.
+
+        Args:
+            path (str): Path of the file.
+        """
+        self.to_structure().write_file(path)
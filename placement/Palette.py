@@ -0,0 +1,174 @@
+import json
+from copy import copy
+from typing import Optional
+
+from gdpc import Block
+
+
+def normalize_block_id(block_id: str) -> str:
+    """
+    Add the default namespace to a block id if it has none.
+
+    Args:
+        block_id (str): Block id, like "stone" or "minecraft:stone".
+
+    Returns:
+        str: Namespaced block id.
+
+    >>> normalize_block_id("stone")
+    'minecraft:stone'
+    """
+    return block_id if ":" in block_id else "minecraft:" + block_id
+
+
+class Palette:
+    """
+    Interned blocks, each with a small integer ID, so that placements can carry IDs instead of Block objects.
+
+    Blocks are interned by namespaced id, states and data: Block("stone") and Block("minecraft:stone") share an ID.
+    The interned blocks are shared by every user of the palette and must not be modified.
+
+    Attributes:
+        blocks (list[Block]): Interned block of each ID.
+
+    >>> palette = Palette()
+    >>> palette.get_id(Block("stone")), palette.get_id(Block("minecraft:stone")), palette.get_id(Block("dirt"))
+    (0, 0, 1)
+    >>> palette.intern("oak_stairs", {"facing": "north"}) is palette.intern("oak_stairs", {"facing": "north"})
+    True
+    """
+
+    def __init__(self):
+        self.blocks: list[Block] = []
+        self._ids: dict[tuple, int] = {}
+        # IDs of the interned objects themselves, which the palette keeps alive.
+        self._object_ids: dict[int, int] = {}
+        self._json: list[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    @staticmethod
+    def get_key(block_id: str, states: Optional[dict] = None, data: Optional[str] = None) -> tuple:
+        """
+        Get the key a block is interned by.
+
+        Args:
+            block_id (str): Block id.
+            states (dict, optional): Block states. Defaults to None.
+            data (str, optional): Block entity data. Defaults to None.
+
+        Returns:
+            tuple: Namespaced id, sorted states and data.
+        """
+        return normalize_block_id(block_id), tuple(sorted((states or {}).items())), data or None
+
+    def _add(self, key: tuple, block: Block) -> int:
+        index = len(self.blocks)
+        self._ids[key] = index
+        self._object_ids[id(block)] = index
+        self.blocks.append(block)
+        self._json.append(None)
+        return index
+
+    def get_id(self, block: Block) -> int:
+        """
+        Get the ID of a block, interning a copy of it if needed.
+
+        Args:
+            block (Block): Block to look for.
+
+        Returns:
+            int: ID of the block.
+        """
+        index = self._object_ids.get(id(block))
+        if index is not None:
+            return index
+        key = self.get_key(block.id, block.states, block.data)
+        index = self._ids.get(key)
+        if index is None:
+            index = self._add(key, copy(block))
+        return index
+
+    def get_ids(self, blocks: list[Block]) -> list[int]:
+        """
+        Get the ID of each block.
+
+        Args:
+            blocks (list[Block]): Blocks to look for.
+
+        Returns:
+            list[int]: ID of each block.
+        """
+        return [self.get_id(block) for block in blocks]
+
+    def intern_id(self, block_id: str, states: Optional[dict] = None, data: Optional[str] = None) -> int:
+        """
+        Get the ID of a block from its id, states and data, without creating a Block if it is already interned.
+
+        Args:
+            block_id (str): Block id.
+            states (dict, optional): Block states. Defaults to None.
+            data (str, optional): Block entity data. Defaults to None.
+
+        Returns:
+            int: ID of the block.
+        """
+        key = self.get_key(block_id, states, data)
+        index = self._ids.get(key)
+        if index is None:
+            index = self._add(key, Block(block_id, dict(states or {}), data))
+        return index
+
+    def intern(self, block_id: str, states: Optional[dict] = None, data: Optional[str] = None) -> Block:
+        """
+        Get the shared Block of an id, states and data. Use it instead of creating a Block in a loop.
+
+        Args:
+            block_id (str): Block id.
+            states (dict, optional): Block states. Defaults to None.
+            data (str, optional): Block entity data. Defaults to None.
+
+        Returns:
+            Block: The interned block, not to be modified.
+        """
+        return self.blocks[self.intern_id(block_id, states, data)]
+
+    def to_json(self, index: int) -> str:
+        """
+        Get the fields of a block in the body of a GDMC /blocks request, serialized once per ID.
+
+        Args:
+            index (int): ID of the block.
+
+        Returns:
+            str: The id, state and data fields, without braces, like gdpc.interface.placeBlocks writes them.
+
+        >>> palette = Palette()
+        >>> palette.to_json(palette.intern_id("oak_log", {"axis": "y"}))
+        '"id":"oak_log","state":{"axis":"y"}'
+        """
+        fields = self._json[index]
+        if fields is None:
+            block = self.blocks[index]
+            fields = (f'"id":"{block.id}"' +
+                      (f',"state":{json.dumps(block.states, separators=(",", ":"))}' if block.states else '') +
+                      (f',"data":{repr(block.data)}' if block.data is not None else ''))
+            self._json[index] = fields
+        return fields
+
+
+_palette: Optional[Palette] = None
+
+
+def get_palette() -> Palette:
+    """
+    Get the palette shared by every generator and placement editor, creating it on the first call.
+
+    Returns:
+        Palette: The shared palette.
+    """
+    global _palette
+    if _palette is None:
+        _palette = Palette()
+    return _palette
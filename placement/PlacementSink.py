@@ -0,0 +1,228 @@
+import atexit
+from concurrent import futures
+import logging
+import threading
+from typing import Optional
+
+from gdpc import interface
+
+from placement.EditBuffer import DEFAULT_BUFFER_LIMIT, EditBuffer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 4096
+DEFAULT_WORKERS = 4
+
+
+def chunk_batches(changes: list[tuple[tuple[int, int, int], int]],
+                  batch_size: int) -> list[list[tuple[tuple[int, int, int], int]]]:
+    """
+    Split changes sorted by chunk into batches of whole chunks.
+
+    A batch never holds more than batch_size blocks. A chunk with more blocks than that is split into several
+    batches of its own.
+
+    Args:
+        changes (list[tuple[tuple[int, int, int], int]]): Positions and palette IDs of the blocks, sorted by chunk.
+        batch_size (int): Maximum number of blocks of a batch.
+
+    Returns:
+        list[list[tuple[tuple[int, int, int], int]]]: Batches, in the order of the changes.
+
+    >>> [len(batch) for batch in chunk_batches([((0, 0, 0), 0), ((1, 0, 0), 0), ((16, 0, 0), 0)], 2)]
+    [2, 1]
+    """
+    groups = []
+    for change in changes:
+        chunk = (change[0][0] >> 4, change[0][2] >> 4)
+        if groups and groups[-1][0] == chunk:
+            groups[-1][1].append(change)
+        else:
+            groups.append((chunk, [change]))
+
+    batches, batch = [], []
+    for _, group in groups:
+        if batch and len(batch) + len(group) > batch_size:
+            batches.append(batch)
+            batch = []
+        while len(group) > batch_size:
+            batches.append(group[:batch_size])
+            group = group[batch_size:]
+        batch.extend(group)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class PlacementSink(EditBuffer):
+    """
+    Shared EditBuffer that sends its writes from a pool of background threads.
+
+    The writes are compacted like in EditBuffer. Every bufferLimit writes, and on flushBuffer, the changes are split
+    into batches of whole chunks (see chunk_batches) that are sent concurrently. Two batches touching the same chunk
+    are always sent in order, and queued commands are sent once every previous batch is placed, so the last write
+    of a position always wins. With fillCommands, the /fill cuboids of a flush are sent before its batches, so blocks
+    with states are placed after the walls and floors they were drawn against.
+
+    When maxPendingBatches batches are waiting for the server, placing more blocks blocks the generator until one of
+    them is done. The sink is flushed and awaited by close, at the latest when the interpreter exits.
+
+    Attributes:
+        batchSize (int): Maximum number of blocks sent in one request.
+        workers (int): Number of threads sending the batches.
+        maxPendingBatches (int): Number of batches that can be submitted before the generators wait.
+    """
+
+    def __init__(self, *args, bufferLimit: int = DEFAULT_BUFFER_LIMIT, batchSize: int = DEFAULT_BATCH_SIZE,
+                 workers: int = DEFAULT_WORKERS, maxPendingBatches: Optional[int] = None, **kwargs):
+        super().__init__(*args, bufferLimit=bufferLimit, **kwargs)
+        self.batchSize = batchSize
+        self.workers = workers
+        self.maxPendingBatches = 2 * workers if maxPendingBatches is None else maxPendingBatches
+        self.stats["batches"] = 0
+
+        self._executor = futures.ThreadPoolExecutor(workers, thread_name_prefix="PlacementSink")
+        self._slots = threading.BoundedSemaphore(self.maxPendingBatches)
+        self._pending: set[futures.Future] = set()
+        self._chunkFutures: dict[tuple[int, int], futures.Future] = {}
+        self._barrier: Optional[futures.Future] = None
+        self._errors: list[BaseException] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        atexit.register(self.close)
+
+    def __enter__(self) -> "PlacementSink":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def loadWorldSlice(self, *args, **kwargs):
+        """Loads the world slice once every write sent so far is placed."""
+        self.flushBuffer()
+        self.awaitBufferFlushes()
+        return super().loadWorldSlice(*args, **kwargs)
+
+    def _send_blocks(self, batch: list[tuple[tuple[int, int, int], int]]):
+        # Same request as gdpc.interface.placeBlocks, with the blocks serialized once per palette ID.
+        body = "[" + ",".join(f'{{"x":{x},"y":{y},"z":{z},{self.palette.to_json(block_id)}}}'
+                              for (x, y, z), block_id in batch) + "]"
+        parameters = {"dimension": self.dimension, "doBlockUpdates": self._bufferDoBlockUpdates,
+                      "spawnDrops": self.spawnDrops}
+        response = interface._request("PUT", f"{self.host}/blocks", data=bytes(body, "utf-8"), params=parameters,
+                                      retries=self.retries, timeout=self.timeout).json()
+        for entry in response:
+            if "message" in entry:
+                logger.error("Server returned error upon placing buffered block:\n  %s", entry["message"])
+
+    def _send_commands(self, commands: list[str]):
+        response = interface.runCommand("\n".join(commands), dimension=self.dimension, retries=self.retries,
+                                        timeout=self.timeout, host=self.host)
+        for entry in response:
+            if not entry[0]:
+                logger.error("Server returned error upon running buffered command:\n  %s", entry[1])
+
+    def _submit(self, send, payload, dependencies: list[futures.Future]) -> Optional[futures.Future]:
+        """Run send(payload) on a worker once the dependencies are done, waiting for a free slot first."""
+        if self._closed:
+            send(payload)
+            return None
+
+        def task():
+            futures.wait(dependencies)
+            send(payload)
+
+        self._slots.acquire()
+        future = self._executor.submit(task)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._on_done)
+        self.stats["batches"] += 1
+        return future
+
+    def _on_done(self, future: futures.Future):
+        with self._lock:
+            self._pending.discard(future)
+            if future.exception() is not None:
+                self._errors.append(future.exception())
+        self._slots.release()
+
+    def flushBuffer(self):
+        """Submits the /fill cuboids, then the other pending writes that change the world as chunk batches, then the
+        queued commands."""
+        fills, changes = self._pop_changes()
+        batches = chunk_batches(changes, self.batchSize)
+        commands, self._commandBuffer = self._commandBuffer, []
+        self._buffer = {}
+
+        # The batches wait for the fills of the same flush, like the blocks after the commands of a previous one.
+        if fills:
+            self._submit_barrier(fills)
+        for batch in batches:
+            chunks = {(position[0] >> 4, position[2] >> 4) for position, _ in batch}
+            dependencies = [self._chunkFutures[chunk] for chunk in chunks if chunk in self._chunkFutures]
+            if self._barrier is not None:
+                dependencies.append(self._barrier)
+            future = self._submit(self._send_blocks, batch, dependencies)
+            if future is not None:
+                self._chunkFutures.update((chunk, future) for chunk in chunks)
+        if commands:
+            self._submit_barrier(commands)
+
+    def _submit_barrier(self, commands: list[str]):
+        """Submit commands once every submitted batch is placed. The next batches wait for them."""
+        with self._lock:
+            dependencies = list(self._pending)
+        self._barrier = self._submit(self._send_commands, commands, dependencies)
+        self._chunkFutures = {}
+
+    def awaitBufferFlushes(self, timeout: Optional[float] = None):
+        """
+        Wait for the submitted batches, and raise the first error of a batch that failed.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait. Defaults to None.
+        """
+        with self._lock:
+            pending = list(self._pending)
+        futures.wait(pending, timeout)
+        with self._lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        """Flush the remaining writes, wait for every batch and stop the threads. The sink then sends synchronously."""
+        if getattr(self, "_closed", True):
+            return
+        try:
+            self.flushBuffer()
+            self.awaitBufferFlushes()
+        finally:
+            self._closed = True
+            self._executor.shutdown(wait=True)
+            self._chunkFutures = {}
+            self._barrier = None
+            atexit.unregister(self.close)
+
+
+_sink: Optional[PlacementSink] = None
+
+
+def get_placement_sink(**kwargs) -> PlacementSink:
+    """
+    Get the placement sink shared by every generator, creating it on the first call.
+
+    Args:
+        **kwargs: Arguments of PlacementSink, used only when the sink is created.
+
+    Returns:
+        PlacementSink: The shared sink.
+    """
+    global _sink
+    if _sink is None:
+        _sink = PlacementSink(**kwargs)
+    return _sink
@@ -0,0 +1,146 @@
+import random
+from typing import Optional, Union
+
+import numpy as np
+from gdpc import Block
+
+from placement.Palette import Palette, get_palette
+
+UNSET = -1
+
+
+class VoxelCanvas:
+    """
+    Local box of palette IDs that a generator draws into with placeBlock, before placing the result at once.
+
+    A later placeBlock overwrites an earlier one in memory, so only the final block of each voxel is placed. Voxels
+    drawn outside the box are kept aside and placed too. Coordinates are the ones of the editor the canvas is emitted
+    to, before its transform.
+
+    Attributes:
+        begin (np.ndarray): Lowest corner of the box.
+        ids (np.ndarray): Palette ID of each voxel of the box, indexed [x, y, z], or UNSET if it was never drawn.
+        overflow (dict[tuple[int, int, int], int]): Palette ID of each voxel drawn outside the box.
+        palette (Palette): Palette of the IDs.
+
+    >>> canvas = VoxelCanvas((0, 0, 0), (4, 4, 4))
+    >>> _ = canvas.placeBlock((1, 2, 3), Block("air"))
+    >>> _ = canvas.placeBlock((1, 2, 3), Block("stone"))
+    >>> _ = canvas.placeBlock((9, 0, 0), Block("dirt"))
+    >>> positions, ids = canvas.voxels()
+    >>> positions.tolist(), [canvas.palette.blocks[i].id for i in ids.tolist()]
+    ([[1, 2, 3], [9, 0, 0]], ['stone', 'dirt'])
+    """
+
+    def __init__(self, begin, size, palette: Optional[Palette] = None):
+        """
+        Args:
+            begin: Lowest corner of the box.
+            size: Size of the box along x, y and z.
+            palette (Palette, optional): Palette of the IDs. Defaults to the shared palette.
+        """
+        self.begin = np.array([int(value) for value in begin], dtype=np.int64)
+        self.ids = np.full([max(int(value), 0) for value in size], UNSET, dtype=np.int32)
+        self.overflow: dict[tuple[int, int, int], int] = {}
+        self.palette = get_palette() if palette is None else palette
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.ids != UNSET)) + len(self.overflow)
+
+    def placeBlock(self, position, block: Union[Block, list[Block]]) -> bool:
+        """
+        Draw a block, like Editor.placeBlock. A list of blocks draws one of them at random.
+
+        Args:
+            position: Coordinates of the block.
+            block (Block | list[Block]): Block to draw.
+
+        Returns:
+            bool: True, like Editor.placeBlock.
+        """
+        if not isinstance(block, Block):
+            block = random.choice(block)
+        if not block.id:
+            return True
+
+        x, y, z = int(position[0]), int(position[1]), int(position[2])
+        i, j, k = x - int(self.begin[0]), y - int(self.begin[1]), z - int(self.begin[2])
+        size_x, size_y, size_z = self.ids.shape
+        if 0 <= i < size_x and 0 <= j < size_y and 0 <= k < size_z:
+            self.ids[i, j, k] = self.palette.get_id(block)
+        else:
+            self.overflow[(x, y, z)] = self.palette.get_id(block)
+        return True
+
+    def fill(self, begin, end, block: Block):
+        """
+        Draw a block in every voxel of a box, like placeBlock in a loop over it, with one slice assignment.
+
+        Args:
+            begin: Lowest corner of the box.
+            end: Corner after the highest one, like the end of a range. The box is empty if end <= begin on an axis.
+            block (Block): Block to draw.
+
+        >>> canvas = VoxelCanvas((0, 0, 0), (4, 4, 4))
+        >>> canvas.fill((1, 1, 1), (3, 5, 2), Block("air"))
+        >>> len(canvas), sorted(canvas.overflow)
+        (8, [(1, 4, 1), (2, 4, 1)])
+        """
+        if not block.id:
+            return
+        begin = np.array([int(value) for value in begin], dtype=np.int64)
+        end = np.array([int(value) for value in end], dtype=np.int64)
+        if (end <= begin).any():
+            return
+        block_id = self.palette.get_id(block)
+
+        inner_begin = np.clip(begin - self.begin, 0, self.ids.shape)
+        inner_end = np.clip(end - self.begin, 0, self.ids.shape)
+        if (inner_end > inner_begin).all():
+            self.ids[tuple(slice(first, last) for first, last in zip(inner_begin.tolist(), inner_end.tolist()))] = \
+                block_id
+        if (inner_end - inner_begin == end - begin).all():
+            return
+
+        # Part of the box is outside the canvas.
+        positions = np.stack(np.meshgrid(*(np.arange(first, last) for first, last in zip(begin, end)),
+                                         indexing="ij"), axis=-1).reshape(-1, 3)
+        local = positions - self.begin
+        outside = ((local < 0) | (local >= self.ids.shape)).any(axis=1)
+        for position in positions[outside].tolist():
+            self.overflow[tuple(position)] = block_id
+
+    def voxels(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the final voxels of the canvas.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Coordinates (N, 3) and palette ID of each drawn voxel.
+        """
+        drawn = np.argwhere(self.ids != UNSET)
+        positions = np.vstack((drawn + self.begin,
+                               np.array(list(self.overflow.keys()), dtype=np.int64).reshape(-1, 3)))
+        ids = np.concatenate((self.ids[tuple(drawn.T)].astype(np.int64),
+                              np.array(list(self.overflow.values()), dtype=np.int64)))
+        return positions, ids
+
+    def emit(self, editor):
+        """
+        Place the final voxels of the canvas with an editor, in one bulk placement when the editor supports it.
+
+        place_ids takes global coordinates, so it is only used when the transform of the editor is a translation.
+        Otherwise, each block is placed through placeBlock, which also rotates and flips the block states.
+
+        Args:
+            editor (Editor): Editor used to place the blocks.
+        """
+        positions, ids = self.voxels()
+        transform = editor.transform
+        if (hasattr(editor, "place_ids") and self.palette is get_palette() and transform.rotation == 0
+                and not any(transform.flip)):
+            editor.place_ids(positions + np.array(transform.translation, dtype=np.int64), ids)
+            return
+
+        blocks = self.palette.blocks
+        for position, block_id in zip(positions.tolist(), ids.tolist()):
+            editor.placeBlock(position, blocks[block_id])
@@ -0,0 +1,140 @@
+from typing import Union
+
+import numpy as np
+from gdpc import Block
+
+SECTION_SIZE = 16
+
+
+class VoxelStore:
+    """
+    Sparse voxel grid, stored as 16x16x16 sections of palette indices allocated on first write.
+
+    Index 0 means that the voxel was never written.
+
+    Attributes:
+        palette (list[Block]): Blocks referenced by the sections. palette[0] is None.
+        sections (dict[tuple[int, int, int], np.ndarray]): Sections by (x, y, z) section coordinates, indexed
+            [y, z, x] like Minecraft chunk sections.
+    """
+
+    def __init__(self):
+        self.palette: list[Union[Block, None]] = [None]
+        self.sections: dict[tuple[int, int, int], np.ndarray] = {}
+        self._indices: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return int(sum(np.count_nonzero(section) for section in self.sections.values()))
+
+    def get_index(self, block: Block) -> int:
+        """
+        Get the palette index of a block, adding it to the palette if needed.
+
+        Args:
+            block (Block): Block to look for.
+
+        Returns:
+            int: Palette index of the block.
+        """
+        key = str(block)
+        index = self._indices.get(key)
+        if index is None:
+            index = len(self.palette)
+            self._indices[key] = index
+            self.palette.append(block)
+        return index
+
+    def _section(self, key: tuple[int, int, int]) -> np.ndarray:
+        section = self.sections.get(key)
+        if section is None:
+            section = np.zeros((SECTION_SIZE, SECTION_SIZE, SECTION_SIZE), dtype=np.uint16)
+            self.sections[key] = section
+        return section
+
+    def set(self, position: tuple[int, int, int], value: int):
+        """
+        Write the palette index of a voxel.
+
+        Args:
+            position (tuple[int, int, int]): Position of the voxel.
+            value (int): Palette index.
+        """
+        x, y, z = position
+        self._section((x >> 4, y >> 4, z >> 4))[y & 15, z & 15, x & 15] = value
+
+    def get(self, position: tuple[int, int, int]) -> int:
+        """
+        Read the palette index of a voxel.
+
+        Args:
+            position (tuple[int, int, int]): Position of the voxel.
+
+        Returns:
+            int: Palette index, 0 if the voxel was never written.
+        """
+        x, y, z = position
+        section = self.sections.get((x >> 4, y >> 4, z >> 4))
+        if section is None:
+            return 0
+        return int(section[y & 15, z & 15, x & 15])
+
+    def set_many(self, positions: np.ndarray, values: Union[int, np.ndarray]):
+        """
+        Write the palette index of many voxels at once. If a position appears several times, the last one wins.
+
+        Args:
+            positions (np.ndarray): Positions (N, 3).
+            values (int | np.ndarray): Palette index of all the voxels, or of each voxel.
+        """
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 3)
+        values = np.broadcast_to(np.asarray(values, dtype=np.uint16), (len(positions),))
+        if len(positions) == 0:
+            return
+        keys, inverse = np.unique(positions >> 4, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(keys) + 1))
+        local = positions & 15
+        for i, key in enumerate(map(tuple, keys.tolist())):
+            selection = order[bounds[i]:bounds[i + 1]]
+            self._section(key)[local[selection, 1], local[selection, 2], local[selection, 0]] = values[selection]
+
+    def get_many(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Read the palette index of many voxels at once.
+
+        Args:
+            positions (np.ndarray): Positions (N, 3).
+
+        Returns:
+            np.ndarray: Palette index of each voxel, 0 if it was never written.
+        """
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 3)
+        values = np.zeros(len(positions), dtype=np.uint16)
+        if len(positions) == 0:
+            return values
+        keys, inverse = np.unique(positions >> 4, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        local = positions & 15
+        for i, key in enumerate(map(tuple, keys.tolist())):
+            section = self.sections.get(key)
+            if section is not None:
+                selection = np.flatnonzero(inverse == i)
+                values[selection] = section[local[selection, 1], local[selection, 2], local[selection, 0]]
+        return values
+
+    def voxels(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        List every written voxel.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Positions (N, 3) and palette index of each voxel.
+        """
+        positions, values = [], []
+        for (sx, sy, sz), section in self.sections.items():
+            ys, zs, xs = np.nonzero(section)
+            positions.append(np.stack((xs + sx * SECTION_SIZE, ys + sy * SECTION_SIZE, zs + sz * SECTION_SIZE), axis=1))
+            values.append(section[ys, zs, xs])
+        if not positions:
+            return np.zeros((0, 3), dtype=np.int32), np.zeros(0, dtype=np.uint16)
+        return np.concatenate(positions).astype(np.int32), np.concatenate(values)
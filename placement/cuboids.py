@@ -0,0 +1,113 @@
+import numpy as np
+
+FILL_MAX_VOLUME = 32768
+
+
+def merge_runs(cuboids: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Merge cuboids that follow each other along an axis and only differ by their position on that axis.
+
+    Args:
+        cuboids (np.ndarray): Cuboids as rows of x0, y0, z0, x1, y1, z1 (bounds included) and value.
+        axis (int): Axis to merge along, 0 for x, 1 for y, 2 for z.
+
+    Returns:
+        np.ndarray: Merged cuboids, with the same layout.
+
+    >>> merge_runs(np.array([[0, 0, 0, 0, 0, 0, 1], [1, 0, 0, 1, 0, 0, 1], [2, 0, 0, 2, 0, 0, 2]]), 0)
+    array([[0, 0, 0, 1, 0, 0, 1],
+           [2, 0, 0, 2, 0, 0, 2]], dtype=int32)
+    """
+    if len(cuboids) == 0:
+        return np.zeros((0, 7), dtype=np.int32)
+    cuboids = np.asarray(cuboids, dtype=np.int64)
+    others = [i for i in range(7) if i not in (axis, axis + 3)]
+
+    # Sort by every other field, then along the axis, so that runs are consecutive rows
+    cuboids = cuboids[np.lexsort([cuboids[:, axis]] + [cuboids[:, i] for i in reversed(others)])]
+    breaks = np.ones(len(cuboids), dtype=bool)
+    breaks[1:] = (np.any(cuboids[1:, others] != cuboids[:-1, others], axis=1) |
+                  (cuboids[1:, axis] != cuboids[:-1, axis + 3] + 1))
+    starts = np.flatnonzero(breaks)
+    ends = np.append(starts[1:], len(cuboids)) - 1
+    merged = cuboids[starts]
+    merged[:, axis + 3] = cuboids[ends, axis + 3]
+    return merged.astype(np.int32)
+
+
+def merge_cuboids(positions: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Greedily merge voxels into axis-aligned cuboids of identical value, by merging runs along x, then z, then y.
+
+    Args:
+        positions (np.ndarray): Positions (N, 3) of the voxels, each one only once.
+        values (np.ndarray): Value of each voxel, like a palette index.
+
+    Returns:
+        np.ndarray: Cuboids as rows of x0, y0, z0, x1, y1, z1 (bounds included) and value, covering exactly the
+        voxels.
+
+    >>> merge_cuboids(np.array([[0, 0, 0], [1, 0, 0], [0, 0, 1], [1, 0, 1]]), np.array([3, 3, 3, 3]))
+    array([[0, 0, 0, 1, 0, 1, 3]], dtype=int32)
+    """
+    positions = np.asarray(positions, dtype=np.int64).reshape(-1, 3)
+    cuboids = np.hstack((positions, positions, np.asarray(values, dtype=np.int64).reshape(-1, 1)))
+    for axis in (0, 2, 1):
+        cuboids = merge_runs(cuboids, axis)
+    return cuboids
+
+
+def group_columns(xs: np.ndarray, zs: np.ndarray, bottoms: np.ndarray, tops: np.ndarray,
+                  values: np.ndarray) -> np.ndarray:
+    """
+    Group vertical column spans into cuboids. Columns are first merged along z when they are adjacent and share the
+    same span and value, then the resulting strips are merged along x the same way.
+
+    Args:
+        xs (np.ndarray): x coordinate of each column.
+        zs (np.ndarray): z coordinate of each column. A column (x, z) must appear only once.
+        bottoms (np.ndarray): Lowest y of each span, included.
+        tops (np.ndarray): Highest y of each span, included.
+        values (np.ndarray): Value of each span, like a palette index.
+
+    Returns:
+        np.ndarray: Cuboids as rows of x0, y0, z0, x1, y1, z1 and value.
+
+    >>> group_columns(np.array([0, 0, 1, 1]), np.array([0, 1, 0, 1]), np.array([5, 5, 5, 5]), np.array([6, 6, 6, 6]), np.array([0, 0, 0, 0]))
+    array([[0, 5, 0, 1, 6, 1, 0]], dtype=int32)
+    """
+    cuboids = np.stack((xs, bottoms, zs, xs, tops, zs, values), axis=1).reshape(-1, 7)
+    return merge_runs(merge_runs(cuboids, 2), 0)
+
+
+def split_cuboids(cuboids: np.ndarray, max_volume: int = FILL_MAX_VOLUME) -> np.ndarray:
+    """
+    Split cuboids so that none of them is larger than a volume: along z if one row is too long, then along y if one
+    layer is too large, then along x.
+
+    Args:
+        cuboids (np.ndarray): Cuboids as rows of x0, y0, z0, x1, y1, z1 and value.
+        max_volume (int, optional): Largest volume allowed. Defaults to FILL_MAX_VOLUME, the limit of /fill.
+
+    Returns:
+        np.ndarray: Split cuboids.
+
+    >>> split_cuboids(np.array([[0, 0, 0, 0, 0, 40000, 1]])).tolist()
+    [[0, 0, 0, 0, 0, 32767, 1], [0, 0, 32768, 0, 0, 40000, 1]]
+    """
+    result = []
+    for x0, y0, z0, x1, y1, z1, value in np.asarray(cuboids).reshape(-1, 7).tolist():
+        size_y, size_z = y1 - y0 + 1, z1 - z0 + 1
+        if size_z > max_volume:
+            for z in range(z0, z1 + 1, max_volume):
+                result.extend(split_cuboids([[x0, y0, z, x1, y1, min(z + max_volume - 1, z1), value]], max_volume))
+            continue
+        if size_y * size_z > max_volume:
+            step_y = max_volume // size_z
+            for y in range(y0, y1 + 1, step_y):
+                result.extend(split_cuboids([[x0, y, z0, x1, min(y + step_y - 1, y1), z1, value]], max_volume))
+            continue
+        step_x = max(1, max_volume // (size_y * size_z))
+        for x in range(x0, x1 + 1, step_x):
+            result.append([x, y0, z0, min(x + step_x - 1, x1), y1, z1, value])
+    return np.array(result, dtype=np.int32).reshape(-1, 7)
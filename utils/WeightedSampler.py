@@ -0,0 +1,113 @@
+from typing import Optional
+
+import numpy as np
+
+from utils.random_state import get_generator
+
+
+class WeightedSampler:
+    """
+    Draws values at random according to their weights, compiled once into a cumulative array.
+
+    Draws are vectorized: sample(n) draws n values with one call to the generator and a binary search.
+
+    Attributes:
+        values (list): Values to draw.
+        cumulative (np.ndarray): Cumulative sum of the weights of the values.
+
+    >>> sampler = WeightedSampler({"stone": 3, "andesite": 1})
+    >>> sampler.sample(8, np.random.default_rng(0))
+    array([0, 0, 0, 0, 1, 1, 0, 0])
+    >>> sampler.sample_values(3, np.random.default_rng(0))
+    ['stone', 'stone', 'stone']
+    """
+
+    def __init__(self, weights: dict):
+        """
+        Args:
+            weights (dict): Weight of each value, like {"stone": 3, "andesite": 1}. Weights must be positive or zero,
+                and at least one must be positive.
+        """
+        self.values = list(weights.keys())
+        self.cumulative = np.cumsum(np.array(list(weights.values()), dtype=np.float64))
+        if len(self.cumulative) == 0 or self.cumulative[-1] <= 0:
+            raise ValueError(f"No positive weight to draw from: {weights}")
+        self._ids: Optional[tuple[object, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        weights = np.diff(self.cumulative, prepend=0)
+        return f"WeightedSampler({dict(zip(self.values, weights.tolist()))})"
+
+    def sample(self, n: int, rng: np.random.Generator = None) -> np.ndarray:
+        """
+        Draw the indices of n values.
+
+        Args:
+            n (int): Number of draws.
+            rng (np.random.Generator, optional): Generator to draw from. Defaults to the shared generator of
+                utils.random_state.
+
+        Returns:
+            np.ndarray: Index in values of each draw.
+        """
+        if rng is None:
+            rng = get_generator()
+        draws = np.searchsorted(self.cumulative, rng.random(n) * self.cumulative[-1], side="right")
+        return np.minimum(draws, len(self.values) - 1)
+
+    def sample_values(self, n: int, rng: np.random.Generator = None) -> list:
+        """
+        Draw n values.
+
+        Args:
+            n (int): Number of draws.
+            rng (np.random.Generator, optional): Generator to draw from. Defaults to the shared generator.
+
+        Returns:
+            list: Drawn values.
+        """
+        return [self.values[i] for i in self.sample(n, rng).tolist()]
+
+    def choice(self, rng: np.random.Generator = None):
+        """
+        Draw one value.
+
+        Args:
+            rng (np.random.Generator, optional): Generator to draw from. Defaults to the shared generator.
+
+        Returns:
+            The drawn value.
+        """
+        return self.values[int(self.sample(1, rng)[0])]
+
+    def get_ids(self, palette) -> np.ndarray:
+        """
+        Get the ID of each value in a palette, taken as a block id. The value "None" has the ID -1.
+
+        Args:
+            palette (placement.Palette.Palette): Palette the values are interned in.
+
+        Returns:
+            np.ndarray: ID of each value, computed once per palette.
+        """
+        if self._ids is None or self._ids[0] is not palette:
+            self._ids = (palette, np.array([-1 if value == "None" else palette.intern_id(value)
+                                            for value in self.values], dtype=np.int64))
+        return self._ids[1]
+
+    def sample_ids(self, n: int, palette, rng: np.random.Generator = None) -> np.ndarray:
+        """
+        Draw n blocks, as IDs in a palette.
+
+        Args:
+            n (int): Number of draws.
+            palette (placement.Palette.Palette): Palette the blocks are interned in.
+            rng (np.random.Generator, optional): Generator to draw from. Defaults to the shared generator.
+
+        Returns:
+            np.ndarray: Palette ID of each drawn block, -1 for "None".
+        """
+        return self.get_ids(palette)[self.sample(n, rng)]
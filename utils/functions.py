@@ -1,6 +1,8 @@
 from enum import Enum
 import random as rd
 
+from utils.sampling import get_sampler
+
 def select_random(rdata : dict, enum : Enum) -> Enum:
     # select a random value of the dict according to his coef and return the corresponding value in the enum
-    return enum[rd.choice([elt for elt,num in rdata.items() for _ in range(num)]).upper()]
\ No newline at end of file
+    return enum[get_sampler(rdata).choice().upper()]
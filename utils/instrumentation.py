@@ -0,0 +1,186 @@
+"""
+Lightweight instrumentation of the generation pipeline.
+
+Wrap a pipeline stage in `with stage("name"):` to record its wall time, peak RSS, number of blocks emitted by the
+generators and HTTP requests and bytes exchanged with the GDMC interface. Stages can be nested, and the counters of
+a stage include its children. Calls of the same stage are summed in the run report written by write_report.
+
+Stages are expected to be entered from the generation thread. The requests sent by the PlacementSink workers are
+counted in the stage that is running when they are sent.
+"""
+from contextlib import contextmanager
+import json
+import logging
+import sys
+import threading
+import time
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+_COUNTERS = ("blocks", "http_requests", "http_bytes_sent", "http_bytes_received")
+
+_counters = dict.fromkeys(_COUNTERS, 0)
+_counters_lock = threading.Lock()
+_stack: list[dict] = []
+_stages: dict[str, dict] = {}
+_run_start = time.perf_counter()
+_run_peak_rss = 0
+_http_hook_installed = False
+
+
+def count_blocks(count: int = 1):
+    """
+    Count blocks emitted by a generator. Called by the placement editors for every write.
+
+    Args:
+        count (int, optional): Number of blocks. Defaults to 1.
+    """
+    _counters["blocks"] += count
+
+
+def _count_request(bytes_sent: int, bytes_received: int):
+    with _counters_lock:
+        _counters["http_requests"] += 1
+        _counters["http_bytes_sent"] += bytes_sent
+        _counters["http_bytes_received"] += bytes_received
+
+
+def install_http_hook():
+    """Count the requests sent by gdpc to the GDMC interface. Done automatically by the first stage."""
+    global _http_hook_installed
+    if _http_hook_installed:
+        return
+    from gdpc import interface
+
+    request = interface._request
+
+    def counted_request(method, url, *args, **kwargs):
+        response = request(method, url, *args, **kwargs)
+        data = kwargs.get("data")
+        _count_request(len(data) if data is not None else 0, len(response.content))
+        return response
+
+    interface._request = counted_request
+    _http_hook_installed = True
+
+
+def get_peak_rss() -> Optional[int]:
+    """
+    Get the peak resident set size of the process since the last reset.
+
+    Returns:
+        int | None: Peak RSS in bytes, None when the platform does not report it.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the peak RSS of the process, only supported on Linux."""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _propagate_peak_rss(peak: Optional[int]):
+    global _run_peak_rss
+    if peak is None:
+        return
+    _run_peak_rss = max(_run_peak_rss, peak)
+    for parent in _stack:
+        parent["peak_rss"] = max(parent["peak_rss"], peak)
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Record a pipeline stage.
+
+    Args:
+        name (str): Name of the stage, like "smooth_terrain" or "City.generate_district".
+
+    >>> with stage("remove_trees"):
+    ...     pass
+    """
+    install_http_hook()
+
+    # The peak of the enclosing stages must be kept before resetting it for this one.
+    _propagate_peak_rss(get_peak_rss())
+    _reset_peak_rss()
+
+    with _counters_lock:
+        current = {"counters": dict(_counters), "start": time.perf_counter(), "peak_rss": get_peak_rss()}
+    _stack.append(current)
+    try:
+        yield
+    finally:
+        _stack.pop()
+        end = time.perf_counter()
+        peak = get_peak_rss()
+        if peak is not None:
+            peak = max(peak, current["peak_rss"])
+        _propagate_peak_rss(peak)
+
+        record = _stages.setdefault(name, {"calls": 0, "wall_time": 0.0, "peak_rss": None,
+                                           **dict.fromkeys(_COUNTERS, 0)})
+        record["calls"] += 1
+        record["wall_time"] += end - current["start"]
+        if peak is not None:
+            record["peak_rss"] = max(record["peak_rss"] or 0, peak)
+        with _counters_lock:
+            for key in _COUNTERS:
+                record[key] += _counters[key] - current["counters"][key]
+        logger.debug("[Stage] %s: %.3f s", name, end - current["start"])
+
+
+def get_report() -> dict:
+    """
+    Get the report of the run so far.
+
+    Returns:
+        dict: Total wall time, peak RSS and counters of the run, and the records of each stage in the order they
+            were first entered.
+    """
+    with _counters_lock:
+        totals = dict(_counters)
+    peak = get_peak_rss()
+    return {
+        "wall_time": time.perf_counter() - _run_start,
+        "peak_rss": None if peak is None else max(peak, _run_peak_rss),
+        **totals,
+        "stages": {name: dict(record) for name, record in _stages.items()},
+    }
+
+
+def write_report(path: str):
+    """
+    Write the report of the run to a JSON file.
+
+    Args:
+        path (str): Path of the file.
+    """
+    with open(path, "w") as f:
+        json.dump(get_report(), f, indent=2)
+    logger.info("[Instrumentation] Run report written to %s", path)
+
+
+def reset():
+    """Forget the recorded stages and counters, and restart the run clock."""
+    global _run_start, _run_peak_rss
+    with _counters_lock:
+        _counters.update(dict.fromkeys(_COUNTERS, 0))
+    _stages.clear()
+    _stack.clear()
+    _run_start = time.perf_counter()
+    _run_peak_rss = 0
@@ -0,0 +1,32 @@
+import random
+from typing import Optional
+
+import numpy as np
+
+_generator: Optional[np.random.Generator] = None
+
+
+def get_generator() -> np.random.Generator:
+    """
+    Get the numpy generator shared by the samplers, creating it on the first call.
+
+    It is seeded from the random module, so that random.seed() at the start of a run also fixes its draws.
+
+    Returns:
+        np.random.Generator: The shared generator.
+    """
+    global _generator
+    if _generator is None:
+        _generator = np.random.default_rng(random.getrandbits(128))
+    return _generator
+
+
+def seed(value: int):
+    """
+    Reset the shared generator with a seed.
+
+    Args:
+        value (int): Seed of the generator.
+    """
+    global _generator
+    _generator = np.random.default_rng(value)
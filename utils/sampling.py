@@ -0,0 +1,80 @@
+import json
+from functools import lru_cache
+from numbers import Number
+
+from utils.WeightedSampler import WeightedSampler
+from utils.random_state import get_generator, seed
+
+_samplers: dict[tuple, WeightedSampler] = {}
+
+
+def get_sampler(weights: dict) -> WeightedSampler:
+    """
+    Get the sampler of a table of weights, compiled on the first call and reused for the rest of the run.
+
+    Args:
+        weights (dict): Weight of each value, like the proportion tables of params.yml.
+
+    Returns:
+        WeightedSampler: Sampler of the table.
+    """
+    key = tuple(weights.items())
+    sampler = _samplers.get(key)
+    if sampler is None:
+        sampler = WeightedSampler(weights)
+        _samplers[key] = sampler
+    return sampler
+
+
+def is_weight_table(node) -> bool:
+    """
+    Check if a node of a configuration is a table of weights: a non-empty dict whose values are all numbers.
+
+    Args:
+        node: Node of a configuration.
+
+    Returns:
+        bool: True if the node can be compiled into a WeightedSampler.
+
+    >>> is_weight_table({"stone": 3, "andesite": 1}), is_weight_table([{"stone": 1}, 3])
+    (True, False)
+    """
+    return (isinstance(node, dict) and len(node) > 0 and
+            all(isinstance(value, Number) and not isinstance(value, bool) for value in node.values()))
+
+
+def compile_weights(node):
+    """
+    Replace every table of weights of a configuration by its sampler, keeping the rest of the tree.
+
+    Args:
+        node: Configuration, like the content of lanes.json or lines.json.
+
+    Returns:
+        The configuration with WeightedSampler instead of the tables of weights.
+
+    >>> compile_weights({"solid_white": [[{"white_concrete": 3, "white_concrete_powder": 1}, 1]]})
+    {'solid_white': [[WeightedSampler({'white_concrete': 3.0, 'white_concrete_powder': 1.0}), 1]]}
+    """
+    if is_weight_table(node):
+        return get_sampler(node)
+    if isinstance(node, dict):
+        return {key: compile_weights(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [compile_weights(value) for value in node]
+    return node
+
+
+@lru_cache(maxsize=None)
+def load_compiled_json(path: str):
+    """
+    Load a JSON configuration of weights, like lanes.json or lines.json, and compile it once per run.
+
+    Args:
+        path (str): Path of the file.
+
+    Returns:
+        The compiled configuration, see compile_weights. It is shared and must not be modified.
+    """
+    with open(path) as f:
+        return compile_weights(json.load(f))
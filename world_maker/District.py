@@ -227,6 +227,33 @@ class District:
                     image = draw_square(image, Position(x, road.position.y), size)
 
 
+def get_road_edges(roads: list[Road]) -> list[tuple[Road, Road]]:
+    """
+    Walk the north/south/east/west links of a road grid once and list each grid edge a single time.
+
+    Two roads linked in both directions, or two roads sharing the same position, only give one edge. Zero length
+    edges are dropped.
+
+    :param roads: The roads of the grid, as returned by City.district_generate_road.
+    :return: The unique edges of the grid, as (start, end) pairs of roads.
+    """
+    edges = []
+    seen = set()
+    for road in roads:
+        for neighbour in (road.north, road.south, road.east, road.west):
+            if neighbour is None:
+                continue
+            start, end = road.position.get_tuple(), neighbour.position.get_tuple()
+            if start == end:
+                continue
+            key = (start, end) if start < end else (end, start)
+            if key in seen:
+                continue
+            seen.add(key)
+            edges.append((road, neighbour))
+    return edges
+
+
 def draw_square(image, center: Position, size: int) -> Image:
     for x in range(center.x - size, center.x + size):
         for y in range(center.y - size, center.y + size):
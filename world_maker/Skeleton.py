@@ -5,8 +5,6 @@ from typing import List, Union
 import numpy as np
 from gdpc import Editor
 from PIL import Image, ImageDraw
-from skan.csr import skeleton_to_csgraph
-from skimage.morphology import skeletonize
 from networks.geometry.Point3D import Point3D
 
 
@@ -61,6 +59,9 @@ class Skeleton:
             self.set_skeleton(data)
 
     def set_skeleton(self, data: np.ndarray):
+        from skan.csr import skeleton_to_csgraph
+        from skimage.morphology import skeletonize
+
         print("[Skeleton] Start skeletonization...")
         binary_skeleton = skeletonize(data, method="lee")
 
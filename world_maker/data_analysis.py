@@ -5,7 +5,6 @@ from scipy import ndimage
 from world_maker.Skeleton import Skeleton
 from world_maker.Position import Position
 from random import randint, choice
-import cv2
 
 
 def get_data(world: World):
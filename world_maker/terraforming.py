@@ -1,16 +1,67 @@
 from typing import Union
 
 import numpy as np
-from gdpc import Editor, Block, geometry, lookup
+from gdpc import Editor, Block, lookup
 from PIL import Image
-from skimage import morphology
+from scipy import ndimage
 
+from placement.EditPlan import EditPlan
+from placement.PlacementSink import get_placement_sink
+from placement.cuboids import group_columns
 from world_maker.data_analysis import handle_import_image
 
+SMOOTHABLE_BLOCKS = lookup.OVERWORLD_SOILS | lookup.OVERWORLD_STONES | lookup.SNOWS
 
-def remove_trees(heightmap: Union[str, Image], treesmap: Union[str, Image], mask: Union[str, Image]):
+
+def get_removed_trees_mask(treesmap: np.ndarray, seeds: np.ndarray) -> np.ndarray:
+    """
+    Get the trees touched by at least one seed, with the same result as flooding the treesmap from every seed.
+
+    A flood from a seed of value v covers the 8-connected region of pixels within v±1. All the seeds sharing a
+    value give the same regions, so each distinct value only costs one labelling pass over the map.
+
+    Args:
+        treesmap (np.ndarray): Height of the tree top of each column, indexed [z, x].
+        seeds (np.ndarray): Boolean map of the columns the flood starts from.
+
+    Returns:
+        np.ndarray: Boolean map of the removed columns.
+    """
+    trees = treesmap.astype(np.int16)
+    removed = np.zeros(trees.shape, dtype=bool)
+    structure = np.ones((3, 3), dtype=bool)
+    for value in np.unique(trees[seeds]):
+        labels, _ = ndimage.label(np.abs(trees - value) <= 1, structure=structure)
+        seeded = np.unique(labels[seeds & (trees == value)])
+        removed |= np.isin(labels, seeded[seeded > 0])
+    return removed
+
+
+def get_column_spans(xs: np.ndarray, zs: np.ndarray, bottoms: np.ndarray, tops: np.ndarray) -> list[tuple[int, int, int]]:
+    """
+    Expand vertical column spans into block coordinates.
+
+    Args:
+        xs (np.ndarray): x coordinate of each column.
+        zs (np.ndarray): z coordinate of each column.
+        bottoms (np.ndarray): Lowest y of each span, included.
+        tops (np.ndarray): Highest y of each span, included. Must not be lower than the bottom.
+
+    Returns:
+        list[tuple[int, int, int]]: Coordinates of every block of every span.
+    """
+    lengths = tops - bottoms + 1
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    coordinates = np.stack((np.repeat(xs, lengths), np.repeat(bottoms, lengths) + offsets,
+                            np.repeat(zs, lengths)), axis=1)
+    return [tuple(coordinate) for coordinate in coordinates.tolist()]
+
+
+def remove_trees(heightmap: Union[str, Image], treesmap: Union[str, Image], mask: Union[str, Image],
+                 editor: Editor = None):
     print("[Remove tree] Starting...")
-    editor = Editor(buffering=True)
+    if editor is None:
+        editor = get_placement_sink()
     build_area = editor.getBuildArea()
     build_rectangle = build_area.toRect()
 
@@ -19,44 +70,119 @@ def remove_trees(heightmap: Union[str, Image], treesmap: Union[str, Image], mask
     distance = (max(build_rectangle.end[0], build_rectangle.begin[0]) - min(build_rectangle.end[0], build_rectangle.begin[0]), max(
         build_rectangle.end[1], build_rectangle.begin[1]) - min(build_rectangle.end[1], build_rectangle.begin[1]))
 
-    heightmap = handle_import_image(heightmap).convert('L')
-    treesmap = handle_import_image(treesmap).convert('L')
-    mask = handle_import_image(mask)
-
-    removed_treesmap = Image.new("L", distance, 0)
+    heightmap = np.array(handle_import_image(heightmap).convert('L'))[:distance[1], :distance[0]]
+    treesmap = np.array(handle_import_image(treesmap).convert('L'))[:distance[1], :distance[0]]
+    mask = np.array(handle_import_image(mask).convert('L'))[:distance[1], :distance[0]]
 
-    removed = []
-    for x in range(0, distance[0]):
-        for z in range(0, distance[1]):
+    seeds = (mask != 0) & (treesmap > 0)
+    if not seeds.any():
+        Image.new("L", distance, 0).save('./world_maker/data/removed_treesmap.png')
+        print("[Remove tree] Done.")
+        return
 
-            if mask.getpixel((x, z)) != 0 and treesmap.getpixel((x, z)) > 0 and (x, z) not in removed:
+    removed = get_removed_trees_mask(treesmap, seeds)
 
-                tree_area = morphology.flood(treesmap, (z, x), tolerance=1)
-                blend = Image.blend(Image.fromarray(tree_area).convert(
-                    'L'), removed_treesmap.convert('L'), 0.5)
+    # Clear each column from the ground up to its tree top
+    zs, xs = np.nonzero(removed)
+    bottoms = heightmap[zs, xs].astype(int) + 1
+    tops = np.maximum(treesmap[zs, xs].astype(int), bottoms)
+    editor.placeBlock(get_column_spans(xs + start[0], zs + start[1], bottoms, tops), Block('air'))
+    editor.flushBuffer()
 
-                array = np.array(blend.convert('L'))
-                bool_array = array > 1
-                removed_treesmap = Image.fromarray(bool_array)
-
-                removed.append((x, z))
-
-    for x in range(0, distance[0]):
-        for z in range(0, distance[1]):
-            if removed_treesmap.getpixel((x, z)) != 0:
-                y = heightmap.getpixel((x, z))
-                y_top = removed_treesmap.getpixel((x, z))
-                geometry.placeLine(
-                    editor, (start[0] + x, y+1, start[1] + z), (start[0] + x, y_top, start[1] + z), Block('air'))
-
-    removed_treesmap.save('./world_maker/data/removed_treesmap.png')
+    Image.fromarray(removed).save('./world_maker/data/removed_treesmap.png')
     print("[Remove tree] Done.")
 
 
-def smooth_terrain(heightmap: Union[str, Image], heightmap_smooth: Union[str, Image], mask: Union[str, Image]):
+def get_smooth_terrain_delta(heightmap: np.ndarray, heightmap_smooth: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Get the height difference between the terrain and the smoothed terrain.
+
+    Args:
+        heightmap (np.ndarray): Height of the terrain, indexed [z, x].
+        heightmap_smooth (np.ndarray): Height of the smoothed terrain, indexed [z, x].
+        mask (np.ndarray): Columns allowed to change.
+
+    Returns:
+        np.ndarray: y - y_smooth for each column of the mask, 0 elsewhere.
+    """
+    delta = heightmap.astype(np.int32) - heightmap_smooth.astype(np.int32)
+    delta[mask == 0] = 0
+    return delta
+
+
+def get_surface_blocks(world_slice, heightmap: np.ndarray, columns: np.ndarray) -> tuple[np.ndarray, list[Block]]:
+    """
+    Read the surface block of some columns, and index them by kind.
+
+    Args:
+        world_slice (WorldSlice): Slice of the build area.
+        heightmap (np.ndarray): Height of the terrain, indexed [z, x].
+        columns (np.ndarray): Boolean map of the columns to read.
+
+    Returns:
+        tuple[np.ndarray, list[Block]]: Grid of the index of the surface block of each column in the palette (-1 for
+        unread columns), and the palette.
+    """
+    kinds = np.full(heightmap.shape, -1, dtype=np.int32)
+    zs, xs = np.nonzero(columns)
+    palette = []
+    indices = {}
+    values = []
+    for x, y, z in zip(xs.tolist(), heightmap[zs, xs].tolist(), zs.tolist()):
+        block = world_slice.getBlock((x, y, z))
+        values.append(indices.setdefault(str(block), len(indices)))
+        if len(palette) < len(indices):
+            palette.append(block)
+    kinds[zs, xs] = values
+    return kinds, palette
+
+
+def plan_smooth_terrain(heightmap: np.ndarray, heightmap_smooth: np.ndarray, mask: np.ndarray, world_slice,
+                        start: tuple[int, int]) -> EditPlan:
+    """
+    Plan the cut and fill needed to bring the terrain to the smoothed heightmap.
+
+    Columns above the smoothed height are cut down to it and capped with their surface block, columns below are filled
+    with their surface block. Only columns whose surface block is soil, stone or snow are changed.
+
+    Args:
+        heightmap (np.ndarray): Height of the terrain, indexed [z, x].
+        heightmap_smooth (np.ndarray): Height of the smoothed terrain, indexed [z, x].
+        mask (np.ndarray): Columns allowed to change.
+        world_slice (WorldSlice): Slice of the build area, to read the surface blocks.
+        start (tuple[int, int]): World coordinates (x, z) of the build area origin.
+
+    Returns:
+        EditPlan: Cuboids to place, in world coordinates.
+    """
+    delta = get_smooth_terrain_delta(heightmap, heightmap_smooth, mask)
+    kinds, palette = get_surface_blocks(world_slice, heightmap, delta != 0)
+    smoothable = np.array([block.id in SMOOTHABLE_BLOCKS for block in palette] + [False])
+    columns = smoothable[kinds] & (delta != 0)
+
+    zs, xs = np.nonzero(columns)
+    y = heightmap[zs, xs].astype(np.int32)
+    y_smooth = heightmap_smooth[zs, xs].astype(np.int32)
+    values = kinds[zs, xs]
+    xs, zs = xs + start[0], zs + start[1]
+
+    plan = EditPlan(palette + [Block('air')])
+    air = len(palette)
+    cut = y > y_smooth
+    plan.add_cuboids(group_columns(xs[cut], zs[cut], y_smooth[cut] + 1, y[cut],
+                                   np.full(np.count_nonzero(cut), air)))
+    plan.add_cuboids(group_columns(xs[cut], zs[cut], y_smooth[cut], y_smooth[cut], values[cut]))
+    fill = ~cut
+    plan.add_cuboids(group_columns(xs[fill], zs[fill], y[fill], y_smooth[fill], values[fill]))
+    return plan
+
+
+def smooth_terrain(heightmap: Union[str, Image], heightmap_smooth: Union[str, Image], mask: Union[str, Image],
+                   editor: Editor = None):
 
     print("[Smooth terrain] Starting...")
-    editor = Editor()
+    if editor is None:
+        editor = get_placement_sink()
     build_area = editor.getBuildArea()
     build_rectangle = build_area.toRect()
 
@@ -65,36 +191,19 @@ def smooth_terrain(heightmap: Union[str, Image], heightmap_smooth: Union[str, Im
     distance = (max(build_rectangle.end[0], build_rectangle.begin[0]) - min(build_rectangle.end[0], build_rectangle.begin[0]), max(
         build_rectangle.end[1], build_rectangle.begin[1]) - min(build_rectangle.end[1], build_rectangle.begin[1]))
 
-    heightmap = handle_import_image(heightmap).convert('L')
-    heightmap_smooth = handle_import_image(heightmap_smooth).convert('L')
-    mask = handle_import_image(mask).convert('L')
-
-    smooth_terrain_delta = Image.new("RGB", distance, 0)
-
-    slice = editor.loadWorldSlice(build_rectangle)
-    smoothable_blocks = lookup.OVERWORLD_SOILS | lookup.OVERWORLD_STONES | lookup.SNOWS
-
-    for x in range(0, distance[0]):
-        for z in range(0, distance[1]):
-
-            if mask.getpixel((x, z)) != 0:
-                y = heightmap.getpixel((x, z))
-                y_smooth = heightmap_smooth.getpixel((x, z))
-                delta = y - y_smooth
-                smooth_terrain_delta.putpixel((x, z), delta)
+    heightmap = np.array(handle_import_image(heightmap).convert('L'))[:distance[1], :distance[0]]
+    heightmap_smooth = np.array(handle_import_image(heightmap_smooth).convert('L'))[:distance[1], :distance[0]]
+    mask = np.array(handle_import_image(mask).convert('L'))[:distance[1], :distance[0]]
 
-                if delta != 0:
-                    block = slice.getBlock((x, y, z))
-                    if block.id in smoothable_blocks:
-                        if delta > 0:
-                            geometry.placeLine(
-                                editor, (start[0] + x, y, start[1] + z), (start[0] + x, y_smooth, start[1] + z), Block('air'))
-                            editor.placeBlock(
-                                (start[0] + x, y_smooth, start[1] + z), block)
-
-                        else:
-                            geometry.placeLine(
-                                editor, (start[0] + x, y, start[1] + z), (start[0] + x, y_smooth, start[1] + z), block)
+    slice = editor.loadWorldSlice(build_rectangle, cache=True)
+    plan = plan_smooth_terrain(heightmap, heightmap_smooth, mask, slice, (start[0], start[1]))
+    plan.place(editor)
+    editor.flushBuffer()
 
+    # Same encoding as putting the delta as an integer pixel in an RGB image
+    delta = get_smooth_terrain_delta(heightmap, heightmap_smooth, mask)
+    smooth_terrain_delta = Image.new("RGB", distance, 0)
+    smooth_terrain_delta.paste(Image.fromarray(np.ascontiguousarray(delta.astype('<i4').view(np.uint8).reshape(
+        delta.shape + (4,))[:, :, :3])))
     smooth_terrain_delta.save('./world_maker/data/smooth_terrain_delta.png')
     print("[Smooth terrain] Done.")
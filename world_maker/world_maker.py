@@ -6,30 +6,41 @@ from world_maker.City import City
 from world_maker.Position import Position
 from random import randint
 from world_maker.pack_rectangle import generate_building
+from utils.instrumentation import stage
 
 
 def world_maker():
     world = World()
-    heightmap, watermap, treemap = get_data(world)
+    with stage("get_data"):
+        heightmap, watermap, treemap = get_data(world)
 
     heightmap_smooth = filter_smooth(heightmap, 4)
     heightmap_smooth.save('./world_maker/data/heightmap_smooth.png')
 
-    filter_sobel(
-        "./world_maker/data/heightmap.png").save('./world_maker/data/sobelmap.png')
-    filter_sobel(heightmap_smooth).save('./world_maker/data/sobelmap_from_smooth.png')
+    with stage("filter_sobel"):
+        filter_sobel(
+            "./world_maker/data/heightmap.png").save('./world_maker/data/sobelmap.png')
+        filter_sobel(heightmap_smooth).save('./world_maker/data/sobelmap_from_smooth.png')
 
-    smooth_sobel_water_map = smooth_sobel_water('./world_maker/data/sobelmap_from_smooth.png')
-    skeleton_highway = skeleton_highway_map(highway_map())
+    with stage("smooth_sobel_water"):
+        smooth_sobel_water_map = smooth_sobel_water('./world_maker/data/sobelmap_from_smooth.png')
+    with stage("skeleton_highway"):
+        skeleton_highway = skeleton_highway_map(highway_map())
 
     city = City()
-    city.generate_district()
-    city.loop_expend_district()
-    city.district_draw_map()
+    with stage("City.generate_district"):
+        city.generate_district()
+    with stage("City.loop_expend_district"):
+        city.loop_expend_district()
+    with stage("City.district_draw_map"):
+        city.district_draw_map()
 
-    road_grid = city.district_generate_road()
-    image_mountain_map = city.get_district_mountain_map()
-    road = city.draw_roads(4)
+    with stage("City.district_generate_road"):
+        road_grid = city.district_generate_road()
+    with stage("City.get_district_mountain_map"):
+        image_mountain_map = city.get_district_mountain_map()
+    with stage("City.draw_roads"):
+        road = city.draw_roads(4)
     road.save('./world_maker/data/roadmap.png')
 
     subtract_map(smooth_sobel_water_map, road).save(
@@ -39,17 +50,20 @@ def world_maker():
     subtract_map('./world_maker/data/city_map.png',
                  './world_maker/data/mountain_map.png').save('./world_maker/data/city_map.png')
 
-    rectangle_building = generate_building(
-        './world_maker/data/city_map.png', './world_maker/data/heightmap.png', output='./world_maker/data/building.png')
+    with stage("generate_building"):
+        rectangle_building = generate_building(
+            './world_maker/data/city_map.png', './world_maker/data/heightmap.png', output='./world_maker/data/building.png')
     rectangle_building = rectangle_2D_to_3D(rectangle_building)
 
-    skeleton_mountain = skeleton_mountain_map(image_mountain_map)
+    with stage("skeleton_mountain"):
+        skeleton_mountain = skeleton_mountain_map(image_mountain_map)
     subtract_map('./world_maker/data/mountain_map.png',
                  './world_maker/data/skeleton_mountain_area.png').save('./world_maker/data/mountain_map.png')
     subtract_map(smooth_sobel_water_map, filter_negative(
         './world_maker/data/mountain_map.png')).save('./world_maker/data/mountain_map.png')
-    rectangle_mountain = generate_building(
-        './world_maker/data/mountain_map.png', './world_maker/data/heightmap.png', output='./world_maker/data/building_moutain.png')
+    with stage("generate_building"):
+        rectangle_mountain = generate_building(
+            './world_maker/data/mountain_map.png', './world_maker/data/heightmap.png', output='./world_maker/data/building_moutain.png')
     rectangle_mountain = rectangle_2D_to_3D(rectangle_mountain)
 
     # Terraforming